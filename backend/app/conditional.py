@@ -0,0 +1,36 @@
+"""Conditional GET handling (ETag / If-None-Match)."""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match header matches *etag*.
+
+    If-None-Match uses the weak comparison, so a ``W/`` prefix on either
+    side is ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == wanted
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    """Tag *response* with *etag* and return a 304 if the client has it already.
+
+    Returns None when the full response should be sent.
+    """
+    if etag is None:
+        return None
+    response.headers["ETag"] = etag
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict
 
 from pydantic_settings import BaseSettings
 
@@ -7,6 +8,19 @@ class Settings(BaseSettings):
     recipes_dir: Path = Path(__file__).resolve().parent.parent.parent / "recipes"
     host: str = "0.0.0.0"
     port: int = 8000
+    # Worker processes for parsing large libraries; 1 parses serially.
+    index_workers: int = 1
+    # Overrides for ranked-search field weights, e.g. {"title": 4.0}.
+    search_field_weights: Dict[str, float] = {}
+    # Approximate memory cap for parsed recipes kept by GET /api/recipes/{slug};
+    # 0 disables the cache.
+    recipe_cache_bytes: int = 32 * 1024 * 1024
+    # Commits made within this many seconds are batched into one in the
+    # background; 0 commits synchronously inside each request.
+    commit_batch_seconds: float = 0.5
+    # How often a background fetch refreshes the cached sync status; 0 only
+    # refreshes on pull/push.
+    sync_status_refresh_seconds: float = 300
 
     model_config = {"env_prefix": "FORKS_"}
 
@@ -1,11 +1,30 @@
+import asyncio
+import atexit
+import contextlib
+import json
 import logging
+import os
+import re
+import signal
 import subprocess
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Most processes only ever touch one recipes repo; the cap just keeps tests
+# and multi-repo tools from accumulating idle git processes.
+MAX_BATCH_WORKERS = 4
+
+# History pages are immutable for a given HEAD, and blobs for a given object
+# id, so both are memoized. Pages are capped by count, blobs by total size.
+MAX_HISTORY_PAGES = 256
+BLOB_CACHE_BYTES = 16 * 1024 * 1024
+
 
 @dataclass
 class PullResult:
@@ -13,6 +32,43 @@ class PullResult:
     success: bool = False
     changed_files: list = field(default_factory=list)
     conflict_files: list = field(default_factory=list)
+    # changed_files broken down by kind; renamed holds (old, new) pairs
+    added: list = field(default_factory=list)
+    modified: list = field(default_factory=list)
+    deleted: list = field(default_factory=list)
+    renamed: list = field(default_factory=list)
+
+
+DIFF_NAME_STATUS_ARGS = ["diff", "--name-status", "-M", "-z", "--no-color"]
+
+
+def _pull_result(name_status: str) -> PullResult:
+    """Build a successful PullResult from ``git diff --name-status -M -z`` output."""
+    result = PullResult(success=True)
+    fields = name_status.split("\0")
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i]
+        if status[0] in "RC":
+            old, new = fields[i + 1], fields[i + 2]
+            i += 3
+            if status[0] == "R":
+                result.renamed.append((old, new))
+                result.changed_files.extend([old, new])
+            else:
+                result.added.append(new)
+                result.changed_files.append(new)
+            continue
+        path = fields[i + 1]
+        i += 2
+        if status[0] == "A":
+            result.added.append(path)
+        elif status[0] == "D":
+            result.deleted.append(path)
+        else:
+            result.modified.append(path)
+        result.changed_files.append(path)
+    return result
 
 
 def git_init_if_needed(recipes_dir: Path) -> None:
@@ -45,55 +101,413 @@ def git_init_if_needed(recipes_dir: Path) -> None:
         logger.exception("Failed to initialize git repo")
 
 
-def git_commit(recipes_dir: Path, path, message: str) -> None:
+def git_commit(recipes_dir: Path, path, message: str, immediate: bool = False) -> None:
     """Stage file(s) and commit. Fire-and-forget: failures logged, never raised.
 
-    path can be a single Path or a list of Paths.
+    path can be a single Path or a list of Paths. If a commit queue is running
+    for *recipes_dir* the commit is queued and made in the background instead.
+    With ``immediate=True`` the queue is flushed first and this commit is made
+    on its own, for commits that later code looks up by message and diffs
+    against their parent.
+    """
+    paths = path if isinstance(path, list) else [path]
+    queue = _commit_queues.get(_repo_key(recipes_dir))
+    if queue is not None and immediate:
+        queue.flush()
+    elif queue is not None:
+        try:
+            queue.enqueue(paths, message)
+            return
+        except Exception:
+            logger.exception("Could not queue commit, committing now: %s", message)
+    _commit_paths(recipes_dir, [p.relative_to(recipes_dir).as_posix() for p in paths], message)
+
+
+def _commit_paths(recipes_dir: Path, rel_paths: List[str], message: str) -> bool:
+    """Commit the current contents of *rel_paths*; log and return False on failure.
+
+    The commit is built with plumbing on a private index file, so it never
+    waits on (or fails because of) ``.git/index.lock`` and never picks up
+    unrelated changes staged in the real index. Commits to one repository
+    are serialized by an in-process lock, and HEAD is only moved if nobody
+    else moved it first.
     """
     try:
-        paths = path if isinstance(path, list) else [path]
-        for p in paths:
-            subprocess.run(
-                ["git", "add", str(p.relative_to(recipes_dir))],
-                cwd=str(recipes_dir),
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-        subprocess.run(
-            ["git", "commit", "-m", message],
-            cwd=str(recipes_dir),
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        with _repo_lock(recipes_dir):
+            for attempt in range(2):
+                made = _commit_tree(recipes_dir, rel_paths, message)
+                if made is not None:
+                    break
+                # HEAD moved under us (e.g. a pull); rebuild on the new tip.
+                logger.info("HEAD moved while committing, retrying: %s", message)
+            else:
+                raise RuntimeError("HEAD kept moving")
+            if made:
+                invalidate_history_cache(recipes_dir)
+                try:
+                    # Keep the real index in step with HEAD for these paths.
+                    _stage_paths(recipes_dir, rel_paths)
+                except subprocess.CalledProcessError as e:
+                    # Left as is, the index would still hold the old blobs
+                    # and the next merge would refuse to run; reset these
+                    # paths to HEAD before then.
+                    _stale_index_paths.setdefault(_repo_key(recipes_dir), set()).update(rel_paths)
+                    logger.warning(
+                        "Committed, but could not refresh the index: %s", e.stderr.strip()
+                    )
+        return True
     except Exception:
         logger.exception("Git commit failed: %s", message)
+        return False
+
+
+def _commit_tree(recipes_dir: Path, rel_paths: List[str], message: str) -> Optional[bool]:
+    """Write one commit of *rel_paths* on top of HEAD.
+
+    Returns True if a commit was made, False if there was nothing to commit,
+    and None if HEAD changed before it could be updated.
+    """
+    git_dir = recipes_dir / ".git"
+    parent = _unflushed_head(recipes_dir) or None
+    index_file = git_dir / "forks-commit-index"
+    env = {**os.environ, "GIT_INDEX_FILE": str(index_file.resolve())}
+    try:
+        _run_git(recipes_dir, ["read-tree", parent or "--empty"], env=env)
+        _stage_paths(recipes_dir, rel_paths, env=env)
+        tree = _run_git(recipes_dir, ["write-tree"], env=env)
+    finally:
+        index_file.unlink(missing_ok=True)
+
+    if parent is not None:
+        header = (_batch_worker(recipes_dir).read(parent) or b"").split(b"\n", 1)[0]
+        if header == b"tree " + tree.encode():
+            logger.info("Nothing to commit: %s", message)
+            return False
+    commit = _run_git(
+        recipes_dir,
+        ["commit-tree", tree, *(["-p", parent] if parent else [])],
+        input=message,
+    )
+    result = subprocess.run(
+        ["git", "update-ref", "-m", f"commit: {message.splitlines()[0]}",
+         "HEAD", commit, parent or _NULL_OID],
+        cwd=str(recipes_dir),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    return True
+
+
+def _run_git(
+    recipes_dir: Path,
+    args: List[str],
+    env: Optional[dict] = None,
+    input: Optional[str] = None,
+    check: bool = True,
+) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=str(recipes_dir),
+        env=env,
+        input=input,
+        capture_output=True,
+        text=True,
+        check=check,
+    )
+    return result.stdout.strip()
+
+
+def _stage_paths(recipes_dir: Path, rel_paths: List[str], env: Optional[dict] = None) -> None:
+    """Stage additions, edits and removals of *rel_paths* in one git run.
+
+    Paths are fed to ``update-index`` on stdin, so the process count does not
+    grow with the number of files. Paths that no longer exist are staged as
+    removals; ones git never tracked are ignored. *env* may point
+    ``GIT_INDEX_FILE`` at a private index.
+    """
+    subprocess.run(
+        ["git", "update-index", "--add", "--remove", "-z", "--stdin"],
+        cwd=str(recipes_dir),
+        env=env,
+        input="\0".join(rel_paths) + "\0",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+_repo_locks: Dict[str, threading.Lock] = {}
+_repo_locks_guard = threading.Lock()
+
+
+def _repo_lock(recipes_dir: Path) -> threading.Lock:
+    """Return the lock serializing commits to *recipes_dir* in this process."""
+    key = _repo_key(recipes_dir)
+    with _repo_locks_guard:
+        return _repo_locks.setdefault(key, threading.Lock())
+
+
+def _repo_key(recipes_dir: Path) -> str:
+    return str(Path(recipes_dir).resolve())
+
+
+async def _acquire_async(lock) -> None:
+    """Acquire a threading lock or semaphore without blocking the event loop."""
+    # Polled rather than acquired on a thread, so a cancelled waiter can
+    # never end up holding it.
+    while not lock.acquire(blocking=False):
+        await asyncio.sleep(0.01)
+
+
+@contextlib.asynccontextmanager
+async def _repo_lock_async(recipes_dir: Path):
+    """Hold :func:`_repo_lock` from a coroutine without blocking the loop."""
+    lock = _repo_lock(recipes_dir)
+    await _acquire_async(lock)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+# Paths committed by _commit_paths whose entries in the real index could not
+# be refreshed (usually because a merge held .git/index.lock), per repo.
+_stale_index_paths: Dict[str, Set[str]] = {}
+
+
+def _reset_stale_index(recipes_dir: Path) -> None:
+    """Reset index entries left behind by _commit_paths to HEAD.
+
+    Caller holds :func:`_repo_lock`. Paths that still cannot be reset are
+    kept for the next attempt.
+    """
+    paths = _stale_index_paths.pop(_repo_key(recipes_dir), None)
+    if not paths:
+        return
+    try:
+        _run_git(recipes_dir, ["reset", "-q", "--", *sorted(paths)])
+    except subprocess.CalledProcessError as e:
+        _stale_index_paths.setdefault(_repo_key(recipes_dir), set()).update(paths)
+        logger.warning("Could not reset stale index entries: %s", e.stderr.strip())
+
+
+# A failed batch is retried after this long, doubling per failure up to the max.
+COMMIT_RETRY_SECONDS = 5.0
+MAX_COMMIT_RETRY_SECONDS = 300.0
+# Failed attempts after which a queued commit is given up on.
+MAX_COMMIT_ATTEMPTS = 8
+
+# (paths relative to the repo, message, failed attempts so far)
+QueuedCommit = Tuple[List[str], str, int]
+
+
+class CommitQueue:
+    """Write-behind committer that coalesces bursts of git_commit calls.
+
+    Queued commits are journaled (one JSON object per line, fsynced) before
+    they are acknowledged, and everything queued within *window* seconds of
+    the first entry is committed together. If a batch fails, its entries
+    are retried one at a time so one bad entry cannot hold back the rest;
+    an entry still failing after MAX_COMMIT_ATTEMPTS is dropped from the
+    queue and appended to a ``forks-failed-commits`` log next to the journal
+    (its changes stay on disk for the next commit of those files). A
+    journal left behind by a crash is replayed on construction.
+    """
+
+    def __init__(self, recipes_dir: Path, window: float = 0.5, journal_path: Optional[Path] = None):
+        self.recipes_dir = recipes_dir
+        self.window = window
+        self.journal_path = journal_path or recipes_dir / ".git" / "forks-pending-commits"
+        self.failed_path = self.journal_path.with_name("forks-failed-commits")
+        self._pending: List[QueuedCommit] = []
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._retry_delay = window
+        self._pending.extend(self._read_journal())
+
+    def _read_journal(self) -> List[QueuedCommit]:
+        entries = []
+        try:
+            lines = self.journal_path.read_text().splitlines()
+        except FileNotFoundError:
+            return entries
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                entries.append(
+                    (list(entry["paths"]), str(entry["message"]), int(entry.get("attempts", 0)))
+                )
+            except (ValueError, KeyError, TypeError):
+                # A torn final line from a crash mid-append
+                logger.warning("Skipping unreadable commit journal entry")
+        if entries:
+            logger.info("Recovered %d queued commit(s) from %s", len(entries), self.journal_path)
+        return entries
+
+    def _write_journal(self) -> None:
+        """Rewrite the journal to hold exactly the pending entries."""
+        if not self._pending:
+            self.journal_path.unlink(missing_ok=True)
+            return
+        tmp = self.journal_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            for paths, message, attempts in self._pending:
+                entry = {"paths": paths, "message": message, "attempts": attempts}
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.journal_path)
+
+    def idle(self) -> bool:
+        """True if nothing is queued or being committed right now."""
+        return not self._pending and not self._commit_lock.locked()
+
+    def enqueue(self, paths: List[Path], message: str) -> None:
+        rel_paths = [p.relative_to(self.recipes_dir).as_posix() for p in paths]
+        with self._lock:
+            with open(self.journal_path, "a") as f:
+                f.write(json.dumps({"paths": rel_paths, "message": message}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending.append((rel_paths, message, 0))
+            if self._timer is None:
+                self._arm_timer(self.window)
+
+    def flush(self) -> bool:
+        """Commit everything queued so far; return False if anything failed."""
+        with self._commit_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not batch:
+                return True
+            failed = self._commit(batch)
+            retry, dropped = [], []
+            for paths, message, attempts in failed:
+                entry = (paths, message, attempts + 1)
+                (dropped if attempts + 1 >= MAX_COMMIT_ATTEMPTS else retry).append(entry)
+            with self._lock:
+                if dropped:
+                    self._drop(dropped)
+                if not retry:
+                    self._retry_delay = self.window
+                else:
+                    # Keep what failed, ahead of anything queued meanwhile,
+                    # and try again later, backing off while commits fail.
+                    self._pending[:0] = retry
+                    self._retry_delay = min(
+                        max(self._retry_delay * 2, COMMIT_RETRY_SECONDS), MAX_COMMIT_RETRY_SECONDS
+                    )
+                    if self._timer is None:
+                        self._arm_timer(self._retry_delay)
+                # Entries queued while we were committing stay journaled.
+                try:
+                    self._write_journal()
+                except OSError:
+                    logger.exception("Could not rewrite commit journal %s", self.journal_path)
+            return not failed
+
+    def _commit(self, batch: List[QueuedCommit]) -> List[QueuedCommit]:
+        """Commit *batch*; return the entries that could not be committed."""
+        rel_paths = list(dict.fromkeys(rel for paths, _, _ in batch for rel in paths))
+        if _commit_paths(self.recipes_dir, rel_paths, _combined_message(batch)):
+            return []
+        if len(batch) == 1:
+            return batch
+        return [entry for entry in batch if self._commit([entry])]
+
+    def _drop(self, entries: List[QueuedCommit]) -> None:
+        """Give up on *entries*, keeping a record of them. Caller holds _lock."""
+        for paths, message, attempts in entries:
+            logger.error(
+                "Giving up on commit after %d failed attempts: %s (%s)",
+                attempts, message, ", ".join(paths),
+            )
+        try:
+            with open(self.failed_path, "a") as f:
+                for paths, message, attempts in entries:
+                    f.write(json.dumps({
+                        "paths": paths,
+                        "message": message,
+                        "attempts": attempts,
+                        "failed_at": datetime.now(timezone.utc).isoformat(),
+                    }) + "\n")
+        except OSError:
+            logger.exception("Could not record failed commits in %s", self.failed_path)
+
+    def _arm_timer(self, delay: float) -> None:
+        """Schedule a flush in *delay* seconds. Caller holds _lock."""
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+def _combined_message(batch: List[QueuedCommit]) -> str:
+    messages = [message for _, message, _ in batch]
+    if len(messages) == 1:
+        return messages[0]
+    if len({tuple(sorted(paths)) for paths, _, _ in batch}) == 1:
+        subject = f"{messages[0]} (+{len(messages) - 1} more)"
+    else:
+        # The subject shows up in every touched file's history, so it must
+        # not name just one of them.
+        files = {rel for paths, _, _ in batch for rel in paths}
+        subject = f"Update {len(files)} files"
+    # Keep every original message in the body so --grep still finds them.
+    return subject + "\n\n" + "\n".join(f"- {m}" for m in messages)
+
+
+_commit_queues: Dict[str, CommitQueue] = {}
+
+
+def start_commit_queue(recipes_dir: Path, window: float = 0.5) -> CommitQueue:
+    """Route git_commit for *recipes_dir* through a write-behind queue.
+
+    Commits recovered from a previous run's journal are made immediately.
+    """
+    key = _repo_key(recipes_dir)
+    queue = _commit_queues.get(key)
+    if queue is None:
+        queue = _commit_queues[key] = CommitQueue(recipes_dir, window)
+        queue.flush()
+    return queue
+
+
+def stop_commit_queue(recipes_dir: Path) -> None:
+    """Flush and remove the queue for *recipes_dir*, if any."""
+    queue = _commit_queues.pop(_repo_key(recipes_dir), None)
+    if queue is not None:
+        queue.flush()
+
+
+def flush_commits(recipes_dir: Path) -> bool:
+    """Make any queued commits for *recipes_dir* now.
+
+    Called before anything that reads history or talks to a remote, so they
+    never see a repo that is behind the files on disk.
+    """
+    queue = _commit_queues.get(_repo_key(recipes_dir))
+    return queue.flush() if queue is not None else True
 
 
 def git_rm(recipes_dir: Path, path: Path, message: str) -> None:
-    """Remove a file from git and commit. Fire-and-forget."""
+    """Remove a file from disk and git and commit. Fire-and-forget."""
     try:
-        subprocess.run(
-            ["git", "rm", str(path.relative_to(recipes_dir))],
-            cwd=str(recipes_dir),
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        subprocess.run(
-            ["git", "commit", "-m", message],
-            cwd=str(recipes_dir),
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        path.unlink(missing_ok=True)
     except Exception:
         logger.exception("Git rm failed: %s", message)
+        return
+    git_commit(recipes_dir, path, message)
 
 
 def git_log(recipes_dir: Path, path: Path, max_entries: int = 20):
     """Return list of {hash, date, message} for a file's git history."""
+    flush_commits(recipes_dir)
     try:
         result = subprocess.run(
             [
@@ -124,11 +538,213 @@ def git_log(recipes_dir: Path, path: Path, max_entries: int = 20):
         return []
 
 
+# Abbreviated or full commit hash
+REVISION_RE = re.compile(r"^[0-9a-fA-F]{4,40}$")
+_NULL_OID = "0" * 40
+
+
+def _read_head(recipes_dir: Path) -> Optional[str]:
+    """Resolve HEAD by reading ``.git`` directly, without spawning git.
+
+    Returns None for layouts this doesn't understand (worktrees, unborn
+    branches), in which case callers should skip their caches.
+    """
+    git_dir = recipes_dir / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head or None
+        ref = head[5:]
+        try:
+            return (git_dir / ref).read_text().strip() or None
+        except FileNotFoundError:
+            pass
+        for line in (git_dir / "packed-refs").read_text().splitlines():
+            if line.endswith(" " + ref) and not line.startswith(("#", "^")):
+                return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    return None
+
+
+def _unflushed_head(recipes_dir: Path) -> str:
+    """HEAD without flushing the commit queue, for callers holding the repo lock."""
+    return _read_head(recipes_dir) or _run_git(
+        recipes_dir, ["rev-parse", "-q", "--verify", "HEAD"], check=False
+    )
+
+
+class _HistoryCache:
+    """History pages keyed on HEAD, plus an object-id keyed blob LRU."""
+
+    def __init__(self, max_pages: int, max_blob_bytes: int):
+        self.max_pages = max_pages
+        self.max_blob_bytes = max_blob_bytes
+        self._pages: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._blobs: "OrderedDict[str, str]" = OrderedDict()
+        self._blob_bytes = 0
+        self._lock = threading.Lock()
+
+    def get_page(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                return None
+            self._pages.move_to_end(key)
+            return _copy_page(page)
+
+    def put_page(self, key: tuple, page: dict) -> None:
+        with self._lock:
+            self._pages[key] = _copy_page(page)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def get_blob(self, oid: str) -> Optional[str]:
+        with self._lock:
+            text = self._blobs.get(oid)
+            if text is not None:
+                self._blobs.move_to_end(oid)
+            return text
+
+    def put_blob(self, oid: str, text: str) -> None:
+        size = len(text)
+        if size > self.max_blob_bytes:
+            return
+        with self._lock:
+            if oid in self._blobs:
+                return
+            self._blobs[oid] = text
+            self._blob_bytes += size
+            while self._blob_bytes > self.max_blob_bytes:
+                _, evicted = self._blobs.popitem(last=False)
+                self._blob_bytes -= len(evicted)
+
+    def invalidate(self, repo: str) -> None:
+        """Drop every page for *repo*; blobs never go stale."""
+        with self._lock:
+            for key in [k for k in self._pages if k[0] == repo]:
+                del self._pages[key]
+
+
+def _copy_page(page: dict) -> dict:
+    return {**page, "history": [dict(entry) for entry in page["history"]]}
+
+
+_history_cache = _HistoryCache(MAX_HISTORY_PAGES, BLOB_CACHE_BYTES)
+
+
+def invalidate_history_cache(recipes_dir: Path) -> None:
+    """Forget cached history for *recipes_dir*; call after HEAD moves."""
+    _history_cache.invalidate(_repo_key(recipes_dir))
+
+
+def git_history(
+    recipes_dir: Path,
+    path: Path,
+    limit: int = 20,
+    before: Optional[str] = None,
+    with_content: bool = True,
+) -> dict:
+    """Return one page of a file's history, newest first.
+
+    Commit metadata and the blob id of the file at each commit come from a
+    single ``git log --raw`` run; contents are then read through the shared
+    cat-file worker rather than one ``git show`` per commit. Pages are
+    cached against the current HEAD and blob contents against their id.
+
+    *before* is the hash of the last entry of the previous page. The result
+    is ``{"history": [...], "next_before": hash_or_None}``, where each entry
+    has ``hash``, ``date``, ``message`` and, with *with_content*, ``content``.
+    """
+    flush_commits(recipes_dir)
+    head = _read_head(recipes_dir)
+    if head is None:
+        return _git_history(recipes_dir, path, limit, before, with_content)
+    key = (
+        _repo_key(recipes_dir), head,
+        path.relative_to(recipes_dir).as_posix(), limit, before, with_content,
+    )
+    page = _history_cache.get_page(key)
+    if page is None:
+        page = _git_history(recipes_dir, path, limit, before, with_content)
+        if page["history"]:
+            _history_cache.put_page(key, page)
+    return page
+
+
+def _git_history(
+    recipes_dir: Path,
+    path: Path,
+    limit: int = 20,
+    before: Optional[str] = None,
+    with_content: bool = True,
+) -> dict:
+    page: dict = {"history": [], "next_before": None}
+    if before is not None and not REVISION_RE.match(before):
+        return page
+    try:
+        rel = path.relative_to(recipes_dir).as_posix()
+        # One extra entry tells us whether there is another page, and one
+        # more covers *before* itself, which is dropped below.
+        args = [
+            "git", "log", "--format=%x1e%H%x1f%aI%x1f%s", "--raw", "--no-abbrev",
+            "-n", str(limit + (2 if before else 1)),
+        ]
+        if before:
+            args.append(before)
+        result = subprocess.run(
+            args + ["--", rel],
+            cwd=str(recipes_dir),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except Exception:
+        logger.exception("Git history failed for %s", path)
+        return page
+
+    entries = []
+    for record in result.stdout.split("\x1e")[1:]:
+        lines = record.strip("\n").split("\n")
+        parts = lines[0].split("\x1f", 2)
+        if len(parts) != 3:
+            continue
+        blob = None
+        for line in lines[1:]:
+            if line.startswith(":"):
+                # ":<mode> <mode> <old oid> <new oid> <status>\t<path>"
+                blob = line.split("\t", 1)[0].split()[3]
+                break
+        entries.append(({"hash": parts[0], "date": parts[1], "message": parts[2]}, blob))
+    if before and entries and entries[0][0]["hash"].startswith(before.lower()):
+        entries = entries[1:]
+
+    if len(entries) > limit:
+        entries = entries[:limit]
+        page["next_before"] = entries[-1][0]["hash"]
+    if with_content:
+        for entry, blob in entries:
+            # Merges carry no raw diff line; look the file up in their tree.
+            spec = blob or f"{entry['hash']}:{rel}"
+            content = _history_cache.get_blob(blob) if blob else None
+            if content is None and spec != _NULL_OID:
+                try:
+                    content = _read_text(recipes_dir, spec)
+                except Exception:
+                    logger.exception("Git history could not read %s", spec)
+                if blob and content is not None:
+                    _history_cache.put_blob(blob, content)
+            entry["content"] = content or ""
+    page["history"] = [entry for entry, _ in entries]
+    return page
+
+
 def git_find_commit(recipes_dir: Path, path: Path, message_substring: str) -> Optional[str]:
     """Find the most recent commit whose message contains *message_substring* for *path*.
 
     Returns the full commit hash, or ``None`` if no matching commit is found.
     """
+    flush_commits(recipes_dir)
     try:
         rel = str(path.relative_to(recipes_dir))
         result = subprocess.run(
@@ -151,18 +767,127 @@ def git_find_commit(recipes_dir: Path, path: Path, message_substring: str) -> Op
         return None
 
 
+class CatFileBatch:
+    """A long-lived ``git cat-file --batch`` process for one repository.
+
+    Each read is a single request/response over the process's pipes instead
+    of a fork/exec per object. Reads are serialized by a lock, and a process
+    that has died (or been killed) is restarted once per read.
+    """
+
+    def __init__(self, repo_dir: Path):
+        self.repo_dir = repo_dir
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=str(self.repo_dir),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._proc
+
+    def _request(self, spec: str) -> Optional[bytes]:
+        proc = self._start()
+        proc.stdin.write(spec.encode() + b"\n")
+        proc.stdin.flush()
+        header = proc.stdout.readline()
+        if not header:
+            raise BrokenPipeError("git cat-file exited")
+        if header.endswith((b" missing\n", b" ambiguous\n")):
+            return None
+        _oid, _kind, size = header.split()
+        size = int(size)
+        data = proc.stdout.read(size)
+        proc.stdout.read(1)  # trailing LF
+        if len(data) != size:
+            raise BrokenPipeError("git cat-file exited mid-object")
+        return data
+
+    def read(self, spec: str) -> Optional[bytes]:
+        """Return the contents of object *spec* (e.g. ``HEAD:file.md``).
+
+        Returns None if the object does not exist.
+        """
+        if "\n" in spec:
+            return None
+        with self._lock:
+            try:
+                return self._request(spec)
+            except (BrokenPipeError, OSError, ValueError):
+                self._kill()
+            return self._request(spec)
+
+    def _kill(self) -> None:
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                self._proc.stdin.close()
+                try:
+                    self._proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._proc.kill()
+                    self._proc.wait()
+            self._proc = None
+
+
+_batch_workers: "OrderedDict[str, CatFileBatch]" = OrderedDict()
+_batch_workers_lock = threading.Lock()
+
+
+def _batch_worker(recipes_dir: Path) -> CatFileBatch:
+    key = str(Path(recipes_dir).resolve())
+    with _batch_workers_lock:
+        worker = _batch_workers.get(key)
+        if worker is not None:
+            _batch_workers.move_to_end(key)
+            return worker
+        worker = _batch_workers[key] = CatFileBatch(Path(key))
+        while len(_batch_workers) > MAX_BATCH_WORKERS:
+            _, evicted = _batch_workers.popitem(last=False)
+            evicted.close()
+        return worker
+
+
+@atexit.register
+def close_batch_workers() -> None:
+    """Shut down every ``git cat-file --batch`` process."""
+    with _batch_workers_lock:
+        workers = list(_batch_workers.values())
+        _batch_workers.clear()
+    for worker in workers:
+        worker.close()
+
+
+def _read_text(recipes_dir: Path, spec: str) -> Optional[str]:
+    """Read object *spec* as text via the cat-file worker; None if missing."""
+    data = _batch_worker(recipes_dir).read(spec)
+    if data is None:
+        return None
+    # Match the universal-newline text mode of the subprocess helpers.
+    text = data.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 def git_show(recipes_dir: Path, revision: str, path: Path) -> str:
     """Return file content at a specific git revision."""
+    flush_commits(recipes_dir)
     try:
-        rel = str(path.relative_to(recipes_dir))
-        result = subprocess.run(
-            ["git", "show", f"{revision}:{rel}"],
-            cwd=str(recipes_dir),
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return result.stdout
+        rel = path.relative_to(recipes_dir).as_posix()
+        text = _read_text(recipes_dir, f"{revision}:{rel}")
+        if text is None:
+            logger.warning("Git show found nothing for %s at %s", path, revision)
+            return ""
+        return text
     except Exception:
         logger.exception("Git show failed for %s at %s", path, revision)
         return ""
@@ -194,6 +919,7 @@ def git_init_bare(path: Path) -> None:
 
 def git_head_hash(recipes_dir: Path) -> str:
     """Return the current HEAD commit hash, or empty string if unavailable."""
+    flush_commits(recipes_dir)
     try:
         result = subprocess.run(
             ["git", "rev-parse", "HEAD"],
@@ -249,6 +975,7 @@ def git_remote_add(recipes_dir: Path, url: str) -> None:
 
 def git_push(recipes_dir: Path) -> bool:
     """Push current branch to origin. Returns True on success, False on failure."""
+    flush_commits(recipes_dir)
     try:
         # Determine the current branch name
         branch_result = subprocess.run(
@@ -275,14 +1002,27 @@ def git_push(recipes_dir: Path) -> bool:
         return False
 
 
-def git_pull(recipes_dir: Path) -> PullResult:
-    """Pull from origin. Returns a PullResult with changed/conflict info."""
+def git_pull(recipes_dir: Path, fetch: bool = True) -> PullResult:
+    """Pull from origin. Returns a PullResult with changed/conflict info.
+
+    With ``fetch=False`` the upstream branch from the last :func:`git_fetch`
+    is merged without going back to the network.
+    """
+    flush_commits(recipes_dir)
+    # Commits refresh the real index too; keep them out while git merges.
+    with _repo_lock(recipes_dir):
+        _reset_stale_index(recipes_dir)
+        return _git_pull_locked(recipes_dir, fetch)
+
+
+def _git_pull_locked(recipes_dir: Path, fetch: bool) -> PullResult:
     try:
         # Record HEAD before pull to diff afterwards
-        head_before = git_head_hash(recipes_dir)
+        head_before = _unflushed_head(recipes_dir)
 
+        args = ["pull", "--no-rebase", "origin"] if fetch else ["merge", "--no-edit", "@{upstream}"]
         result = subprocess.run(
-            ["git", "pull", "--no-rebase", "origin"],
+            ["git", *args],
             cwd=str(recipes_dir),
             capture_output=True,
             text=True,
@@ -296,10 +1036,7 @@ def git_pull(recipes_dir: Path) -> PullResult:
                 capture_output=True,
                 text=True,
             )
-            conflict_files = []
-            for line in status.stdout.strip().split("\n"):
-                if line.startswith("UU ") or line.startswith("AA "):
-                    conflict_files.append(line[3:].strip())
+            conflict_files = _conflict_files(status.stdout)
             if conflict_files:
                 return PullResult(
                     success=False,
@@ -310,45 +1047,85 @@ def git_pull(recipes_dir: Path) -> PullResult:
             return PullResult(success=False)
 
         # Determine which files changed
-        head_after = git_head_hash(recipes_dir)
-        changed_files = []
+        head_after = _unflushed_head(recipes_dir)
+        if head_after != head_before:
+            invalidate_history_cache(recipes_dir)
         if head_before and head_after and head_before != head_after:
             diff_result = subprocess.run(
-                ["git", "diff", "--name-only", head_before, head_after],
+                ["git", *DIFF_NAME_STATUS_ARGS, head_before, head_after],
                 cwd=str(recipes_dir),
                 capture_output=True,
                 text=True,
             )
-            changed_files = [
-                f for f in diff_result.stdout.strip().split("\n") if f
-            ]
-
-        return PullResult(
-            success=True,
-            changed_files=changed_files,
-            conflict_files=[],
-        )
+            return _pull_result(diff_result.stdout)
+        return PullResult(success=True)
     except Exception:
         logger.exception("git pull failed")
         return PullResult(success=False)
 
 
-def git_ahead_behind(recipes_dir: Path) -> tuple:
+def _conflict_files(porcelain_status: str) -> list:
+    return [
+        line[3:].strip()
+        for line in porcelain_status.strip().split("\n")
+        if line.startswith("UU ") or line.startswith("AA ")
+    ]
+
+
+def git_fetch(recipes_dir: Path) -> bool:
+    """Fetch from origin. Returns True on success."""
+    try:
+        result = subprocess.run(
+            ["git", "fetch", "origin"],
+            cwd=str(recipes_dir),
+            capture_output=True,
+            text=True,
+            stdin=subprocess.DEVNULL,
+            # Runs from the status refresher: never hang it on a prompt or
+            # a stalled connection.
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            timeout=GIT_TIMEOUT_SECONDS,
+        )
+        if result.returncode != 0:
+            logger.debug("git fetch failed: %s", result.stderr.strip())
+        return result.returncode == 0
+    except Exception:
+        logger.debug("git fetch failed for %s", recipes_dir)
+        return False
+
+
+def git_state_token(recipes_dir: Path) -> tuple:
+    """Cheap fingerprint of HEAD, the repo config and the last fetch.
+
+    Read straight from ``.git`` without spawning git; it changes whenever a
+    commit, a remote change or a fetch could have changed the sync status.
+    """
+    git_dir = recipes_dir / ".git"
+    stamps = []
+    for name in ("config", "FETCH_HEAD"):
+        try:
+            stamps.append((git_dir / name).stat().st_mtime_ns)
+        except OSError:
+            stamps.append(None)
+    return (_read_head(recipes_dir), *stamps)
+
+
+def git_ahead_behind(recipes_dir: Path, fetch: bool = True) -> tuple:
     """Return (ahead, behind) counts relative to origin tracking branch.
 
+    With *fetch* the remote refs are refreshed first; without it the counts
+    are against the last fetch and no network I/O happens.
+
     Returns (0, 0) if there is no remote or tracking info is unavailable.
     """
+    flush_commits(recipes_dir)
     try:
         if not git_has_remote(recipes_dir):
             return (0, 0)
 
-        # Fetch to make sure remote refs are up-to-date
-        subprocess.run(
-            ["git", "fetch", "origin"],
-            cwd=str(recipes_dir),
-            capture_output=True,
-            text=True,
-        )
+        if fetch:
+            # Fetch to make sure remote refs are up-to-date
+            git_fetch(recipes_dir)
 
         result = subprocess.run(
             ["git", "rev-list", "--left-right", "--count", "HEAD...@{upstream}"],
@@ -366,3 +1143,155 @@ def git_ahead_behind(recipes_dir: Path) -> tuple:
     except Exception:
         logger.debug("git_ahead_behind failed for %s", recipes_dir)
         return (0, 0)
+
+
+# ---------------------------------------------------------------------------
+# Async variants of the remote operations, for async routes. Network git can
+# take seconds; awaiting it keeps threadpool workers free for other requests.
+# ---------------------------------------------------------------------------
+
+GIT_TIMEOUT_SECONDS = 120.0
+MAX_CONCURRENT_GIT = 4
+
+# Shared by every event loop: each sync job runs on a loop of its own.
+_git_slots = threading.BoundedSemaphore(MAX_CONCURRENT_GIT)
+
+
+async def run_git_async(
+    recipes_dir: Path,
+    args: List[str],
+    timeout: Optional[float] = None,
+    check: bool = False,
+) -> subprocess.CompletedProcess:
+    """Run ``git *args`` in *recipes_dir* without blocking the event loop.
+
+    At most MAX_CONCURRENT_GIT of these run at once in the process. The
+    process is killed if it outlives *timeout* (default GIT_TIMEOUT_SECONDS)
+    or the awaiting task is cancelled.
+
+    Raises:
+        subprocess.TimeoutExpired: If the command did not finish in time.
+        subprocess.CalledProcessError: If *check* and git exited non-zero.
+    """
+    cmd = ["git", *args]
+    if timeout is None:
+        timeout = GIT_TIMEOUT_SECONDS
+    await _acquire_async(_git_slots)
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=str(recipes_dir),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Never wait on a credential prompt nobody can answer.
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            # Own process group, so a kill also reaches helpers git spawned
+            # (ssh, credential helpers) that would otherwise hold the pipes.
+            start_new_session=os.name == "posix",
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except BaseException as e:
+            if proc.returncode is None:
+                _kill_process_group(proc)
+                await asyncio.shield(proc.wait())
+            if isinstance(e, asyncio.TimeoutError):
+                raise subprocess.TimeoutExpired(cmd, timeout) from None
+            raise
+    finally:
+        _git_slots.release()
+    result = subprocess.CompletedProcess(
+        cmd, proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+    )
+    if check:
+        result.check_returncode()
+    return result
+
+
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def flush_commits_async(recipes_dir: Path) -> None:
+    """Async :func:`flush_commits`; only uses a thread if there is work queued."""
+    queue = _commit_queues.get(_repo_key(recipes_dir))
+    if queue is not None and not queue.idle():
+        await asyncio.to_thread(queue.flush)
+
+
+async def git_fetch_async(recipes_dir: Path) -> bool:
+    """Async :func:`git_fetch`."""
+    try:
+        result = await run_git_async(recipes_dir, ["fetch", "origin"])
+    except Exception:
+        logger.warning("git fetch failed for %s", recipes_dir, exc_info=True)
+        return False
+    if result.returncode != 0:
+        logger.debug("git fetch failed: %s", result.stderr.strip())
+    return result.returncode == 0
+
+
+async def git_push_async(recipes_dir: Path) -> bool:
+    """Async :func:`git_push`."""
+    await flush_commits_async(recipes_dir)
+    try:
+        branch_result = await run_git_async(
+            recipes_dir, ["rev-parse", "--abbrev-ref", "HEAD"], check=True
+        )
+        result = await run_git_async(
+            recipes_dir, ["push", "-u", "origin", branch_result.stdout.strip()]
+        )
+        if result.returncode != 0:
+            logger.warning("git push failed: %s", result.stderr.strip())
+            return False
+        return True
+    except Exception:
+        logger.exception("git push failed")
+        return False
+
+
+async def _head_hash_async(recipes_dir: Path) -> str:
+    result = await run_git_async(recipes_dir, ["rev-parse", "HEAD"])
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+async def git_pull_async(recipes_dir: Path, fetch: bool = True) -> PullResult:
+    """Async :func:`git_pull`."""
+    await flush_commits_async(recipes_dir)
+    async with _repo_lock_async(recipes_dir):
+        _reset_stale_index(recipes_dir)
+        return await _git_pull_locked_async(recipes_dir, fetch)
+
+
+async def _git_pull_locked_async(recipes_dir: Path, fetch: bool) -> PullResult:
+    try:
+        head_before = await _head_hash_async(recipes_dir)
+        args = ["pull", "--no-rebase", "origin"] if fetch else ["merge", "--no-edit", "@{upstream}"]
+        result = await run_git_async(recipes_dir, args)
+        if result.returncode != 0:
+            status = await run_git_async(recipes_dir, ["status", "--porcelain"])
+            conflict_files = _conflict_files(status.stdout)
+            if conflict_files:
+                return PullResult(success=False, changed_files=[], conflict_files=conflict_files)
+            logger.warning("git pull failed: %s", result.stderr.strip())
+            return PullResult(success=False)
+
+        head_after = await _head_hash_async(recipes_dir)
+        if head_after != head_before:
+            invalidate_history_cache(recipes_dir)
+        if head_before and head_after and head_before != head_after:
+            diff_result = await run_git_async(
+                recipes_dir, [*DIFF_NAME_STATUS_ARGS, head_before, head_after]
+            )
+            return _pull_result(diff_result.stdout)
+        return PullResult(success=True)
+    except Exception:
+        logger.exception("git pull failed")
+        return PullResult(success=False)
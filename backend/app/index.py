@@ -1,41 +1,331 @@
+import hashlib
+import json
 import logging
+import os
 import random as _random
-import re
+import threading
+import uuid
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
-
-import frontmatter
+from typing import Dict, List, Optional, Tuple, Union
 
 from app.models import RecipeSummary, Recipe, ForkSummary
-from app.parser import parse_frontmatter, parse_recipe, parse_fork_frontmatter
+from app.parser import ParsedRecipeFile, parse_recipe, parse_recipe_file, parse_fork_frontmatter
+from app.sections import extract_structured_data
+from app.search import (
+    FuzzyIndex,
+    PrefixIndex,
+    RankedIndex,
+    SubstringIndex,
+    ingredient_phrase,
+    is_single_token,
+    tokenize,
+)
 from app.tagger import _parse_minutes
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the snapshot layout or the parsed summary shape changes so
+# stale snapshots from older releases are ignored instead of half-loaded.
+SNAPSHOT_VERSION = 2
+
+# Below this many files parsing stays serial: spinning up worker processes
+# and pickling results back costs more than the parse itself, and threads
+# don't help a CPU-bound parse under the GIL.
+PROCESS_POOL_MIN_FILES = 256
+
+ParsedPath = Tuple[Optional[Tuple[int, int]], Optional[Union[ParsedRecipeFile, ForkSummary]]]
+
+
+def get_snapshot_path(recipes_dir: Path) -> Path:
+    """Return the index snapshot path. Respects FORKS_INDEX_SNAPSHOT_PATH env var.
+
+    Like the remote config, the snapshot lives OUTSIDE the recipes directory
+    so it never gets committed to the synced repo.
+    """
+    env = os.environ.get("FORKS_INDEX_SNAPSHOT_PATH")
+    if env:
+        return Path(env)
+    return recipes_dir.parent / ".forks-index.json"
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _parse_path(path: Path) -> ParsedPath:
+    """Stat and parse one recipe or fork file.
+
+    Module-level so it can be shipped to a process pool. The stat is taken
+    before the read so a concurrent write is picked up on the next build.
+    Parses to None if the file is gone, e.g. deleted since it was listed.
+    """
+    stat = _stat_key(path)
+    if stat is None:
+        return None, None
+    if ".fork." in path.name:
+        return stat, parse_fork_frontmatter(path)
+    try:
+        return stat, parse_recipe_file(path)
+    except OSError:
+        return None, None
+
+
+class ForkList:
+    """The forks of one base recipe, kept in display order.
+
+    Ordered by (fork_name, name) with a name lookup on the side, so a fork
+    is placed or found by binary search instead of re-sorting the list.
+    """
+
+    __slots__ = ("_keys", "_forks", "_by_name")
+
+    def __init__(self) -> None:
+        self._keys: List[Tuple[str, str]] = []
+        self._forks: List[ForkSummary] = []
+        self._by_name: Dict[str, ForkSummary] = {}
+
+    @staticmethod
+    def _key(fork: ForkSummary) -> Tuple[str, str]:
+        return (fork.fork_name, fork.name)
+
+    def put(self, fork: ForkSummary) -> None:
+        """Insert *fork*, replacing any fork with the same name."""
+        self.discard(fork.name)
+        key = self._key(fork)
+        i = bisect_left(self._keys, key)
+        self._keys.insert(i, key)
+        self._forks.insert(i, fork)
+        self._by_name[fork.name] = fork
+
+    def discard(self, name: str) -> bool:
+        """Remove the fork called *name*; returns whether there was one."""
+        fork = self._by_name.pop(name, None)
+        if fork is None:
+            return False
+        i = bisect_left(self._keys, self._key(fork))
+        del self._keys[i]
+        del self._forks[i]
+        return True
+
+    def get(self, name: str) -> Optional[ForkSummary]:
+        return self._by_name.get(name)
+
+    def to_list(self) -> List[ForkSummary]:
+        return list(self._forks)
+
+    def __iter__(self):
+        return iter(self._forks)
+
+    def __len__(self) -> int:
+        return len(self._forks)
+
 
 class RecipeIndex:
-    def __init__(self, recipes_dir: Path):
+    def __init__(
+        self,
+        recipes_dir: Path,
+        snapshot_path: Optional[Path] = None,
+        workers: int = 1,
+        field_weights: Optional[Dict[str, float]] = None,
+        cache_bytes: int = 0,
+    ):
         self.recipes_dir = recipes_dir
+        self.snapshot_path = snapshot_path
+        self.workers = max(1, workers)
         self._index: Dict[str, RecipeSummary] = {}
         self._ingredients: Dict[str, List[str]] = {}
-        self._forks: Dict[str, List[ForkSummary]] = {}
+        self._forks: Dict[str, ForkList] = {}
+        # filename -> (mtime_ns, size) of the file as it was last parsed
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        # title, tag and ingredient tokens -> slugs, for search()
+        self._search = SubstringIndex()
+        # lowercased title, tags and ingredients joined by NUL, for verifying
+        # multi-word queries with a single substring test
+        self._haystacks: Dict[str, str] = {}
+        # slug -> "## Instructions" section text, for ranking and snapshots
+        self._instructions: Dict[str, str] = {}
+        # lowercased tag -> slugs, and live counts keyed by the tag as written
+        self._tag_slugs: Dict[str, set] = {}
+        self._tag_counts: Counter = Counter()
+        # Precomputed sort keys, and sorted views cached per generation.
+        # Every public mutation bumps the generation, invalidating views.
+        self._generation = 0
+        # Generations restart with the process; the epoch keeps ETags built
+        # from them from colliding with ones handed out by a previous run.
+        self._epoch = uuid.uuid4().hex[:8]
+        self._title_keys: Dict[str, str] = {}
+        self._total_minutes: Dict[str, int] = {}
+        self._last_cooked: Dict[str, Optional[str]] = {}
+        self._views: Dict[str, Tuple[int, List[RecipeSummary]]] = {}
+        # slug -> count of changes to the recipe or its forks; never reset,
+        # so with the epoch it never repeats within or across runs.
+        self._revisions: Dict[str, int] = {}
+        # Search structures are refreshed lazily: mutations only record the
+        # slug here, and the next query re-indexes it. This keeps writes
+        # cheap; after a build, start_search_warmup() fills them in the
+        # background so the first query doesn't pay for the whole library.
+        self._search_stale: set = set()
+        self._search_lock = threading.Lock()
+        # per-field BM25 postings, for search_ranked()
+        self._ranked = RankedIndex(field_weights)
+        # trigrams over title and ingredient words, for suggest()
+        self._fuzzy = FuzzyIndex()
+        # titles, tags and ingredient phrases, for complete()
+        self._prefixes = PrefixIndex()
+        # slug -> ((mtime_ns, size), Recipe, approximate bytes) for get(),
+        # least recently used first. Disabled when cache_bytes is 0.
+        self.cache_bytes = max(0, cache_bytes)
+        self._recipe_cache: "OrderedDict[str, Tuple[Tuple[int, int], Recipe, int]]" = OrderedDict()
+        self._recipe_cache_size = 0
+        self._recipe_cache_lock = threading.Lock()
 
     def build(self) -> None:
         self._index.clear()
         self._ingredients.clear()
         self._forks.clear()
+        self._stats.clear()
+        self._instructions.clear()
+        self._tag_slugs.clear()
+        self._tag_counts.clear()
+        self._title_keys.clear()
+        self._total_minutes.clear()
+        self._last_cooked.clear()
+        self._generation += 1
+        self._views.clear()
+        self._evict_recipes()
+        with self._search_lock:
+            self._search_stale.clear()
+            self._search.clear()
+            self._haystacks.clear()
+            self._ranked.clear()
+            self._fuzzy.clear()
+            self._prefixes.clear()
         if not self.recipes_dir.exists():
             logger.warning(f"Recipes directory not found: {self.recipes_dir}")
             return
-        for path in self.recipes_dir.glob("*.md"):
+        cached = self._load_snapshot()
+        stale = []
+        for path in sorted(self.recipes_dir.glob("*.md")):
             if self._is_special_file(path):
                 continue
+            entry = cached.get(path.name)
+            if entry is not None and self._restore_entry(path, entry):
+                continue
+            stale.append(path)
+        # Results come back in input order, so merging stays deterministic
+        # regardless of which worker finished first.
+        for path, (stat, parsed) in zip(stale, self._parse_many(stale)):
+            self._index_parsed(path, stat, parsed)
+        self._attach_forks()
+        self._generation += 1
+        logger.info(
+            f"Indexed {len(self._index)} recipes from {self.recipes_dir} "
+            f"({len(stale)} parsed, {len(self._stats) - len(stale)} from snapshot)"
+        )
+        if stale or len(cached) != len(self._stats):
+            self.save_snapshot()
+
+    def _parse_many(self, paths: List[Path], spawn: bool = False) -> List[ParsedPath]:
+        """Parse *paths* serially or across a process pool, preserving order.
+
+        Pass ``spawn=True`` once the server is running: forking a process
+        with live threads can deadlock the child on a lock one of them held,
+        so runtime batches start their workers fresh instead.
+        """
+        if self.workers <= 1 or len(paths) < PROCESS_POOL_MIN_FILES:
+            return [_parse_path(p) for p in paths]
+        context = multiprocessing.get_context("spawn") if spawn else None
+        chunksize = max(1, len(paths) // (self.workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                return list(pool.map(_parse_path, paths, chunksize=chunksize))
+        except Exception:
+            logger.exception("Parallel index build failed, falling back to serial parse")
+            return [_parse_path(p) for p in paths]
+
+    # -- snapshot ----------------------------------------------------------
+
+    def _load_snapshot(self) -> Dict[str, dict]:
+        """Return the per-file entries of a valid snapshot, or {} if unusable."""
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return {}
+        try:
+            data = json.loads(self.snapshot_path.read_text())
+        except Exception:
+            logger.warning(f"Ignoring unreadable index snapshot: {self.snapshot_path}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            return {}
+        if data.get("recipes_dir") != str(self.recipes_dir.resolve()):
+            return {}
+        files = data.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def _restore_entry(self, path: Path, entry: dict) -> bool:
+        """Load a file's parsed data from a snapshot entry if its stat still matches."""
+        stat = _stat_key(path)
+        if stat is None or [entry.get("mtime_ns"), entry.get("size")] != list(stat):
+            return False
+        try:
             if self._is_fork_file(path):
-                self._index_fork(path)
+                base_slug = path.stem.split(".fork.")[0]
+                self._add_fork_summary(base_slug, ForkSummary.model_validate(entry["fork"]))
             else:
-                self._index_file(path)
-        self._attach_forks()
-        logger.info(f"Indexed {len(self._index)} recipes from {self.recipes_dir}")
+                summary = RecipeSummary.model_validate(entry["summary"])
+                self._set_recipe(
+                    summary,
+                    list(entry.get("ingredients", [])),
+                    entry.get("instructions", ""),
+                )
+        except Exception:
+            return False
+        self._stats[path.name] = stat
+        return True
+
+    def save_snapshot(self) -> None:
+        """Write the parsed index to disk. Failures are logged, never raised."""
+        if self.snapshot_path is None:
+            return
+        try:
+            files: Dict[str, dict] = {}
+            # Copy first: the watcher may be indexing while this runs.
+            for name, (mtime_ns, size) in list(self._stats.items()):
+                entry: dict = {"mtime_ns": mtime_ns, "size": size}
+                stem = name[:-len(".md")]
+                if ".fork." in stem:
+                    base_slug, fork_name = stem.split(".fork.", 1)
+                    forks = self._forks.get(base_slug)
+                    fork = forks.get(fork_name) if forks is not None else None
+                    if fork is None:
+                        continue
+                    entry["fork"] = fork.model_dump()
+                else:
+                    summary = self._index.get(stem)
+                    if summary is None:
+                        continue
+                    entry["summary"] = summary.model_dump(exclude={"forks"})
+                    entry["ingredients"] = self._ingredients.get(stem, [])
+                    entry["instructions"] = self._instructions.get(stem, "")
+                files[name] = entry
+            data = {
+                "version": SNAPSHOT_VERSION,
+                "recipes_dir": str(self.recipes_dir.resolve()),
+                "files": files,
+            }
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, self.snapshot_path)
+        except Exception:
+            logger.exception(f"Failed to write index snapshot: {self.snapshot_path}")
 
     def _is_special_file(self, path: Path) -> bool:
         return path.name == "meal-plan.md"
@@ -44,57 +334,230 @@ class RecipeIndex:
         return ".fork." in path.name
 
     def _index_file(self, path: Path) -> None:
-        summary = parse_frontmatter(path)
-        self._index[summary.slug] = summary
-        self._ingredients[summary.slug] = self._extract_ingredients(path)
+        self._index_parsed(path, *_parse_path(path))
 
     def _index_fork(self, path: Path) -> None:
-        base_slug = path.stem.split(".fork.")[0]
-        summary = parse_fork_frontmatter(path)
-        if base_slug not in self._forks:
-            self._forks[base_slug] = []
-        self._forks[base_slug] = [
-            f for f in self._forks[base_slug] if f.name != summary.name
-        ]
-        self._forks[base_slug].append(summary)
+        self._index_parsed(path, *_parse_path(path))
 
-    def _attach_forks(self) -> None:
-        """Attach fork summaries to their base recipe entries."""
-        for slug, recipe in self._index.items():
-            forks = sorted(self._forks.get(slug, []), key=lambda f: f.fork_name)
-            self._index[slug] = recipe.model_copy(update={"forks": forks})
+    def _index_parsed(
+        self,
+        path: Path,
+        stat: Optional[Tuple[int, int]],
+        parsed: Optional[Union[ParsedRecipeFile, ForkSummary]],
+    ) -> None:
+        if parsed is None:
+            return
+        if isinstance(parsed, ForkSummary):
+            base_slug = path.stem.split(".fork.")[0]
+            self._add_fork_summary(base_slug, parsed)
+        else:
+            self._set_recipe(
+                parsed.summary,
+                parsed.ingredients,
+                parsed.sections.get("Instructions", ""),
+            )
+        if stat is not None:
+            self._stats[path.name] = stat
 
-    def _extract_ingredients(self, path: Path) -> List[str]:
-        try:
-            post = frontmatter.load(path)
-            content = post.content
-        except Exception:
-            content = path.read_text()
+    def _set_recipe(
+        self,
+        summary: RecipeSummary,
+        ingredients: List[str],
+        instructions: str = "",
+    ) -> None:
+        self._untag(summary.slug)
+        self._index[summary.slug] = summary
+        self._ingredients[summary.slug] = ingredients
+        self._instructions[summary.slug] = instructions
+        self._tag_counts.update(summary.tags)
+        for tag in summary.tags:
+            self._tag_slugs.setdefault(tag.lower(), set()).add(summary.slug)
+        self._title_keys[summary.slug] = summary.title.lower()
+        self._total_minutes[summary.slug] = (
+            (_parse_minutes(summary.prep_time) or 0) + (_parse_minutes(summary.cook_time) or 0)
+        )
+        self._last_cooked[summary.slug] = (
+            max(e.date for e in summary.cook_history) if summary.cook_history else None
+        )
+        self._search_stale.add(summary.slug)
+
+    def _drop_recipe(self, slug: str) -> None:
+        self._untag(slug)
+        self._index.pop(slug, None)
+        self._ingredients.pop(slug, None)
+        self._instructions.pop(slug, None)
+        self._title_keys.pop(slug, None)
+        self._total_minutes.pop(slug, None)
+        self._last_cooked.pop(slug, None)
+        self._search_stale.add(slug)
+
+    def _untag(self, slug: str) -> None:
+        """Remove the currently indexed version of *slug* from the tag index."""
+        old = self._index.get(slug)
+        if old is None:
+            return
+        self._tag_counts.subtract(old.tags)
+        for tag in old.tags:
+            if self._tag_counts[tag] <= 0:
+                del self._tag_counts[tag]
+            slugs = self._tag_slugs.get(tag.lower())
+            if slugs is not None:
+                slugs.discard(slug)
+                if not slugs:
+                    del self._tag_slugs[tag.lower()]
 
-        lines = []
-        in_ingredients = False
-        for line in content.split("\n"):
-            if re.match(r"^##\s+Ingredients", line, re.IGNORECASE):
-                in_ingredients = True
+    def _refresh_search(self) -> None:
+        """Bring the search structures up to date. Caller holds _search_lock."""
+        while self._search_stale:
+            slug = self._search_stale.pop()
+            summary = self._index.get(slug)
+            if summary is None:
+                self._search.remove(slug)
+                self._haystacks.pop(slug, None)
+                self._ranked.remove(slug)
+                self._fuzzy.remove(slug)
+                self._prefixes.remove(slug)
                 continue
-            if in_ingredients and re.match(r"^##\s+", line):
-                break
-            if in_ingredients and line.strip().startswith("- "):
-                lines.append(line.strip().lstrip("- ").lower())
-        return lines
+            ingredients = self._ingredients.get(slug, [])
+            texts = [summary.title.lower(), *(t.lower() for t in summary.tags), *ingredients]
+            self._haystacks[slug] = "\0".join(texts)
+            # Tokenize each field once and share the tokens between indexes.
+            title_tokens = tokenize(summary.title)
+            tag_tokens = tokenize(" ".join(summary.tags))
+            ingredient_tokens = tokenize("\n".join(ingredients))
+            self._search.add(slug, [*title_tokens, *tag_tokens, *ingredient_tokens])
+            self._ranked.add(slug, {
+                "title": title_tokens,
+                "tags": tag_tokens,
+                "ingredients": ingredient_tokens,
+                "instructions": tokenize(self._instructions.get(slug, "")),
+            })
+            self._fuzzy.add(slug, [*title_tokens, *ingredient_tokens])
+            self._prefixes.add(slug, [
+                summary.title,
+                *summary.tags,
+                *(ingredient_phrase(line) for line in ingredients),
+            ])
+
+    def _add_fork_summary(self, base_slug: str, summary: ForkSummary) -> None:
+        self._forks.setdefault(base_slug, ForkList()).put(summary)
+
+    def _remove_fork_summary(self, base_slug: str, fork_name: str) -> None:
+        forks = self._forks.get(base_slug)
+        if forks is not None:
+            forks.discard(fork_name)
+            if not forks:
+                del self._forks[base_slug]
+
+    def _fork_list(self, slug: str) -> List[ForkSummary]:
+        forks = self._forks.get(slug)
+        return forks.to_list() if forks is not None else []
+
+    def _attach_forks(self) -> None:
+        """Attach fork summaries to every base recipe entry (full builds only)."""
+        for slug in self._index:
+            self._attach_forks_for(slug)
+
+    def _attach_forks_for(self, slug: str) -> None:
+        """Re-attach the fork summaries of base recipe *slug* only."""
+        recipe = self._index.get(slug)
+        if recipe is None:
+            return
+        forks = self._fork_list(slug)
+        if forks != recipe.forks:
+            self._index[slug] = recipe.model_copy(update={"forks": forks})
 
     def list_slugs(self) -> List[str]:
         return list(self._index.keys())
 
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every build, add_or_update and remove."""
+        return self._generation
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag for any response derived from the whole index."""
+        return f'"{self._epoch}-{self._generation}"'
+
+    def recipe_etag(self, slug: str) -> Optional[str]:
+        """Strong ETag for recipe *slug*, or None if it is not indexed.
+
+        Derived from the stat of the recipe file and each of its forks plus
+        a per-slug revision bumped on every indexed change, so an edit that
+        keeps the size and lands within the filesystem's mtime granularity
+        (a like going from 2 to 3) still changes it.
+        """
+        stat = self._stats.get(f"{slug}.md")
+        if stat is None or slug not in self._index:
+            return None
+        parts = [self._epoch, self._revisions.get(slug, 0), stat] + [
+            self._stats.get(f"{slug}.fork.{fork.name}.md")
+            for fork in self._forks.get(slug, [])
+        ]
+        return '"' + hashlib.sha1(repr(parts).encode()).hexdigest()[:20] + '"'
+
+    def _view(self, name: str) -> List[RecipeSummary]:
+        """Return the cached sorted view *name*, rebuilding it if stale.
+
+        The returned list is shared; callers must not mutate it.
+        """
+        cached = self._views.get(name)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+        generation = self._generation
+        if name == "title":
+            slugs = sorted(self._index, key=lambda slug: (self._title_keys[slug], slug))
+            view = [self._index[slug] for slug in slugs]
+        elif name == "never-cooked":
+            view = [r for r in self._view("title") if self._last_cooked[r.slug] is None]
+        elif name == "least-recent":
+            cooked = [slug for slug, date in self._last_cooked.items() if date is not None]
+            cooked.sort(key=lambda slug: (self._last_cooked[slug], self._title_keys[slug], slug))
+            view = [self._index[slug] for slug in cooked]
+        elif name == "quick":
+            view = [
+                r for r in self._view("title") if 0 < self._total_minutes[r.slug] <= 30
+            ]
+        else:
+            raise ValueError(f"Unknown view: {name}")
+        self._views[name] = (generation, view)
+        return view
+
+    def sort_key(self, summary: RecipeSummary, sort: Optional[str] = None) -> Tuple:
+        """Return the key *summary* is ordered by in the *sort* view.
+
+        Keys are unique per recipe (the slug breaks ties), so they can be
+        used as pagination cursors. ``None`` is the title order shared by
+        list_all, search and the never-cooked and quick views.
+        """
+        if sort == "least-recent":
+            return (self._last_cooked[summary.slug] or "", self._title_keys[summary.slug], summary.slug)
+        return (self._title_keys[summary.slug], summary.slug)
+
+    def _tagged_slugs(self, tags: List[str]) -> set:
+        pools = sorted(
+            (self._tag_slugs.get(tag.lower(), set()) for tag in tags), key=len
+        )
+        return pools[0].intersection(*pools[1:])
+
+    def _filtered_view(self, name: str, tags: Optional[List[str]]) -> List[RecipeSummary]:
+        """Return view *name*, optionally narrowed to recipes having all *tags*."""
+        view = self._view(name)
+        if not tags:
+            return list(view)
+        slugs = self._tagged_slugs(tags)
+        return [r for r in view if r.slug in slugs]
+
     def list_all(self) -> List[RecipeSummary]:
-        return sorted(self._index.values(), key=lambda r: r.title.lower())
+        return self._filtered_view("title", None)
 
     def filter_by_tags(self, tags: List[str]) -> List[RecipeSummary]:
-        results = [
-            r for r in self._index.values()
-            if all(any(tag.lower() == t.lower() for t in r.tags) for tag in tags)
-        ]
-        return sorted(results, key=lambda r: r.title.lower())
+        return self._filtered_view("title", tags)
+
+    def tag_counts(self) -> List[Tuple[str, int]]:
+        """Return (tag, recipe count) pairs sorted by tag."""
+        return sorted(self._tag_counts.items())
 
     def random(self) -> Optional[RecipeSummary]:
         """Return a random recipe summary, or None if the index is empty."""
@@ -102,63 +565,152 @@ class RecipeIndex:
             return None
         return _random.choice(list(self._index.values()))
 
-    def _apply_tags(self, tags: Optional[List[str]]) -> List[RecipeSummary]:
-        """Return all recipes, optionally filtered by tags."""
-        if tags:
-            return self.filter_by_tags(tags)
-        return list(self._index.values())
-
     def filter_never_cooked(self, tags: Optional[List[str]] = None) -> List[RecipeSummary]:
         """Return recipes that have never been cooked (empty cook_history)."""
-        recipes = self._apply_tags(tags)
-        results = [r for r in recipes if len(r.cook_history) == 0]
-        return sorted(results, key=lambda r: r.title.lower())
+        return self._filtered_view("never-cooked", tags)
 
     def filter_least_recent(self, tags: Optional[List[str]] = None) -> List[RecipeSummary]:
         """Return recipes sorted by oldest cook date (only those with history)."""
-        recipes = self._apply_tags(tags)
-        cooked = [r for r in recipes if len(r.cook_history) > 0]
-        return sorted(cooked, key=lambda r: max(e.date for e in r.cook_history))
+        return self._filtered_view("least-recent", tags)
 
     def filter_quick(self, tags: Optional[List[str]] = None) -> List[RecipeSummary]:
         """Return recipes where prep_time + cook_time <= 30 minutes."""
-        recipes = self._apply_tags(tags)
-        results = []
-        for r in recipes:
-            prep = _parse_minutes(r.prep_time) or 0
-            cook = _parse_minutes(r.cook_time) or 0
-            total = prep + cook
-            if total > 0 and total <= 30:
-                results.append(r)
-        return sorted(results, key=lambda r: r.title.lower())
+        return self._filtered_view("quick", tags)
 
     def get(self, slug: str) -> Optional[Recipe]:
+        """Return the full recipe with its structured sections and forks.
+
+        Recipes are cached (see ``cache_bytes``) and revalidated against the
+        file's stat on every call, so edits made behind the index's back are
+        still picked up. The returned object is shared; do not mutate it.
+        """
         if slug not in self._index:
             return None
         path = self.recipes_dir / f"{slug}.md"
-        if not path.exists():
+        stat = _stat_key(path)
+        if stat is None:
             return None
+        with self._recipe_cache_lock:
+            cached = self._recipe_cache.get(slug)
+            if cached is not None and cached[0] == stat:
+                self._recipe_cache.move_to_end(slug)
+                return cached[1]
         recipe = parse_recipe(path)
-        forks = sorted(self._forks.get(slug, []), key=lambda f: f.fork_name)
-        return recipe.model_copy(update={"forks": forks})
+        forks = self._fork_list(slug)
+        recipe = recipe.model_copy(
+            update={"forks": forks, **extract_structured_data(recipe.content)}
+        )
+        if self.cache_bytes:
+            self._cache_recipe(slug, stat, recipe)
+        return recipe
+
+    def _cache_recipe(self, slug: str, stat: Tuple[int, int], recipe: Recipe) -> None:
+        # The body and the structured lines copied out of it dominate a
+        # cached recipe's footprint; the constant covers the rest.
+        size = 2 * len(recipe.content) + 1024
+        if size > self.cache_bytes:
+            return
+        with self._recipe_cache_lock:
+            old = self._recipe_cache.pop(slug, None)
+            if old is not None:
+                self._recipe_cache_size -= old[2]
+            self._recipe_cache[slug] = (stat, recipe, size)
+            self._recipe_cache_size += size
+            while self._recipe_cache_size > self.cache_bytes:
+                _, (_, _, evicted) = self._recipe_cache.popitem(last=False)
+                self._recipe_cache_size -= evicted
+
+    def _touch(self, slug: str) -> None:
+        """Note that recipe *slug* or one of its forks changed."""
+        self._revisions[slug] = self._revisions.get(slug, 0) + 1
+        self._evict_recipes(slug)
+
+    def _evict_recipes(self, slug: Optional[str] = None) -> None:
+        """Drop *slug*, or every recipe if None, from the get() cache."""
+        with self._recipe_cache_lock:
+            if slug is None:
+                self._recipe_cache.clear()
+                self._recipe_cache_size = 0
+                return
+            old = self._recipe_cache.pop(slug, None)
+            if old is not None:
+                self._recipe_cache_size -= old[2]
+
+    def warm_search(self) -> None:
+        """Bring the search structures up to date now instead of on the next query."""
+        with self._search_lock:
+            self._refresh_search()
+
+    def start_search_warmup(self) -> threading.Thread:
+        """Run :meth:`warm_search` in a background thread and return it."""
+        thread = threading.Thread(target=self.warm_search, name="search-warmup", daemon=True)
+        thread.start()
+        return thread
 
     def search(self, query: str) -> List[RecipeSummary]:
         if not query.strip():
             return self.list_all()
 
         q = query.lower()
-        results = []
-        for slug, summary in self._index.items():
-            if q in summary.title.lower():
-                results.append(summary)
-                continue
-            if any(q in tag.lower() for tag in summary.tags):
-                results.append(summary)
-                continue
-            if any(q in ing for ing in self._ingredients.get(slug, [])):
-                results.append(summary)
-                continue
-        return sorted(results, key=lambda r: r.title.lower())
+        with self._search_lock:
+            self._refresh_search()
+            candidates = self._search.candidates(q)
+            if candidates is None:
+                candidates = list(self._haystacks)
+            if not is_single_token(q):
+                # Token postings are exact for single-word queries only.
+                candidates = [slug for slug in candidates if self._matches(slug, q)]
+        return sorted(self._live(candidates), key=self._title_order)
+
+    def search_ranked(self, query: str) -> List[RecipeSummary]:
+        """Return recipes matching any query term, most relevant first.
+
+        Scores are BM25 over title, tags, ingredients and instructions,
+        weighted per field. Ties fall back to title order.
+        """
+        if not query.strip():
+            return self.list_all()
+        with self._search_lock:
+            self._refresh_search()
+            scores = self._ranked.score(query)
+        results = self._live(scores)
+        return sorted(results, key=lambda r: (-scores[r.slug], *self._title_order(r)))
+
+    def _live(self, slugs) -> List[RecipeSummary]:
+        """Return the summaries for *slugs* that are still indexed.
+
+        Writers don't take the search lock, so a recipe can be removed
+        between the search structures answering and this lookup.
+        """
+        index = self._index
+        return [summary for summary in map(index.get, slugs) if summary is not None]
+
+    def _title_order(self, summary: RecipeSummary) -> Tuple[str, str]:
+        return (self._title_keys.get(summary.slug) or summary.title.lower(), summary.slug)
+
+    def suggest(self, query: str) -> Optional[str]:
+        """Return a "did you mean" correction for *query*, or None."""
+        with self._search_lock:
+            self._refresh_search()
+            return self._fuzzy.suggest(query.lower())
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return (completion, recipe count) pairs for autocomplete."""
+        with self._search_lock:
+            self._refresh_search()
+            return self._prefixes.complete(prefix, limit)
+
+    def _matches(self, slug: str, q: str) -> bool:
+        if "\0" not in q:
+            return q in self._haystacks.get(slug, "")
+        summary = self._index.get(slug)
+        if summary is None:
+            return False
+        if q in summary.title.lower():
+            return True
+        if any(q in tag.lower() for tag in summary.tags):
+            return True
+        return any(q in ing for ing in self._ingredients.get(slug, []))
 
     def add_or_update(self, path: Path) -> None:
         if self._is_special_file(path):
@@ -166,29 +718,78 @@ class RecipeIndex:
         if self._is_fork_file(path):
             self._index_fork(path)
             base_slug = path.stem.split(".fork.")[0]
-            if base_slug in self._index:
-                forks = sorted(self._forks.get(base_slug, []), key=lambda f: f.fork_name)
-                self._index[base_slug] = self._index[base_slug].model_copy(
-                    update={"forks": forks}
-                )
+            self._touch(base_slug)
+            self._attach_forks_for(base_slug)
         else:
             self._index_file(path)
-            self._attach_forks()
+            self._attach_forks_for(path.stem)
+            self._touch(path.stem)
+        self._generation += 1
+
+    def apply_changes(
+        self,
+        added: List[str] = (),
+        modified: List[str] = (),
+        deleted: List[str] = (),
+        renamed: List[Tuple[str, str]] = (),
+    ) -> None:
+        """Apply a batch of file changes, e.g. from ``git diff --name-status -M``.
+
+        Paths are relative to the recipes directory. Each changed file is
+        parsed once, and forks are re-attached only for the base recipes the
+        batch touched, so a large pull costs O(changes) rather than
+        O(changes x library).
+        """
+        gone = [*deleted, *(old for old, _ in renamed)]
+        present = [*added, *modified, *(new for _, new in renamed)]
+        affected = set()
+
+        for name in gone:
+            path = self.recipes_dir / name
+            if not self._is_indexable(path) or path.exists():
+                continue
+            self._stats.pop(path.name, None)
+            if self._is_fork_file(path):
+                base_slug, _, fork_name = path.stem.partition(".fork.")
+                self._remove_fork_summary(base_slug, fork_name)
+                affected.add(base_slug)
+            else:
+                self._drop_recipe(path.stem)
+                self._touch(path.stem)
+
+        paths = []
+        for name in dict.fromkeys(present):
+            path = self.recipes_dir / name
+            if self._is_indexable(path) and path.exists():
+                paths.append(path)
+        for path, (stat, parsed) in zip(paths, self._parse_many(paths, spawn=True)):
+            self._index_parsed(path, stat, parsed)
+            affected.add(path.stem.split(".fork.")[0])
+
+        for slug in affected:
+            self._attach_forks_for(slug)
+            self._touch(slug)
+        self._generation += 1
+
+    def _is_indexable(self, path: Path) -> bool:
+        """True for top-level recipe and fork files."""
+        return (
+            path.suffix == ".md"
+            and path.parent == self.recipes_dir
+            and not self._is_special_file(path)
+        )
 
     def remove(self, slug_or_stem: str) -> None:
         if ".fork." in slug_or_stem:
             parts = slug_or_stem.split(".fork.")
             base_slug = parts[0]
             fork_name = parts[-1]
-            if base_slug in self._forks:
-                self._forks[base_slug] = [
-                    f for f in self._forks[base_slug] if f.name != fork_name
-                ]
-                if base_slug in self._index:
-                    forks = sorted(self._forks.get(base_slug, []), key=lambda f: f.fork_name)
-                    self._index[base_slug] = self._index[base_slug].model_copy(
-                        update={"forks": forks}
-                    )
+            self._stats.pop(f"{slug_or_stem}.md", None)
+            self._touch(base_slug)
+            self._remove_fork_summary(base_slug, fork_name)
+            self._attach_forks_for(base_slug)
         else:
-            self._index.pop(slug_or_stem, None)
-            self._ingredients.pop(slug_or_stem, None)
+            self._drop_recipe(slug_or_stem)
+            self._stats.pop(f"{slug_or_stem}.md", None)
+            self._touch(slug_or_stem)
+        self._generation += 1
@@ -9,8 +9,8 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config import settings
 from app.errors import http_exception_handler, validation_exception_handler
-from app.git import git_init_if_needed
-from app.index import RecipeIndex
+from app.git import git_init_if_needed, start_commit_queue, stop_commit_queue
+from app.index import RecipeIndex, get_snapshot_path
 from app.remote_config import get_config_path
 from app.routes.cook import create_cook_router
 from app.routes.editor import create_editor_router
@@ -38,8 +38,15 @@ def create_app(recipes_dir: Optional[Path] = None) -> FastAPI:
     recipes_path = recipes_dir or settings.recipes_dir
 
     # Build recipe index
-    index = RecipeIndex(recipes_path)
+    index = RecipeIndex(
+        recipes_path,
+        snapshot_path=get_snapshot_path(recipes_path),
+        workers=settings.index_workers,
+        field_weights=settings.search_field_weights,
+        cache_bytes=settings.recipe_cache_bytes,
+    )
     index.build()
+    index.start_search_warmup()
 
     # Register API routes
     app.include_router(create_recipe_router(index))
@@ -52,7 +59,7 @@ def create_app(recipes_dir: Optional[Path] = None) -> FastAPI:
 
     app.include_router(create_stream_router(index, recipes_path))
 
-    sync_engine = SyncEngine(recipes_dir=recipes_path, index=index)
+    sync_engine = SyncEngine(recipes_dir=recipes_path, index=index, config_path=config_path)
     app.include_router(create_settings_router(sync_engine, recipes_path))
 
     # Serve recipe images
@@ -64,7 +71,19 @@ def create_app(recipes_dir: Optional[Path] = None) -> FastAPI:
     @app.on_event("startup")
     def startup():
         git_init_if_needed(recipes_path)
+        if settings.commit_batch_seconds > 0:
+            start_commit_queue(recipes_path, settings.commit_batch_seconds)
         start_watcher(index, recipes_path)
+        if settings.sync_status_refresh_seconds > 0:
+            sync_engine.start_status_refresh(settings.sync_status_refresh_seconds)
+        sync_engine.start_scheduler()
+
+    @app.on_event("shutdown")
+    def shutdown():
+        sync_engine.stop_scheduler()
+        sync_engine.stop_status_refresh()
+        stop_commit_queue(recipes_path)
+        index.save_snapshot()
 
     # Serve frontend static files (in production)
     static_dir = Path(__file__).resolve().parent / "static"
@@ -80,6 +80,17 @@ class SyncStatus(BaseModel):
     error: Optional[str] = None
 
 
+class SyncJob(BaseModel):
+    id: str
+    state: str = "queued"  # "queued", "fetching", "merging", "reindexing", "pushing", "done", "failed"
+    started_at: str
+    finished_at: Optional[str] = None
+    pull_success: Optional[bool] = None
+    pull_changed: List[str] = []
+    push_success: Optional[bool] = None
+    error: Optional[str] = None
+
+
 class StreamEvent(BaseModel):
     type: str  # "created", "edited", "forked", "merged", "unmerged", "failed", "unfailed"
     date: str
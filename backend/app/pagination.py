@@ -0,0 +1,63 @@
+"""Keyset pagination over sorted result lists.
+
+A cursor is the opaque, URL-safe encoding of the sort key of the last item
+on the previous page. Resuming from a key rather than an offset keeps pages
+stable when recipes are added or removed between requests.
+"""
+
+import base64
+import json
+from bisect import bisect_right
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        ValueError: If *cursor* is not a valid cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
+
+def paginate(
+    items: List[T],
+    key: Callable[[T], Tuple],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[T], Optional[str]]:
+    """Return the page of *items* after *cursor* and the cursor for the next one.
+
+    *items* must already be sorted by *key*. With no *limit* the rest of the
+    list is returned and the next cursor is ``None``.
+
+    Raises:
+        ValueError: If *cursor* is invalid or not comparable with *key*.
+    """
+    start = 0
+    if cursor:
+        after = decode_cursor(cursor)
+        try:
+            start = bisect_right(items, after, key=key)
+        except TypeError as exc:
+            raise ValueError("Invalid cursor") from exc
+    if limit is None:
+        return items[start:], None
+    page = items[start:start + limit]
+    if start + limit < len(items) and page:
+        return page, encode_cursor(key(page[-1]))
+    return page, None
@@ -1,14 +1,20 @@
 import logging
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import frontmatter
 
-from typing import List
+from typing import Dict, List
 
 from app.models import Recipe, RecipeSummary, ForkSummary, CookHistoryEntry, ChangelogEntry
+from app.sections import parse_sections
 
 logger = logging.getLogger(__name__)
 
+_INGREDIENTS_HEADER_RE = re.compile(r"^##\s+Ingredients", re.IGNORECASE)
+_SECTION_HEADER_RE = re.compile(r"^##\s+")
+
 
 def _parse_changelog(meta: dict) -> List[ChangelogEntry]:
     raw = meta.get("changelog", [])
@@ -37,19 +43,17 @@ def _parse_cook_history(meta: dict) -> List[CookHistoryEntry]:
     return entries
 
 
-def parse_frontmatter(path: Path) -> RecipeSummary:
-    """Parse only the frontmatter metadata from a recipe file."""
-    slug = path.stem
-    try:
-        post = frontmatter.load(path)
-        meta = post.metadata
-    except Exception:
-        logger.warning(f"Failed to parse frontmatter: {path}")
-        return RecipeSummary(slug=slug, title=slug)
+@dataclass
+class ParsedRecipeFile:
+    """Everything the index needs from a base recipe file, from a single read."""
+    summary: RecipeSummary
+    ingredients: List[str] = field(default_factory=list)
+    sections: Dict[str, str] = field(default_factory=dict)
 
-    servings = meta.get("servings")
 
-    return RecipeSummary(
+def _summary_fields(slug: str, meta: dict) -> dict:
+    servings = meta.get("servings")
+    return dict(
         slug=slug,
         title=meta.get("title", slug),
         tags=meta.get("tags", []),
@@ -67,6 +71,66 @@ def parse_frontmatter(path: Path) -> RecipeSummary:
     )
 
 
+def extract_ingredient_lines(content: str) -> List[str]:
+    """Return the lowercased bullet lines of the ## Ingredients section."""
+    lines = []
+    in_ingredients = False
+    for line in content.split("\n"):
+        if line.startswith("##"):
+            if _INGREDIENTS_HEADER_RE.match(line):
+                in_ingredients = True
+                continue
+            if in_ingredients and _SECTION_HEADER_RE.match(line):
+                break
+        if in_ingredients and line.strip().startswith("- "):
+            lines.append(line.strip().lstrip("- ").lower())
+    return lines
+
+
+def parse_frontmatter(path: Path) -> RecipeSummary:
+    """Parse only the frontmatter metadata from a recipe file."""
+    slug = path.stem
+    try:
+        post = frontmatter.load(path)
+        meta = post.metadata
+    except Exception:
+        logger.warning(f"Failed to parse frontmatter: {path}")
+        return RecipeSummary(slug=slug, title=slug)
+
+    return RecipeSummary(**_summary_fields(slug, meta))
+
+
+def parse_recipe_file(path: Path) -> ParsedRecipeFile:
+    """Read and parse a recipe file once, returning summary, ingredients and sections.
+
+    Raises:
+        OSError: If the file can't be read, e.g. it was deleted meanwhile.
+    """
+    slug = path.stem
+    try:
+        post = frontmatter.load(path)
+        meta = post.metadata
+        content = post.content
+    except OSError:
+        raise
+    except Exception:
+        # Readable but not valid frontmatter: index it under its slug.
+        logger.warning(f"Failed to parse frontmatter: {path}")
+        summary = RecipeSummary(slug=slug, title=slug)
+        try:
+            content = path.read_text()
+        except UnicodeDecodeError:
+            return ParsedRecipeFile(summary=summary)
+    else:
+        summary = RecipeSummary(**_summary_fields(slug, meta))
+
+    return ParsedRecipeFile(
+        summary=summary,
+        ingredients=extract_ingredient_lines(content),
+        sections=parse_sections(content),
+    )
+
+
 def parse_recipe(path: Path) -> Recipe:
     """Parse full recipe including frontmatter and markdown body."""
     slug = path.stem
@@ -79,25 +143,7 @@ def parse_recipe(path: Path) -> Recipe:
         content = path.read_text()
         return Recipe(slug=slug, title=slug, content=content)
 
-    servings = meta.get("servings")
-
-    return Recipe(
-        slug=slug,
-        title=meta.get("title", slug),
-        tags=meta.get("tags", []),
-        servings=str(servings) if servings is not None else None,
-        prep_time=meta.get("prep_time"),
-        cook_time=meta.get("cook_time"),
-        date_added=str(meta.get("date_added")) if meta.get("date_added") else None,
-        source=meta.get("source"),
-        author=meta.get("author"),
-        image=meta.get("image"),
-        cook_history=_parse_cook_history(meta),
-        likes=int(meta.get("likes", 0)),
-        version=int(meta.get("version", 0)),
-        changelog=_parse_changelog(meta),
-        content=content,
-    )
+    return Recipe(**_summary_fields(slug, meta), content=content)
 
 
 def parse_fork_frontmatter(path: Path) -> ForkSummary:
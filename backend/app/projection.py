@@ -0,0 +1,55 @@
+"""Sparse field selection for recipe summary responses.
+
+List views rarely need a recipe's changelog, cook history or full fork
+records. A ``fields=`` query parameter names the fields to serialize, either
+explicitly (``fields=title,tags``) or through a preset (``fields=card``).
+"""
+
+from typing import Any, Dict, List, Optional
+
+from app.models import RecipeSummary
+
+# What the recipe grid renders: title, image, timing and tags, plus enough
+# of each fork to count the active ones.
+CARD_FIELDS: Dict[str, Any] = {
+    "slug": True,
+    "title": True,
+    "image": True,
+    "tags": True,
+    "servings": True,
+    "prep_time": True,
+    "cook_time": True,
+    "likes": True,
+    "forks": {"__all__": {"name", "fork_name", "merged_at", "failed_at"}},
+}
+
+PRESETS: Dict[str, Dict[str, Any]] = {"card": CARD_FIELDS}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Turn a ``fields=`` value into a pydantic ``include`` spec.
+
+    Returns ``None`` when no projection was requested. The slug is always
+    included so clients can still link to the recipe.
+
+    Raises:
+        ValueError: If a name is neither a preset nor a summary field.
+    """
+    if not fields or not fields.strip():
+        return None
+    include: Dict[str, Any] = {"slug": True}
+    for name in (f.strip() for f in fields.split(",")):
+        if not name:
+            continue
+        if name in PRESETS:
+            include.update(PRESETS[name])
+        elif name in RecipeSummary.model_fields:
+            include[name] = True
+        else:
+            raise ValueError(f"Unknown field: {name}")
+    return include
+
+
+def project(summaries: List[RecipeSummary], include: Dict[str, Any]) -> List[dict]:
+    """Serialize only the *include* fields of each summary."""
+    return [s.model_dump(mode="json", include=include) for s in summaries]
@@ -1,14 +1,17 @@
 import datetime
 import logging
 from pathlib import Path
+from typing import Optional
 
 import frontmatter
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import PlainTextResponse
 
 from app.changelog import append_changelog_entry, remove_changelog_entries_for_fork
 from app.generator import slugify
-from app.git import git_commit, git_find_commit, git_head_hash, git_log, git_rm, git_show
+from app.git import (
+    flush_commits, git_commit, git_find_commit, git_head_hash, git_history, git_rm, git_show,
+)
 from app.index import RecipeIndex
 from pydantic import BaseModel
 
@@ -20,7 +23,7 @@ from app.sections import (
     merge_content,
     merge_fork_into_base,
 )
-from app.validation import validate_slug
+from app.validation import validate_revision, validate_slug
 
 logger = logging.getLogger(__name__)
 
@@ -228,17 +231,21 @@ def create_fork_router(index: RecipeIndex, recipes_dir: Path) -> APIRouter:
         )
 
     @router.get("/{fork_name_slug}/history")
-    def fork_history(slug: str, fork_name_slug: str, content: bool = False):
+    def fork_history(
+        slug: str,
+        fork_name_slug: str,
+        content: bool = False,
+        limit: int = Query(20, ge=1, le=100),
+        before: Optional[str] = Query(None),
+    ):
         """Return git history for a fork file."""
+        validate_revision(before)
         path = _fork_path(slug, fork_name_slug)
         if not path.exists():
             raise HTTPException(status_code=404, detail="Fork not found")
-
-        entries = git_log(recipes_dir, path)
-        if content:
-            for entry in entries:
-                entry["content"] = git_show(recipes_dir, entry["hash"], path)
-        return {"history": entries}
+        return git_history(
+            recipes_dir, path, limit=limit, before=before, with_content=content
+        )
 
     @router.post("/{fork_name_slug}/merge")
     def merge_fork(slug: str, fork_name_slug: str, data: MergeForkRequest):
@@ -248,6 +255,9 @@ def create_fork_router(index: RecipeIndex, recipes_dir: Path) -> APIRouter:
         if not fork_path.exists():
             raise HTTPException(status_code=404, detail="Fork not found")
 
+        # Commit queued writes to the base first: unmerge restores the merge
+        # commit's parent, which must not predate them.
+        flush_commits(recipes_dir)
         base_post = frontmatter.load(base_path)
         fork_post = frontmatter.load(fork_path)
 
@@ -262,7 +272,9 @@ def create_fork_router(index: RecipeIndex, recipes_dir: Path) -> APIRouter:
 
         # Write updated base file
         base_path.write_text(frontmatter.dumps(base_post))
-        git_commit(recipes_dir, base_path, f"Merge fork '{fork_name}' into {slug}")
+        git_commit(
+            recipes_dir, base_path, f"Merge fork '{fork_name}' into {slug}", immediate=True
+        )
 
         # Mark fork as merged and append changelog
         fork_post.metadata["merged_at"] = datetime.date.today().isoformat()
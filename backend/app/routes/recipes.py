@@ -1,30 +1,76 @@
 from typing import List, Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from app.git import git_log, git_show
+from app.conditional import not_modified
+from app.git import git_history
 from app.index import RecipeIndex
 from app.models import Recipe, RecipeSummary
-from app.sections import extract_structured_data
-from app.validation import validate_slug
+from app.pagination import paginate
+from app.projection import parse_fields, project
+from app.validation import validate_revision, validate_slug
 
 
 def create_recipe_router(index: RecipeIndex) -> APIRouter:
     router = APIRouter(prefix="/api")
 
+    def page_of(results, response: Response, key, limit, cursor):
+        """Slice *results* to one page and report the total and next cursor."""
+        try:
+            page, next_cursor = paginate(results, key, limit, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        response.headers["X-Total-Count"] = str(len(results))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return page
+
+    def include_for(fields: Optional[str]):
+        try:
+            return parse_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def projected(results, response: Response, include):
+        """Serialize *results* with only the *include* fields, if any.
+
+        The response model would fill every omitted field back in with its
+        default, so projected results bypass it.
+        """
+        if include is None:
+            return results
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower().startswith("x-") or k.lower() == "etag"
+        }
+        return JSONResponse(content=project(results, include), headers=headers)
+
     @router.get("/recipes/random", response_model=RecipeSummary)
-    def random_recipe():
+    def random_recipe(fields: Optional[str] = Query(None)):
+        include = include_for(fields)
         recipe = index.random()
         if recipe is None:
             raise HTTPException(status_code=404, detail="No recipes available")
+        if include is not None:
+            return JSONResponse(content=project([recipe], include)[0])
         return recipe
 
     @router.get("/recipes", response_model=List[RecipeSummary])
     def list_recipes(
+        request: Request,
+        response: Response,
         tags: Optional[str] = Query(None),
         sort: Optional[str] = Query(None),
+        limit: Optional[int] = Query(None, ge=1, le=500),
+        cursor: Optional[str] = Query(None),
+        fields: Optional[str] = Query(None),
     ):
+        include = include_for(fields)
+        cached = not_modified(request, response, index.etag)
+        if cached is not None:
+            return cached
         tag_list = (
             [t.strip() for t in tags.split(",") if t.strip()]
             if tags
@@ -32,25 +78,32 @@ def create_recipe_router(index: RecipeIndex) -> APIRouter:
         )
 
         if sort == "never-cooked":
-            return index.filter_never_cooked(tag_list)
+            results = index.filter_never_cooked(tag_list)
         elif sort == "least-recent":
-            return index.filter_least_recent(tag_list)
+            results = index.filter_least_recent(tag_list)
         elif sort == "quick":
-            return index.filter_quick(tag_list)
+            results = index.filter_quick(tag_list)
+        elif tag_list:
+            # Default: no sort filter
+            results = index.filter_by_tags(tag_list)
+        else:
+            results = index.list_all()
 
-        # Default: no sort filter
-        if tag_list:
-            return index.filter_by_tags(tag_list)
-        return index.list_all()
+        page = page_of(
+            results, response, lambda r: index.sort_key(r, sort), limit, cursor
+        )
+        return projected(page, response, include)
 
     @router.get("/recipes/{slug}", response_model=Recipe)
-    def get_recipe(slug: str):
+    def get_recipe(slug: str, request: Request, response: Response):
         validate_slug(slug)
+        cached = not_modified(request, response, index.recipe_etag(slug))
+        if cached is not None:
+            return cached
         recipe = index.get(slug)
         if recipe is None:
             raise HTTPException(status_code=404, detail="Recipe not found")
-        structured = extract_structured_data(recipe.content)
-        return {**recipe.model_dump(), **structured}
+        return recipe
 
     @router.get("/recipes/{slug}/export")
     def export_recipe(slug: str):
@@ -64,28 +117,73 @@ def create_recipe_router(index: RecipeIndex) -> APIRouter:
         )
 
     @router.get("/recipes/{slug}/history")
-    def recipe_history(slug: str):
-        """Return git history for the base recipe with content at each version."""
+    def recipe_history(
+        slug: str,
+        limit: int = Query(20, ge=1, le=100),
+        before: Optional[str] = Query(None),
+    ):
+        """Return git history for the base recipe with content at each version.
+
+        Pass the previous page's ``next_before`` as *before* to page further
+        back.
+        """
         validate_slug(slug)
+        validate_revision(before)
         path = index.recipes_dir / f"{slug}.md"
         if not path.exists():
             raise HTTPException(status_code=404, detail="Recipe not found")
+        return git_history(index.recipes_dir, path, limit=limit, before=before)
 
-        entries = git_log(index.recipes_dir, path)
-        for entry in entries:
-            entry["content"] = git_show(index.recipes_dir, entry["hash"], path)
-        return {"history": entries}
+    @router.get("/search/suggest")
+    def suggest_completions(
+        prefix: str = Query(""),
+        limit: int = Query(10, ge=1, le=50),
+    ):
+        return [
+            {"text": text, "count": count}
+            for text, count in index.complete(prefix, limit)
+        ]
 
     @router.get("/search", response_model=List[RecipeSummary])
-    def search_recipes(q: str = Query("")):
-        return index.search(q)
+    def search_recipes(
+        request: Request,
+        response: Response,
+        q: str = Query(""),
+        rank: Optional[str] = Query(None),
+        fuzzy: bool = Query(True),
+        limit: Optional[int] = Query(None, ge=1, le=500),
+        cursor: Optional[str] = Query(None),
+        fields: Optional[str] = Query(None),
+    ):
+        include = include_for(fields)
+        cached = not_modified(request, response, index.etag)
+        if cached is not None:
+            return cached
+        search = index.search_ranked if rank == "relevance" else index.search
+        results = search(q)
+        if not results and fuzzy and q.strip():
+            # Nothing matched: retry with the closest known spelling and tell
+            # the client what was searched instead. Header values must be
+            # latin-1, so the suggestion is percent-encoded as UTF-8.
+            suggestion = index.suggest(q)
+            if suggestion:
+                response.headers["X-Did-You-Mean"] = quote(suggestion)
+                results = search(suggestion)
+        if rank == "relevance":
+            # Scores shift as the library changes, so relevance pages resume
+            # from a rank position rather than a stored score.
+            positions = {r.slug: (i,) for i, r in enumerate(results)}
+            key = lambda r: positions[r.slug]
+        else:
+            key = index.sort_key
+        page = page_of(results, response, key, limit, cursor)
+        return projected(page, response, include)
 
     @router.get("/tags")
-    def list_tags():
-        tags: dict[str, int] = {}
-        for recipe in index.list_all():
-            for tag in recipe.tags:
-                tags[tag] = tags.get(tag, 0) + 1
-        return [{"tag": t, "count": c} for t, c in sorted(tags.items())]
+    def list_tags(request: Request, response: Response):
+        cached = not_modified(request, response, index.etag)
+        if cached is not None:
+            return cached
+        return [{"tag": t, "count": c} for t, c in index.tag_counts()]
 
     return router
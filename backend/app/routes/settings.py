@@ -3,9 +3,9 @@
 import logging
 from pathlib import Path
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
-from app.models import RemoteConfig, SyncConfig, SyncStatus
+from app.models import RemoteConfig, SyncConfig, SyncJob, SyncStatus
 from app.remote_config import get_config_path, load_config, save_config
 from app.sync import SyncEngine
 
@@ -16,18 +16,19 @@ def create_settings_router(sync_engine: SyncEngine, recipes_dir: Path) -> APIRou
     router = APIRouter()
 
     @router.get("/api/sync/status", response_model=SyncStatus)
-    def sync_status():
-        return sync_engine.get_status()
+    async def sync_status():
+        return await sync_engine.get_status_async()
 
-    @router.post("/api/sync/trigger")
+    @router.post("/api/sync/trigger", response_model=SyncJob, status_code=202)
     def sync_trigger():
-        pull_result = sync_engine.pull()
-        push_ok = sync_engine.push()
-        return {
-            "pull_success": pull_result.success,
-            "pull_changed": pull_result.changed_files,
-            "push_success": push_ok,
-        }
+        return sync_engine.start_sync()
+
+    @router.get("/api/sync/jobs/{job_id}", response_model=SyncJob)
+    def sync_job(job_id: str):
+        job = sync_engine.get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Sync job not found")
+        return job
 
     @router.get("/api/settings")
     def get_settings():
@@ -49,12 +50,14 @@ def create_settings_router(sync_engine: SyncEngine, recipes_dir: Path) -> APIRou
         elif remote.url:
             from app.git import git_remote_add
             git_remote_add(recipes_dir, remote.url)
+        sync_engine.reschedule()
         return {"saved": True}
 
     @router.delete("/api/settings/remote")
     def disconnect_remote():
         config_path = get_config_path(recipes_dir)
         save_config(config_path, RemoteConfig(), SyncConfig())
+        sync_engine.reschedule()
         return {"disconnected": True}
 
     return router
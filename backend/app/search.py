@@ -0,0 +1,469 @@
+"""In-memory inverted indexes backing recipe search."""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.ingredients import PARENTHETICAL_RE, UNIT_MAP
+
+_TOKEN_RE = re.compile(r"\w+")
+_GRAM_SIZE = 3
+
+
+def tokenize(text: str) -> list:
+    """Split lowercased text into word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def is_single_token(query: str) -> bool:
+    """Return True if *query* is exactly one word token (no spaces or punctuation)."""
+    return bool(query) and _TOKEN_RE.fullmatch(query) is not None
+
+
+def _grams(token: str, size: int) -> Set[str]:
+    return {token[i:i + size] for i in range(len(token) - size + 1)}
+
+
+class SubstringIndex:
+    """Token postings plus an n-gram index over the token vocabulary.
+
+    A query matches a document when the query is a substring of one of the
+    document's texts. Every word run in such a query must sit inside a word
+    run of the matching text, so intersecting "documents with a token that
+    contains this query word" over the query words yields a superset of the
+    true matches -- and the exact set when the query is a single word.
+    The n-gram index is built over the distinct vocabulary, not over
+    documents, so it stays small as the library grows.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        # n-gram (1..3 chars) -> vocabulary tokens containing it
+        self._grams: Dict[str, Set[str]] = {}
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_tokens.clear()
+        self._grams.clear()
+
+    def add(self, doc_id: str, tokens: Iterable[str]) -> None:
+        """Index *tokens* under *doc_id*, replacing anything indexed before."""
+        self.remove(doc_id)
+        tokens = set(tokens)
+        self._doc_tokens[doc_id] = tokens
+        for token in tokens:
+            docs = self._postings.get(token)
+            if docs is None:
+                docs = self._postings[token] = set()
+                self._add_to_vocabulary(token)
+            docs.add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        for token in self._doc_tokens.pop(doc_id, ()):
+            docs = self._postings.get(token)
+            if docs is None:
+                continue
+            docs.discard(doc_id)
+            if not docs:
+                del self._postings[token]
+                self._remove_from_vocabulary(token)
+
+    def _add_to_vocabulary(self, token: str) -> None:
+        for size in range(1, _GRAM_SIZE + 1):
+            for gram in _grams(token, size):
+                self._grams.setdefault(gram, set()).add(token)
+
+    def _remove_from_vocabulary(self, token: str) -> None:
+        for size in range(1, _GRAM_SIZE + 1):
+            for gram in _grams(token, size):
+                tokens = self._grams.get(gram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._grams[gram]
+
+    def tokens_containing(self, fragment: str) -> Set[str]:
+        """Return vocabulary tokens that contain *fragment*."""
+        size = min(len(fragment), _GRAM_SIZE)
+        pools = []
+        for gram in _grams(fragment, size):
+            tokens = self._grams.get(gram)
+            if not tokens:
+                return set()
+            pools.append(tokens)
+        smallest = min(pools, key=len)
+        if len(fragment) <= _GRAM_SIZE:
+            return set(smallest)
+        return {t for t in smallest if fragment in t}
+
+    def candidates(self, query: str) -> Optional[Set[str]]:
+        """Return ids of documents that may contain *query* as a substring.
+
+        Returns None when the query has no word characters, in which case the
+        index cannot narrow the search and the caller has to scan.
+        """
+        words = tokenize(query)
+        if not words:
+            return None
+        result: Optional[Set[str]] = None
+        for word in sorted(set(words), key=len, reverse=True):
+            docs: Set[str] = set()
+            for token in self.tokens_containing(word):
+                docs |= self._postings[token]
+            result = docs if result is None else result & docs
+            if not result:
+                return set()
+        return result
+
+
+DEFAULT_FIELD_WEIGHTS: Dict[str, float] = {
+    "title": 3.0,
+    "tags": 2.0,
+    "ingredients": 1.5,
+    "instructions": 1.0,
+}
+
+
+class RankedIndex:
+    """Field-weighted BM25 relevance scoring over per-field term postings.
+
+    Postings (term -> doc -> term frequency) and field lengths are kept up to
+    date on every add/remove, so a query only walks the postings of its own
+    terms. Query words also match longer vocabulary terms they are a prefix
+    of ("chick" -> "chicken"), at a reduced weight.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    PREFIX_WEIGHT = 0.5
+
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None) -> None:
+        self.field_weights = dict(DEFAULT_FIELD_WEIGHTS)
+        if field_weights:
+            self.field_weights.update(field_weights)
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._lengths: Dict[str, Dict[str, int]] = {}
+        self._total_length: Dict[str, int] = {}
+        self._doc_fields: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._df: Dict[str, int] = {}
+        self._sorted_vocab: Optional[list] = None
+        self.clear()
+
+    def clear(self) -> None:
+        self._postings = {f: {} for f in self.field_weights}
+        self._lengths = {f: {} for f in self.field_weights}
+        self._total_length = {f: 0 for f in self.field_weights}
+        self._doc_fields.clear()
+        self._df.clear()
+        self._sorted_vocab = None
+
+    def add(self, doc_id: str, fields: Dict[str, List[str]]) -> None:
+        """Index the tokens of each field under *doc_id*, replacing earlier data."""
+        self.remove(doc_id)
+        doc_fields: Dict[str, Dict[str, int]] = {}
+        doc_terms: Set[str] = set()
+        for field, tokens in fields.items():
+            if field not in self.field_weights:
+                continue
+            counts = Counter(tokens)
+            doc_fields[field] = counts
+            doc_terms.update(counts)
+            self._lengths[field][doc_id] = len(tokens)
+            self._total_length[field] += len(tokens)
+            postings = self._postings[field]
+            for term, tf in counts.items():
+                postings.setdefault(term, {})[doc_id] = tf
+        self._doc_fields[doc_id] = doc_fields
+        for term in doc_terms:
+            if term not in self._df:
+                self._sorted_vocab = None
+            self._df[term] = self._df.get(term, 0) + 1
+
+    def remove(self, doc_id: str) -> None:
+        doc_fields = self._doc_fields.pop(doc_id, None)
+        if doc_fields is None:
+            return
+        doc_terms: Set[str] = set()
+        for field, counts in doc_fields.items():
+            self._total_length[field] -= self._lengths[field].pop(doc_id, 0)
+            postings = self._postings[field]
+            for term in counts:
+                docs = postings.get(term)
+                if docs is not None:
+                    docs.pop(doc_id, None)
+                    if not docs:
+                        del postings[term]
+            doc_terms.update(counts)
+        for term in doc_terms:
+            remaining = self._df.get(term, 0) - 1
+            if remaining > 0:
+                self._df[term] = remaining
+            else:
+                self._df.pop(term, None)
+                self._sorted_vocab = None
+
+    def _expand(self, word: str) -> Dict[str, float]:
+        """Return {term: weight} for the exact word and terms it prefixes."""
+        if self._sorted_vocab is None:
+            self._sorted_vocab = sorted(self._df)
+        vocab = self._sorted_vocab
+        terms: Dict[str, float] = {}
+        for i in range(bisect_left(vocab, word), len(vocab)):
+            term = vocab[i]
+            if not term.startswith(word):
+                break
+            terms[term] = 1.0 if term == word else self.PREFIX_WEIGHT
+        return terms
+
+    def score(self, query: str) -> Dict[str, float]:
+        """Return {doc_id: score} for documents matching any query term."""
+        n_docs = len(self._doc_fields)
+        if not n_docs:
+            return {}
+        terms: Dict[str, float] = {}
+        for word in set(tokenize(query)):
+            for term, weight in self._expand(word).items():
+                terms[term] = max(terms.get(term, 0.0), weight)
+
+        avg_length = {
+            f: (total / n_docs) or 1.0 for f, total in self._total_length.items()
+        }
+        scores: Dict[str, float] = {}
+        for term, term_weight in terms.items():
+            df = self._df[term]
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for field, field_weight in self.field_weights.items():
+                docs = self._postings[field].get(term)
+                if not docs:
+                    continue
+                lengths = self._lengths[field]
+                norm = self.K1 * (1 - self.B)
+                slope = self.K1 * self.B / avg_length[field]
+                factor = idf * term_weight * field_weight * (self.K1 + 1)
+                for doc_id, tf in docs.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + factor * tf / (
+                        tf + norm + slope * lengths[doc_id]
+                    )
+        return scores
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between *a* and *b*, or ``limit + 1`` once it exceeds *limit*."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _padded_trigrams(word: str) -> Set[str]:
+    return _grams(f"$${word}$", 3)
+
+
+class FuzzyIndex:
+    """Trigram index over a word vocabulary for typo-tolerant lookups.
+
+    Candidates for a misspelled word are vocabulary words sharing enough
+    padded trigrams with it (each edit changes at most three), so lookup
+    cost is bounded by the vocabulary, not the number of documents. Survivors
+    are confirmed with a bounded edit distance.
+    """
+
+    MIN_WORD_LENGTH = 3
+
+    def __init__(self) -> None:
+        self._word_docs: Dict[str, int] = {}
+        self._doc_words: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+
+    def clear(self) -> None:
+        self._word_docs.clear()
+        self._doc_words.clear()
+        self._trigrams.clear()
+
+    def add(self, doc_id: str, tokens: Iterable[str]) -> None:
+        self.remove(doc_id)
+        words = {
+            t for t in set(tokens)
+            if len(t) >= self.MIN_WORD_LENGTH and t.isalpha()
+        }
+        self._doc_words[doc_id] = words
+        for word in words:
+            count = self._word_docs.get(word, 0)
+            if not count:
+                for gram in _padded_trigrams(word):
+                    self._trigrams.setdefault(gram, set()).add(word)
+            self._word_docs[word] = count + 1
+
+    def remove(self, doc_id: str) -> None:
+        for word in self._doc_words.pop(doc_id, ()):
+            count = self._word_docs.get(word, 0) - 1
+            if count > 0:
+                self._word_docs[word] = count
+                continue
+            self._word_docs.pop(word, None)
+            for gram in _padded_trigrams(word):
+                words = self._trigrams.get(gram)
+                if words is not None:
+                    words.discard(word)
+                    if not words:
+                        del self._trigrams[gram]
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._word_docs
+
+    @staticmethod
+    def max_edits(word: str) -> int:
+        return 1 if len(word) <= 5 else 2
+
+    def closest(self, word: str) -> Optional[str]:
+        """Return the nearest vocabulary word within the edit bound, or None.
+
+        Ties on distance go to the word used by more documents.
+        """
+        limit = self.max_edits(word)
+        grams = _padded_trigrams(word)
+        min_shared = max(1, len(grams) - 3 * limit)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._trigrams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        best: Optional[str] = None
+        best_key = None
+        for candidate, count in shared.items():
+            if count < min_shared or candidate == word:
+                continue
+            distance = edit_distance(word, candidate, limit)
+            if distance > limit:
+                continue
+            key = (distance, -self._word_docs[candidate], candidate)
+            if best_key is None or key < best_key:
+                best, best_key = candidate, key
+        return best
+
+    def suggest(self, query: str) -> Optional[str]:
+        """Return *query* with unknown words replaced by their closest match.
+
+        Returns None when every word is already known or nothing close exists.
+        """
+        words = tokenize(query)
+        corrected = []
+        changed = False
+        for word in words:
+            if word in self or len(word) < self.MIN_WORD_LENGTH or not word.isalpha():
+                corrected.append(word)
+                continue
+            match = self.closest(word)
+            if match is None:
+                corrected.append(word)
+                continue
+            corrected.append(match)
+            changed = True
+        return " ".join(corrected) if changed else None
+
+
+_QUANTITY_RE = re.compile(r"^[\d/.\-¼-¾⅐-⅞]+$")
+
+
+def ingredient_phrase(line: str) -> str:
+    """Return the food part of an ingredient line ("1/2 cup coconut cream, ..." -> "coconut cream").
+
+    A cheap approximation of :func:`app.ingredients.parse_ingredient` for
+    indexing: drops parentheticals, leading quantities and units, and
+    anything after the first comma.
+    """
+    text = PARENTHETICAL_RE.sub(" ", line) if "(" in line else line
+    text = text.split(",", 1)[0]
+    words = text.split()
+    while words and (_QUANTITY_RE.match(words[0]) or words[0].rstrip(".") in UNIT_MAP):
+        words.pop(0)
+    if words and words[0] == "of":
+        words.pop(0)
+    return " ".join(words)
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over short phrases with document counts.
+
+    Every word-suffix of a phrase ("tikka masala", "masala") is an entry, so
+    a prefix matches the start of any word. The sorted entry array is only
+    rebuilt when a phrase appears or disappears, not on every update.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._display: Dict[str, str] = {}
+        self._doc_phrases: Dict[str, Set[str]] = {}
+        self._entries: Optional[List[Tuple[str, str]]] = None
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._display.clear()
+        self._doc_phrases.clear()
+        self._entries = None
+
+    def add(self, doc_id: str, phrases: Iterable[str]) -> None:
+        self.remove(doc_id)
+        keys: Set[str] = set()
+        for phrase in phrases:
+            phrase = " ".join(phrase.split())
+            key = phrase.lower()
+            if not key:
+                continue
+            keys.add(key)
+            self._display[key] = phrase
+        self._doc_phrases[doc_id] = keys
+        for key in keys:
+            if key not in self._counts:
+                self._entries = None
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def remove(self, doc_id: str) -> None:
+        for key in self._doc_phrases.pop(doc_id, ()):
+            count = self._counts.get(key, 0) - 1
+            if count > 0:
+                self._counts[key] = count
+                continue
+            self._counts.pop(key, None)
+            self._display.pop(key, None)
+            self._entries = None
+
+    def _sorted_entries(self) -> List[Tuple[str, str]]:
+        if self._entries is None:
+            entries = []
+            for key in self._counts:
+                words = key.split(" ")
+                for i in range(len(words)):
+                    entries.append((" ".join(words[i:]), key))
+            entries.sort()
+            self._entries = entries
+        return self._entries
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return up to *limit* (phrase, document count) pairs, most common first."""
+        prefix = " ".join(prefix.lower().split())
+        if not prefix:
+            return []
+        entries = self._sorted_entries()
+        matches: Set[str] = set()
+        for i in range(bisect_left(entries, (prefix, "")), len(entries)):
+            suffix, key = entries[i]
+            if not suffix.startswith(prefix):
+                break
+            matches.add(key)
+        best = heapq.nsmallest(limit, matches, key=lambda k: (-self._counts[k], k))
+        return [(self._display[k], self._counts[k]) for k in best]
@@ -4,6 +4,8 @@ import datetime
 import re
 from typing import Dict, List, Optional
 
+_SECTION_HEADER_RE = re.compile(r"^##\s+(.+)$")
+
 
 def parse_sections(content: str) -> Dict[str, str]:
     """Parse markdown body (after frontmatter) into {section_name: content}.
@@ -16,7 +18,7 @@ def parse_sections(content: str) -> Dict[str, str]:
     current_lines = []
 
     for line in content.split("\n"):
-        match = re.match(r"^##\s+(.+)$", line)
+        match = _SECTION_HEADER_RE.match(line) if line.startswith("##") else None
         if match:
             sections[current_key] = "\n".join(current_lines).strip()
             current_key = match.group(1).strip()
@@ -1,45 +1,179 @@
 """Sync engine for pushing/pulling recipes to/from a git remote."""
 
+import asyncio
 import logging
+import random
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
-from app.git import git_has_remote, git_push, git_pull, git_ahead_behind, PullResult
-from app.models import SyncStatus
+from app.git import (
+    flush_commits, flush_commits_async, git_fetch, git_has_remote, git_push,
+    git_pull, git_ahead_behind, git_state_token, PullResult,
+    git_fetch_async, git_push_async, git_pull_async, _repo_lock,
+)
+from app.models import SyncJob, SyncStatus
+from app.remote_config import load_config
 
 logger = logging.getLogger(__name__)
 
+# Consecutive failures double the wait between scheduled syncs, up to this.
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+# Scheduled syncs are spread by up to this fraction of the interval so many
+# instances sharing a remote don't all hit it at once.
+SYNC_JITTER = 0.1
+# Finished sync jobs kept around for polling.
+MAX_SYNC_JOBS = 20
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _job_result(job: SyncJob) -> dict:
+    return {
+        "pull_success": bool(job.pull_success),
+        "pull_changed": job.pull_changed,
+        "push_success": bool(job.push_success),
+    }
+
+
+def next_sync_delay(interval_seconds: float, failures: int = 0, rng=random) -> float:
+    """Seconds until the next scheduled sync after *failures* failed ones."""
+    delay = interval_seconds * (2 ** min(failures, 16))
+    delay = min(delay, max(interval_seconds, MAX_BACKOFF_SECONDS))
+    return delay * rng.uniform(1 - SYNC_JITTER, 1 + SYNC_JITTER)
+
 
 class SyncEngine:
-    def __init__(self, recipes_dir: Path, index):
+    def __init__(self, recipes_dir: Path, index, config_path: Optional[Path] = None):
         self.recipes_dir = recipes_dir
         self.index = index
+        self.config_path = config_path
         self._last_synced: Optional[str] = None
         self._last_error: Optional[str] = None
+        # (repo state token, connected, ahead, behind). Counts are taken
+        # against the last fetch, which only the background refresher and
+        # pull/push do, so status polls never touch the network.
+        self._status_cache: Optional[Tuple[tuple, bool, int, int]] = None
+        self._status_lock = threading.Lock()
+        self._refresh_stop = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        # The pull+push currently running, shared by everyone who asks for a
+        # sync while it is in flight.
+        self._inflight: Optional[Tuple[SyncJob, Future]] = None
+        self._inflight_lock = threading.Lock()
+        self._jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+        self._scheduler_thread: Optional[threading.Thread] = None
+        self._scheduler_stop = threading.Event()
+        self._scheduler_wake = threading.Event()
+
+    def start_sync(self) -> SyncJob:
+        """Start a pull+push in the background and return its job.
+
+        While a job is running every caller gets that same job back, so
+        concurrent triggers never run two pulls against the working tree.
+        """
+        return self._start()[0]
+
+    def get_job(self, job_id: str) -> Optional[SyncJob]:
+        """Return a recent sync job by id."""
+        return self._jobs.get(job_id)
+
+    def sync(self) -> dict:
+        """Pull then push, waiting for the result; joins a sync already in flight.
+
+        Every git command in a job runs under GIT_TIMEOUT_SECONDS, so this
+        always returns.
+        """
+        return self._start()[1].result()
+
+    def _start(self) -> Tuple[SyncJob, Future]:
+        with self._inflight_lock:
+            if self._inflight is not None:
+                return self._inflight
+            job = SyncJob(id=uuid.uuid4().hex, started_at=_now())
+            self._inflight = (job, Future())
+            self._jobs[job.id] = job
+            while len(self._jobs) > MAX_SYNC_JOBS:
+                self._jobs.popitem(last=False)
+            threading.Thread(
+                target=self._run_job, args=self._inflight,
+                name=f"sync-job-{job.id[:8]}", daemon=True,
+            ).start()
+            return self._inflight
+
+    def _run_job(self, job: SyncJob, future: Future) -> None:
+        try:
+            # The job thread gets its own event loop, so the network steps go
+            # through run_git_async: timeouts, no credential prompts, and the
+            # whole process group killed if git stalls.
+            asyncio.run(self._run_job_async(job))
+            job.state = "done"
+        except Exception as e:
+            logger.exception("Sync job %s failed", job.id)
+            job.error = str(e) or type(e).__name__
+            job.state = "failed"
+        job.finished_at = _now()
+        with self._inflight_lock:
+            self._inflight = None
+        if job.state == "failed":
+            future.set_exception(RuntimeError(job.error))
+        else:
+            future.set_result(_job_result(job))
+
+    async def _run_job_async(self, job: SyncJob) -> None:
+        job.state = "fetching"
+        await flush_commits_async(self.recipes_dir)
+        fetched = await git_fetch_async(self.recipes_dir)
+        job.state = "merging"
+        if fetched:
+            pull_result = await git_pull_async(self.recipes_dir, fetch=False)
+        else:
+            pull_result = PullResult(success=False)
+        job.state = "reindexing"
+        self._after_pull(pull_result)
+        job.pull_success = pull_result.success
+        job.pull_changed = pull_result.changed_files
+        job.state = "pushing"
+        job.push_success = await self.push_async()
+        job.error = self._last_error
 
     def push(self) -> bool:
         """Push local commits to remote."""
-        ok = git_push(self.recipes_dir)
+        return self._after_push(git_push(self.recipes_dir))
+
+    async def push_async(self) -> bool:
+        """Async :meth:`push`."""
+        return self._after_push(await git_push_async(self.recipes_dir))
+
+    def _after_push(self, ok: bool) -> bool:
+        self._status_cache = None
         if ok:
-            self._last_synced = datetime.now(timezone.utc).isoformat()
+            self._last_synced = _now()
             self._last_error = None
         return ok
 
     def pull(self) -> PullResult:
         """Pull from remote. Re-indexes changed recipe files."""
-        result = git_pull(self.recipes_dir)
+        return self._after_pull(git_pull(self.recipes_dir))
+
+    def _after_pull(self, result: PullResult) -> PullResult:
+        self._status_cache = None
         if result.success:
-            self._last_synced = datetime.now(timezone.utc).isoformat()
+            self._last_synced = _now()
             self._last_error = None
             if self.index and result.changed_files:
-                for filename in result.changed_files:
-                    path = self.recipes_dir / filename
-                    if path.exists() and path.suffix == ".md":
-                        self.index.add_or_update(path)
-                    elif not path.exists():
-                        slug = path.stem
-                        self.index.remove(slug)
+                self.index.apply_changes(
+                    added=result.added,
+                    modified=result.modified,
+                    deleted=result.deleted,
+                    renamed=result.renamed,
+                )
         elif result.conflict_files:
             self._last_error = f"Conflicts in {len(result.conflict_files)} file(s)"
             self._resolve_conflicts(result.conflict_files)
@@ -49,6 +183,11 @@ class SyncEngine:
 
     def _resolve_conflicts(self, conflict_files: list) -> None:
         """Auto-resolve conflicts by keeping ours and creating forks from theirs."""
+        # Stage and commit with queued commits held off, as git_pull does.
+        with _repo_lock(self.recipes_dir):
+            self._resolve_conflicts_locked(conflict_files)
+
+    def _resolve_conflicts_locked(self, conflict_files: list) -> None:
         import subprocess
         from datetime import date
 
@@ -95,11 +234,124 @@ class SyncEngine:
             logger.exception("Failed to complete merge commit")
 
     def get_status(self) -> SyncStatus:
-        """Return current sync status."""
-        connected = git_has_remote(self.recipes_dir)
-        ahead, behind = (0, 0)
-        if connected:
-            ahead, behind = git_ahead_behind(self.recipes_dir)
+        """Return current sync status, served from memory when nothing changed."""
+        flush_commits(self.recipes_dir)
+        cached = self._status_cache
+        if cached is None or cached[0] != git_state_token(self.recipes_dir):
+            cached = self._compute_status()
+        return self._status(*cached[1:])
+
+    async def get_status_async(self) -> SyncStatus:
+        """Async :meth:`get_status`.
+
+        With no commits waiting in the queue, a cache hit never leaves the
+        event loop.
+        """
+        await flush_commits_async(self.recipes_dir)
+        cached = self._status_cache
+        if cached is None or cached[0] != git_state_token(self.recipes_dir):
+            cached = await asyncio.to_thread(self._compute_status)
+        return self._status(*cached[1:])
+
+    def _compute_status(self) -> Tuple[tuple, bool, int, int]:
+        with self._status_lock:
+            token = git_state_token(self.recipes_dir)
+            cached = self._status_cache
+            if cached is not None and cached[0] == token:
+                return cached
+            connected = git_has_remote(self.recipes_dir)
+            ahead, behind = (0, 0)
+            if connected:
+                ahead, behind = git_ahead_behind(self.recipes_dir, fetch=False)
+            self._status_cache = (token, connected, ahead, behind)
+            return self._status_cache
+
+    def refresh_status(self) -> SyncStatus:
+        """Fetch from the remote and recompute the cached status.
+
+        The fetch is skipped while a sync job is running; the job fetches
+        itself, and two fetches would fight over the same refs.
+        """
+        if self._inflight is None and git_has_remote(self.recipes_dir):
+            git_fetch(self.recipes_dir)
+        self._status_cache = None
+        return self.get_status()
+
+    def start_status_refresh(self, interval_seconds: float) -> None:
+        """Refresh the cached status every *interval_seconds* in a background thread."""
+        if self._refresh_thread is not None:
+            return
+        self._refresh_stop.clear()
+
+        def run():
+            while not self._refresh_stop.wait(interval_seconds):
+                try:
+                    self.refresh_status()
+                except Exception:
+                    logger.exception("Background sync status refresh failed")
+
+        self._refresh_thread = threading.Thread(
+            target=run, name="sync-status-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def start_scheduler(self) -> None:
+        """Sync in the background as configured by ``SyncConfig``.
+
+        The config is re-read before every wait, and :meth:`reschedule`
+        interrupts a wait so saved settings apply straight away.
+        """
+        if self._scheduler_thread is not None or self.config_path is None:
+            return
+        self._scheduler_stop.clear()
+        self._scheduler_thread = threading.Thread(
+            target=self._schedule_loop, name="sync-scheduler", daemon=True
+        )
+        self._scheduler_thread.start()
+
+    def reschedule(self) -> None:
+        """Re-read the sync config and restart the wait for the next sync."""
+        self._scheduler_wake.set()
+
+    def stop_scheduler(self) -> None:
+        self._scheduler_stop.set()
+        self._scheduler_wake.set()
+        if self._scheduler_thread is not None:
+            self._scheduler_thread.join(timeout=5)
+            self._scheduler_thread = None
+
+    def _schedule_loop(self) -> None:
+        failures = 0
+        while not self._scheduler_stop.is_set():
+            _, config = load_config(self.config_path)
+            delay = None
+            if config.enabled and config.interval_seconds > 0:
+                delay = next_sync_delay(config.interval_seconds, failures)
+            woken = self._scheduler_wake.wait(delay)
+            if self._scheduler_stop.is_set():
+                return
+            if woken:
+                self._scheduler_wake.clear()
+                continue
+            try:
+                if not git_has_remote(self.recipes_dir):
+                    continue
+                result = self.sync()
+                ok = result["pull_success"] and result["push_success"]
+            except Exception:
+                logger.exception("Scheduled sync failed")
+                ok = False
+            failures = 0 if ok else failures + 1
+            if failures:
+                logger.warning("Scheduled sync failed %d time(s) in a row", failures)
+
+    def stop_status_refresh(self) -> None:
+        self._refresh_stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    def _status(self, connected: bool, ahead: int, behind: int) -> SyncStatus:
         return SyncStatus(
             connected=connected,
             last_synced=self._last_synced,
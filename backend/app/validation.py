@@ -1,9 +1,12 @@
 """Shared validation utilities for route parameters."""
 
 import re
+from typing import Optional
 
 from fastapi import HTTPException, Path
 
+from app.git import REVISION_RE
+
 # Valid slug: alphanumeric and hyphens only, 1–200 characters
 _SLUG_RE = re.compile(r"^[a-z0-9][a-z0-9-]{0,198}[a-z0-9]$|^[a-z0-9]$")
 
@@ -36,6 +39,13 @@ def validate_slug(slug: str) -> str:
     return slug
 
 
+def validate_revision(revision: Optional[str]) -> Optional[str]:
+    """Raise HTTP 400 unless *revision* is None or a hex commit hash."""
+    if revision is not None and not REVISION_RE.match(revision):
+        raise HTTPException(status_code=400, detail="Invalid commit hash.")
+    return revision
+
+
 # ---------------------------------------------------------------------------
 # FastAPI path-parameter dependency
 # ---------------------------------------------------------------------------
@@ -0,0 +1,81 @@
+"""Synthetic recipe corpus shared by the benchmarks."""
+
+import random
+import textwrap
+from pathlib import Path
+
+_PROTEINS = ["chicken", "beef", "pork", "tofu", "salmon", "shrimp", "lentil", "chickpea"]
+_STYLES = ["curry", "stew", "tacos", "stir fry", "salad", "soup", "casserole", "pasta"]
+_QUANTITIES = ["1", "2", "1/2", "3", "1 1/2", "4"]
+_UNITS = ["cup", "cups", "tbsp", "tsp", "lb", "oz", "cloves", "can", "bunch", ""]
+_FOODS = [
+    "coconut cream", "olive oil", "garlic", "yellow onion", "ground cumin",
+    "chicken stock", "parmesan cheese", "jalapeno", "ground beef", "soy sauce",
+    "diced tomatoes", "cilantro", "black pepper", "basmati rice", "butter",
+    "heavy cream", "brown sugar", "smoked paprika", "chili flakes", "lime juice",
+    "lemon zest", "fresh ginger", "scallions", "red bell pepper", "spinach",
+    "mushrooms", "carrots", "celery", "potatoes", "sweet potatoes", "black beans",
+    "chickpeas", "feta cheese", "cheddar cheese", "mozzarella", "ricotta",
+    "greek yogurt", "sour cream", "maple syrup", "honey", "dijon mustard",
+    "fish sauce", "sesame oil", "rice vinegar", "tahini", "pine nuts", "walnuts",
+    "almond flour", "cornstarch", "all-purpose flour", "eggs", "bacon",
+    "italian sausage", "chorizo", "anchovies", "capers", "kalamata olives",
+    "fresh basil", "oregano", "thyme", "rosemary", "bay leaves", "cinnamon",
+]
+_MODIFIERS = ["", "", "", "finely chopped", "minced", "grated", "to taste", "divided"]
+_TAGS = ["quick", "weeknight", "indian", "mexican", "vegetarian", "italian", "spicy"]
+
+
+def write_corpus(directory: Path, count: int, forks_every: int = 10, seed: int = 42) -> None:
+    """Write *count* recipes (plus a fork for every *forks_every*-th one) into *directory*."""
+    rng = random.Random(seed)
+    for i in range(count):
+        title = f"{rng.choice(_PROTEINS).title()} {rng.choice(_STYLES).title()} {i}"
+        slug = title.lower().replace(" ", "-")
+        ingredients = "\n".join(
+            "- " + " ".join(
+                part for part in (
+                    rng.choice(_QUANTITIES), rng.choice(_UNITS), food, rng.choice(_MODIFIERS),
+                ) if part
+            )
+            for food in rng.sample(_FOODS, 9)
+        )
+        steps = "\n".join(
+            f"{n}. Cook the {rng.choice(_PROTEINS)} for {rng.randint(2, 30)} minutes."
+            for n in range(1, 7)
+        )
+        (directory / f"{slug}.md").write_text(textwrap.dedent(f"""\
+            ---
+            title: {title}
+            tags: [{", ".join(rng.sample(_TAGS, 2))}]
+            servings: {rng.randint(2, 8)}
+            prep_time: {rng.randint(5, 40)}min
+            cook_time: {rng.randint(5, 90)}min
+            date_added: 2026-01-{rng.randint(1, 28):02d}
+            likes: {rng.randint(0, 9)}
+            version: 1
+            ---
+
+            # {title}
+
+            ## Ingredients
+
+            {{ingredients}}
+
+            ## Instructions
+
+            {{steps}}
+        """).format(ingredients=ingredients, steps=steps))
+        if forks_every and i % forks_every == 0:
+            (directory / f"{slug}.fork.spicy.md").write_text(textwrap.dedent(f"""\
+                ---
+                forked_from: {slug}
+                fork_name: Spicy
+                author: Bench
+                version: 1
+                ---
+
+                ## Ingredients
+
+                - 2 jalapenos
+            """))
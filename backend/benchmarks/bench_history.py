@@ -0,0 +1,94 @@
+"""Benchmark recipe history retrieval.
+
+Builds a repo with one recipe edited *--commits* times and times a
+20-entry history three ways: ``git log`` plus one ``git show`` process per
+entry (the original endpoint), ``git log`` plus cat-file batch reads, and
+``git_history`` (one ``git log --raw`` plus batch reads), which backs
+``GET /api/recipes/{slug}/history`` now.
+
+Usage (from backend/):
+    python -m benchmarks.bench_history --commits 20
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from app.git import git_history, git_log, git_show
+
+SLUG = "benchmark-stew"
+
+
+def _git(directory: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=str(directory), capture_output=True, check=True)
+
+
+def _legacy_show(recipes_dir: Path, revision: str, path: Path) -> str:
+    """The original implementation: one ``git show`` process per blob."""
+    rel = str(path.relative_to(recipes_dir))
+    return subprocess.run(
+        ["git", "show", f"{revision}:{rel}"],
+        cwd=str(recipes_dir), capture_output=True, text=True, check=True,
+    ).stdout
+
+
+def _write_history(directory: Path, commits: int) -> None:
+    _git(directory, "init")
+    _git(directory, "config", "user.email", "bench@example.com")
+    _git(directory, "config", "user.name", "Bench")
+    path = directory / f"{SLUG}.md"
+    for i in range(commits):
+        steps = "\n".join(f"{n}. Step {n} of revision {i}." for n in range(1, 12))
+        path.write_text(
+            f"---\ntitle: Benchmark Stew\nversion: {i}\n---\n\n"
+            f"# Benchmark Stew\n\n## Ingredients\n\n- {i + 1} cups stock\n\n"
+            f"## Instructions\n\n{steps}\n"
+        )
+        _git(directory, "add", path.name)
+        _git(directory, "commit", "-m", f"Revision {i}")
+
+
+def _log_then_show(show):
+    def history(recipes_dir: Path, path: Path) -> list:
+        entries = git_log(recipes_dir, path)
+        for entry in entries:
+            entry["content"] = show(recipes_dir, entry["hash"], path)
+        return entries
+    return history
+
+
+def _per_call_ms(fn, repeat: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "recipes"
+        directory.mkdir()
+        _write_history(directory, args.commits)
+        path = directory / f"{SLUG}.md"
+        timings = [
+            ("git show per entry", _log_then_show(_legacy_show)),
+            ("log + cat-file --batch", _log_then_show(git_show)),
+            ("git_history", lambda d, p: git_history(d, p)["history"]),
+        ]
+        expected = _log_then_show(_legacy_show)(directory, path)
+        print(f"history entries: {len(expected)}")
+        for label, fn in timings:
+            assert fn(directory, path) == expected, label
+            ms = _per_call_ms(lambda: fn(directory, path), args.repeat)
+            print(f"{label:<24}{ms:>10.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark RecipeIndex.build() on a synthetic corpus.
+
+Compares the single-pass parse used by the index against the previous
+two-pass approach (frontmatter parse, then a second load and regex scan
+for ingredients).
+
+Usage (from backend/):
+    python -m benchmarks.bench_index_build --count 5000 [--workers 4]
+"""
+
+import argparse
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import frontmatter
+
+from app.index import RecipeIndex
+from app.parser import parse_frontmatter
+from benchmarks._corpus import write_corpus
+
+
+def _legacy_extract_ingredients(path: Path) -> list:
+    """The ingredient extractor RecipeIndex used before the single-pass parse."""
+    content = frontmatter.load(path).content
+    lines = []
+    in_ingredients = False
+    for line in content.split("\n"):
+        if re.match(r"^##\s+Ingredients", line, re.IGNORECASE):
+            in_ingredients = True
+            continue
+        if in_ingredients and re.match(r"^##\s+", line):
+            break
+        if in_ingredients and line.strip().startswith("- "):
+            lines.append(line.strip().lstrip("- ").lower())
+    return lines
+
+
+def _two_pass(directory: Path) -> None:
+    for path in directory.glob("*.md"):
+        parse_frontmatter(path)
+        _legacy_extract_ingredients(path)
+
+
+def _timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_corpus(directory, args.count, forks_every=0)
+        index = RecipeIndex(directory)
+
+        two_pass = _timed(lambda: _two_pass(directory), args.repeat)
+        single_pass = _timed(index.build, args.repeat)
+        index.build()
+        first_search = _timed(lambda: index.search("chicken"), 1)
+        index.build()
+        warmup = _timed(lambda: index.start_search_warmup().join(), 1)
+        warm_search = _timed(lambda: index.search("chicken"), 1)
+        if args.workers > 1:
+            pooled = RecipeIndex(directory, workers=args.workers)
+            parallel = _timed(pooled.build, args.repeat)
+
+    print(f"recipes:            {args.count}")
+    print(f"two-pass parse:     {two_pass:.3f}s")
+    print(f"RecipeIndex.build:  {single_pass:.3f}s")
+    print(f"speedup:            {two_pass / single_pass:.2f}x")
+    print(f"first search:       {first_search:.3f}s (builds search indexes)")
+    print(f"background warmup:  {warmup:.3f}s")
+    print(f"search after warm:  {warm_search:.3f}s")
+    if args.workers > 1:
+        print(f"build, {args.workers} workers:  {parallel:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
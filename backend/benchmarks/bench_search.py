@@ -0,0 +1,61 @@
+"""Benchmark RecipeIndex.search() against a linear substring scan.
+
+Also reports search_ranked() (BM25) latency for the same queries.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search --count 10000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.index import RecipeIndex
+from benchmarks._corpus import write_corpus
+
+QUERIES = ["chicken", "parm", "coconut cream", "jalapeno", "xyz", "ri"]
+
+
+def _linear(index: RecipeIndex, query: str) -> list:
+    q = query.lower()
+    results = [
+        s for slug, s in index._index.items()
+        if q in s.title.lower()
+        or any(q in t.lower() for t in s.tags)
+        or any(q in ing for ing in index._ingredients.get(slug, []))
+    ]
+    return sorted(results, key=lambda r: r.title.lower())
+
+
+def _per_call_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_corpus(directory, args.count, forks_every=0)
+        index = RecipeIndex(directory)
+        index.build()
+
+    print(f"recipes: {args.count}")
+    print(f"{'query':<16}{'hits':>6}{'linear ms':>12}{'index ms':>12}{'ranked ms':>12}")
+    for query in QUERIES:
+        hits = len(index.search(query))
+        linear = _per_call_ms(lambda: _linear(index, query), args.repeat)
+        indexed = _per_call_ms(lambda: index.search(query), args.repeat)
+        ranked = _per_call_ms(lambda: index.search_ranked(query), args.repeat)
+        print(f"{query:<16}{hits:>6}{linear:>12.3f}{indexed:>12.3f}{ranked:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
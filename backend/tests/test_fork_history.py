@@ -63,7 +63,8 @@ class TestForkHistory:
             {"hash": "abc123", "date": "2026-02-09T10:00:00", "message": "Create fork: Spicy"},
             {"hash": "def456", "date": "2026-02-08T10:00:00", "message": "Update fork: Spicy"},
         ]
-        with patch("app.routes.forks.git_log", return_value=mock_entries):
+        page = {"history": mock_entries, "next_before": None}
+        with patch("app.routes.forks.git_history", return_value=page):
             resp = client.get("/api/recipes/test-recipe/forks/spicy/history")
         assert resp.status_code == 200
         data = resp.json()
@@ -78,13 +79,15 @@ class TestForkHistory:
         )
 
         mock_entries = [
-            {"hash": "abc123", "date": "2026-02-09T10:00:00", "message": "v2"},
+            {"hash": "abc123", "date": "2026-02-09T10:00:00", "message": "v2",
+             "content": "old content"},
         ]
-        with patch("app.routes.forks.git_log", return_value=mock_entries):
-            with patch("app.routes.forks.git_show", return_value="old content"):
-                resp = client.get("/api/recipes/test-recipe/forks/spicy/history?content=true")
+        page = {"history": mock_entries, "next_before": None}
+        with patch("app.routes.forks.git_history", return_value=page) as history:
+            resp = client.get("/api/recipes/test-recipe/forks/spicy/history?content=true")
         assert resp.status_code == 200
         assert resp.json()["history"][0]["content"] == "old content"
+        assert history.call_args.kwargs["with_content"] is True
 
     def test_history_without_content_flag(self, client, tmp_recipes):
         """Without content flag, entries should not have content field."""
@@ -96,7 +99,25 @@ class TestForkHistory:
         mock_entries = [
             {"hash": "abc123", "date": "2026-02-09T10:00:00", "message": "v1"},
         ]
-        with patch("app.routes.forks.git_log", return_value=mock_entries):
+        page = {"history": mock_entries, "next_before": None}
+        with patch("app.routes.forks.git_history", return_value=page) as history:
             resp = client.get("/api/recipes/test-recipe/forks/spicy/history")
         assert resp.status_code == 200
         assert "content" not in resp.json()["history"][0]
+        assert history.call_args.kwargs["with_content"] is False
+
+    def test_history_passes_paging_params(self, client, tmp_recipes):
+        fork_path = tmp_recipes / "test-recipe.fork.spicy.md"
+        fork_path.write_text(
+            "---\nfork_name: Spicy\nforked_from: test-recipe\n---\n\n## Ingredients\n\n- chili\n"
+        )
+        page = {"history": [], "next_before": None}
+        with patch("app.routes.forks.git_history", return_value=page) as history:
+            resp = client.get("/api/recipes/test-recipe/forks/spicy/history?limit=5&before=abc123")
+        assert resp.status_code == 200
+        assert history.call_args.kwargs["limit"] == 5
+        assert history.call_args.kwargs["before"] == "abc123"
+
+    def test_history_rejects_bad_before(self, client):
+        resp = client.get("/api/recipes/test-recipe/forks/spicy/history?before=HEAD~1")
+        assert resp.status_code == 400
@@ -2,7 +2,8 @@
 import textwrap
 from pathlib import Path
 
-from app.index import RecipeIndex
+from app.index import ForkList, RecipeIndex
+from app.models import ForkSummary
 
 
 def _write_recipe(path: Path, title: str, ingredients: str = "- flour"):
@@ -103,3 +104,78 @@ class TestForkIndexing:
         recipe = index.get("cookies")
         assert recipe is not None
         assert len(recipe.forks) == 1
+
+    def test_forks_ordered_by_display_name(self, tmp_path):
+        _write_recipe(tmp_path / "cookies.md", "Cookies")
+        _write_fork(tmp_path / "cookies.fork.b.md", "cookies", "Zesty", "- lemon")
+        _write_fork(tmp_path / "cookies.fork.a.md", "cookies", "Malted", "- malt")
+        index = RecipeIndex(tmp_path)
+        index.build()
+        fork_path = tmp_path / "cookies.fork.c.md"
+        _write_fork(fork_path, "cookies", "Brown Butter", "- butter")
+        index.add_or_update(fork_path)
+        assert [f.fork_name for f in index.list_all()[0].forks] == ["Brown Butter", "Malted", "Zesty"]
+        _write_fork(fork_path, "cookies", "Toasted", "- butter")
+        index.add_or_update(fork_path)
+        assert [f.fork_name for f in index.list_all()[0].forks] == ["Malted", "Toasted", "Zesty"]
+
+    def test_updates_leave_other_recipes_untouched(self, tmp_path):
+        _write_recipe(tmp_path / "cookies.md", "Cookies")
+        _write_recipe(tmp_path / "bread.md", "Bread")
+        _write_fork(tmp_path / "bread.fork.rye.md", "bread", "Rye Bread", "- rye flour")
+        index = RecipeIndex(tmp_path)
+        index.build()
+        bread = index._index["bread"]
+
+        _write_recipe(tmp_path / "cookies.md", "Better Cookies")
+        index.add_or_update(tmp_path / "cookies.md")
+        fork_path = tmp_path / "cookies.fork.vegan.md"
+        _write_fork(fork_path, "cookies", "Vegan Cookies", "- coconut oil")
+        index.add_or_update(fork_path)
+        index.remove("cookies.fork.vegan")
+
+        assert index._index["bread"] is bread
+        assert [f.name for f in bread.forks] == ["rye"]
+
+    def test_base_update_keeps_its_forks(self, tmp_path):
+        _write_recipe(tmp_path / "cookies.md", "Cookies")
+        _write_fork(tmp_path / "cookies.fork.vegan.md", "cookies", "Vegan Cookies", "- coconut oil")
+        index = RecipeIndex(tmp_path)
+        index.build()
+        _write_recipe(tmp_path / "cookies.md", "Better Cookies")
+        index.add_or_update(tmp_path / "cookies.md")
+        recipe = index.list_all()[0]
+        assert recipe.title == "Better Cookies"
+        assert [f.name for f in recipe.forks] == ["vegan"]
+
+
+def _fork(name: str, fork_name: str) -> ForkSummary:
+    return ForkSummary(name=name, fork_name=fork_name)
+
+
+class TestForkList:
+    def test_put_keeps_order(self):
+        forks = ForkList()
+        for name, display in [("c", "Cherry"), ("a", "Apple"), ("b", "Banana"), ("a2", "Apple")]:
+            forks.put(_fork(name, display))
+        assert [(f.fork_name, f.name) for f in forks] == [
+            ("Apple", "a"), ("Apple", "a2"), ("Banana", "b"), ("Cherry", "c"),
+        ]
+
+    def test_put_replaces_same_name(self):
+        forks = ForkList()
+        forks.put(_fork("a", "Apple"))
+        forks.put(_fork("a", "Zucchini"))
+        forks.put(_fork("b", "Banana"))
+        assert [f.fork_name for f in forks] == ["Banana", "Zucchini"]
+        assert len(forks) == 2
+
+    def test_discard_and_get(self):
+        forks = ForkList()
+        forks.put(_fork("a", "Apple"))
+        forks.put(_fork("b", "Banana"))
+        assert forks.get("b").fork_name == "Banana"
+        assert forks.discard("a") is True
+        assert forks.discard("a") is False
+        assert forks.get("a") is None
+        assert forks.to_list() == [_fork("b", "Banana")]
@@ -1,4 +1,6 @@
 import subprocess
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -6,7 +8,9 @@ import pytest
 from app.git import (
     git_init_if_needed, git_commit, git_rm, git_log, git_show,
     git_head_hash, git_has_remote, git_remote_add, git_push, git_pull,
-    git_ahead_behind, PullResult,
+    git_ahead_behind, git_history, git_find_commit, PullResult, CatFileBatch, _HistoryCache,
+    _pull_result, _read_head, _repo_lock, CommitQueue, flush_commits, start_commit_queue,
+    stop_commit_queue,
 )
 
 
@@ -53,6 +57,117 @@ class TestGitCommit:
         fake = git_repo / "nonexistent.md"
         git_commit(git_repo, fake, "Should not crash")
 
+    def test_process_count_does_not_grow_with_paths(self, git_repo, monkeypatch):
+        calls = []
+        real_run = subprocess.run
+
+        def counting(args, **kwargs):
+            calls.append(args)
+            return real_run(args, **kwargs)
+
+        monkeypatch.setattr(subprocess, "run", counting)
+        single = git_repo / "single.jpg"
+        single.write_text("x")
+        git_commit(git_repo, single, "Add one image")
+        one = len(calls)
+
+        calls.clear()
+        paths = []
+        for i in range(10):
+            paths.append(git_repo / f"image {i}[1].jpg")
+            paths[-1].write_text(str(i))
+        git_commit(git_repo, paths, "Add images")
+        assert len(calls) == one
+        tracked = real_run(
+            ["git", "ls-files"], cwd=str(git_repo), capture_output=True, text=True,
+        ).stdout
+        assert tracked.count("image ") == 10
+
+    def test_ignores_unrelated_staged_changes(self, git_repo):
+        staged, f = git_repo / "staged.md", git_repo / "recipe.md"
+        staged.write_text("wip")
+        subprocess.run(["git", "add", "staged.md"], cwd=str(git_repo), capture_output=True)
+        f.write_text("hello")
+        git_commit(git_repo, f, "Add recipe")
+        committed = subprocess.run(
+            ["git", "ls-tree", "--name-only", "HEAD"],
+            cwd=str(git_repo), capture_output=True, text=True,
+        ).stdout.split()
+        assert committed == ["recipe.md"]
+        status = subprocess.run(
+            ["git", "status", "--porcelain"], cwd=str(git_repo), capture_output=True, text=True,
+        ).stdout
+        assert status == "A  staged.md\n"
+
+    def test_survives_a_held_index_lock(self, git_repo):
+        f = git_repo / "recipe.md"
+        f.write_text("hello")
+        (git_repo / ".git" / "index.lock").write_text("")
+        git_commit(git_repo, f, "Add recipe")
+        (git_repo / ".git" / "index.lock").unlink()
+        assert git_show(git_repo, "HEAD", f) == "hello"
+
+    def test_index_left_stale_by_a_held_lock_is_reset_before_pull(self, git_repo):
+        f = git_repo / "recipe.md"
+        f.write_text("hello")
+        (git_repo / ".git" / "index.lock").write_text("")
+        git_commit(git_repo, f, "Add recipe")
+        (git_repo / ".git" / "index.lock").unlink()
+
+        def staged():
+            return subprocess.run(
+                ["git", "diff", "--cached", "--name-only"],
+                cwd=str(git_repo), capture_output=True, text=True,
+            ).stdout.split()
+
+        assert staged() == ["recipe.md"]
+        git_pull(git_repo)  # fails without a remote, but resets first
+        assert staged() == []
+
+    def test_concurrent_commits_are_all_kept(self, git_repo):
+        def write(i):
+            path = git_repo / f"recipe-{i}.md"
+            path.write_text(str(i))
+            git_commit(git_repo, path, f"Add {i}")
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        tracked = subprocess.run(
+            ["git", "ls-tree", "--name-only", "HEAD"],
+            cwd=str(git_repo), capture_output=True, text=True,
+        ).stdout.split()
+        assert len(tracked) == 8
+
+    def test_commits_in_fresh_repo(self, tmp_path):
+        subprocess.run(["git", "init"], cwd=str(tmp_path), capture_output=True)
+        for key, value in (("user.email", "t@t.com"), ("user.name", "T")):
+            subprocess.run(["git", "config", key, value], cwd=str(tmp_path), capture_output=True)
+        f = tmp_path / "recipe.md"
+        f.write_text("hello")
+        git_commit(tmp_path, f, "First")
+        assert git_show(tmp_path, "HEAD", f) == "hello"
+
+    def test_stages_removed_paths(self, git_repo):
+        keep, gone = git_repo / "keep.md", git_repo / "gone.md"
+        keep.write_text("keep")
+        gone.write_text("gone")
+        git_commit(git_repo, [keep, gone], "Add")
+        gone.unlink()
+        keep.write_text("kept")
+        never = git_repo / "never-tracked.md"
+        git_commit(git_repo, [keep, gone, never], "Remove gone")
+        tracked = subprocess.run(
+            ["git", "ls-files"], cwd=str(git_repo), capture_output=True, text=True,
+        ).stdout.split()
+        assert tracked == ["keep.md"]
+        status = subprocess.run(
+            ["git", "status", "--porcelain"], cwd=str(git_repo), capture_output=True, text=True,
+        ).stdout
+        assert status == ""
+
 
 class TestGitRm:
     def test_removes_and_commits(self, git_repo):
@@ -107,6 +222,45 @@ class TestGitShow:
         content = git_show(git_repo, "badrev", f)
         assert content == ""
 
+    def test_sees_commits_made_after_first_read(self, git_repo):
+        f = git_repo / "recipe.md"
+        f.write_text("one")
+        git_commit(git_repo, f, "v1")
+        assert git_show(git_repo, "HEAD", f) == "one"
+        f.write_text("two")
+        git_commit(git_repo, f, "v2")
+        assert git_show(git_repo, "HEAD", f) == "two"
+        assert git_show(git_repo, "HEAD~1", f) == "one"
+
+
+class TestCatFileBatch:
+    def test_reads_objects_over_one_process(self, git_repo):
+        f = git_repo / "my recipe.md"
+        f.write_text("hello\n")
+        git_commit(git_repo, f, "add")
+        batch = CatFileBatch(git_repo)
+        try:
+            assert batch.read("HEAD:my recipe.md") == b"hello\n"
+            pid = batch._proc.pid
+            assert batch.read("HEAD:missing.md") is None
+            assert batch.read("HEAD:my recipe.md") == b"hello\n"
+            assert batch._proc.pid == pid
+        finally:
+            batch.close()
+
+    def test_restarts_after_process_dies(self, git_repo):
+        f = git_repo / "recipe.md"
+        f.write_text("hello")
+        git_commit(git_repo, f, "add")
+        batch = CatFileBatch(git_repo)
+        try:
+            assert batch.read("HEAD:recipe.md") == b"hello"
+            batch._proc.kill()
+            batch._proc.wait()
+            assert batch.read("HEAD:recipe.md") == b"hello"
+        finally:
+            batch.close()
+
 
 # ---------------------------------------------------------------------------
 # Fixture: bare remote + local clone for push/pull tests
@@ -255,6 +409,31 @@ class TestGitPushPull:
         result = git_pull(git_repo)
         assert result.success is False
 
+    def test_pull_waits_for_commits_in_progress(self, git_repo):
+        lock = _repo_lock(git_repo)
+        lock.acquire()
+        try:
+            t = threading.Thread(target=git_pull, args=(git_repo,))
+            t.start()
+            t.join(0.3)
+            assert t.is_alive()
+        finally:
+            lock.release()
+        t.join(5)
+        assert not t.is_alive()
+
+
+def test_pull_result_from_name_status():
+    out = "A\0new.md\0M\0edited.md\0D\0gone.md\0R087\0old.md\0renamed.md\0C100\0a.md\0copy.md\0"
+    result = _pull_result(out)
+    assert result.success is True
+    assert result.added == ["new.md", "copy.md"]
+    assert result.modified == ["edited.md"]
+    assert result.deleted == ["gone.md"]
+    assert result.renamed == [("old.md", "renamed.md")]
+    assert result.changed_files == ["new.md", "edited.md", "gone.md", "old.md", "renamed.md", "copy.md"]
+    assert _pull_result("").changed_files == []
+
 
 # ---------------------------------------------------------------------------
 # Tests: git_ahead_behind
@@ -280,3 +459,254 @@ class TestGitAheadBehind:
         ahead, behind = git_ahead_behind(git_repo)
         assert ahead == 0
         assert behind == 0
+
+
+class TestGitHistory:
+    def _commit_versions(self, repo, count):
+        f = repo / "recipe.md"
+        for i in range(count):
+            f.write_text(f"version {i}\r\n")
+            git_commit(repo, f, f"v{i}")
+        return f
+
+    def test_returns_metadata_and_content(self, git_repo):
+        f = self._commit_versions(git_repo, 3)
+        page = git_history(git_repo, f)
+        assert [e["message"] for e in page["history"]] == ["v2", "v1", "v0"]
+        assert [e["content"] for e in page["history"]] == [
+            "version 2\n", "version 1\n", "version 0\n",
+        ]
+        assert page["history"][0]["hash"] == git_head_hash(git_repo)
+        assert page["next_before"] is None
+        assert page["history"][0].keys() >= git_log(git_repo, f)[0].keys()
+
+    def test_pages_with_before(self, git_repo):
+        f = self._commit_versions(git_repo, 5)
+        first = git_history(git_repo, f, limit=2)
+        assert [e["message"] for e in first["history"]] == ["v4", "v3"]
+        second = git_history(git_repo, f, limit=2, before=first["next_before"])
+        assert [e["message"] for e in second["history"]] == ["v2", "v1"]
+        third = git_history(git_repo, f, limit=2, before=second["next_before"])
+        assert [e["message"] for e in third["history"]] == ["v0"]
+        assert third["next_before"] is None
+
+    def test_without_content(self, git_repo):
+        f = self._commit_versions(git_repo, 1)
+        entry = git_history(git_repo, f, with_content=False)["history"][0]
+        assert "content" not in entry
+
+    def test_deleted_file_has_empty_content(self, git_repo):
+        f = self._commit_versions(git_repo, 1)
+        git_rm(git_repo, f, "Remove")
+        page = git_history(git_repo, f)
+        assert [e["content"] for e in page["history"]] == ["", "version 0\n"]
+
+    def test_rejects_non_hash_before(self, git_repo):
+        f = self._commit_versions(git_repo, 1)
+        assert git_history(git_repo, f, before="--all")["history"] == []
+
+
+class TestHistoryCache:
+    def test_read_head_matches_rev_parse(self, git_repo):
+        assert _read_head(git_repo) == git_head_hash(git_repo)
+        subprocess.run(["git", "pack-refs", "--all"], cwd=str(git_repo), capture_output=True)
+        assert _read_head(git_repo) == git_head_hash(git_repo)
+
+    def test_read_head_none_without_repo(self, tmp_path):
+        assert _read_head(tmp_path) is None
+
+    def test_repeat_history_skips_git(self, git_repo, monkeypatch):
+        f = git_repo / "recipe.md"
+        f.write_text("one")
+        git_commit(git_repo, f, "v1")
+        first = git_history(git_repo, f)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("git should not run")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+        assert git_history(git_repo, f) == first
+
+    def test_cached_pages_are_copies(self, git_repo):
+        f = git_repo / "recipe.md"
+        f.write_text("one")
+        git_commit(git_repo, f, "v1")
+        git_history(git_repo, f)["history"][0]["content"] = "mutated"
+        assert git_history(git_repo, f)["history"][0]["content"] == "one"
+
+    def test_new_commit_is_visible(self, git_repo):
+        f = git_repo / "recipe.md"
+        f.write_text("one")
+        git_commit(git_repo, f, "v1")
+        assert len(git_history(git_repo, f)["history"]) == 1
+        f.write_text("two")
+        git_commit(git_repo, f, "v2")
+        assert [e["content"] for e in git_history(git_repo, f)["history"]] == ["two", "one"]
+
+    def test_blob_cache_evicts_by_size(self):
+        cache = _HistoryCache(max_pages=4, max_blob_bytes=10)
+        cache.put_blob("a", "x" * 6)
+        cache.put_blob("b", "y" * 6)
+        assert cache.get_blob("a") is None
+        assert cache.get_blob("b") == "y" * 6
+        cache.put_blob("c", "z" * 11)
+        assert cache.get_blob("c") is None
+
+
+class TestCommitQueue:
+    def _log(self, repo):
+        return subprocess.run(
+            ["git", "log", "--format=%B%x00"],
+            cwd=str(repo), capture_output=True, text=True,
+        ).stdout.split("\x00")
+
+    @pytest.fixture
+    def queued_repo(self, git_repo):
+        start_commit_queue(git_repo, window=60)
+        yield git_repo
+        stop_commit_queue(git_repo)
+
+    def test_commits_are_batched_until_flush(self, queued_repo):
+        a, b = queued_repo / "a.md", queued_repo / "b.md"
+        a.write_text("a")
+        git_commit(queued_repo, a, "Like: a")
+        b.write_text("b")
+        git_commit(queued_repo, b, "Like: b")
+        assert len(self._log(queued_repo)) == 2  # just "init"
+
+        assert flush_commits(queued_repo)
+        message = self._log(queued_repo)[0].strip()
+        assert message.startswith("Update 2 files\n")
+        assert "- Like: a" in message and "- Like: b" in message
+        tracked = subprocess.run(
+            ["git", "ls-files"], cwd=str(queued_repo), capture_output=True, text=True,
+        ).stdout.split()
+        assert tracked == ["a.md", "b.md"]
+
+    def test_batch_for_one_file_keeps_its_subject(self, queued_repo):
+        f = queued_repo / "recipe.md"
+        f.write_text("liked")
+        git_commit(queued_repo, f, "Like: recipe")
+        f.write_text("cooked")
+        git_commit(queued_repo, f, "Cook: recipe")
+        assert flush_commits(queued_repo)
+        message = self._log(queued_repo)[0].strip()
+        assert message.startswith("Like: recipe (+1 more)\n")
+        assert "- Cook: recipe" in message
+
+    def test_reads_flush_first(self, queued_repo):
+        f = queued_repo / "recipe.md"
+        f.write_text("v1")
+        git_commit(queued_repo, f, "Merge fork 'x' into recipe")
+        assert git_find_commit(queued_repo, f, "Merge fork 'x'") == git_head_hash(queued_repo)
+        assert git_show(queued_repo, "HEAD", f) == "v1"
+
+    def test_window_elapsing_commits(self, git_repo):
+        start_commit_queue(git_repo, window=0.05)
+        try:
+            f = git_repo / "recipe.md"
+            f.write_text("v1")
+            git_commit(git_repo, f, "Add recipe")
+            deadline = time.monotonic() + 5
+            while "Add recipe" not in self._log(git_repo)[0] and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert self._log(git_repo)[0].strip() == "Add recipe"
+        finally:
+            stop_commit_queue(git_repo)
+
+    def test_journal_is_replayed_after_crash(self, git_repo):
+        f = git_repo / "recipe.md"
+        f.write_text("v1")
+        queue = CommitQueue(git_repo, window=60)
+        queue.enqueue([f], "Add recipe")
+        queue._timer.cancel()  # simulate dying before the window elapses
+        assert queue.journal_path.exists()
+
+        start_commit_queue(git_repo)
+        try:
+            assert self._log(git_repo)[0].strip() == "Add recipe"
+            assert not queue.journal_path.exists()
+        finally:
+            stop_commit_queue(git_repo)
+
+    def test_immediate_commit_is_not_coalesced(self, queued_repo):
+        f, other = queued_repo / "recipe.md", queued_repo / "other.md"
+        f.write_text("liked")
+        git_commit(queued_repo, f, "Like: recipe")
+        flush_commits(queued_repo)  # as merge_fork does before writing
+        other.write_text("cooked")
+        git_commit(queued_repo, other, "Cook: other")
+        f.write_text("merged")
+        git_commit(queued_repo, f, "Merge fork 'x' into recipe", immediate=True)
+
+        log = self._log(queued_repo)
+        assert log[0].strip() == "Merge fork 'x' into recipe"
+        assert log[1].strip() == "Cook: other"
+        merge = git_find_commit(queued_repo, f, "Merge fork 'x'")
+        assert git_show(queued_repo, f"{merge}~1", f) == "liked"
+
+    def test_failed_commit_stays_queued_and_journaled(self, git_repo, monkeypatch):
+        import app.git as git_mod
+
+        queue = CommitQueue(git_repo, window=60)
+        a, b = git_repo / "a.md", git_repo / "b.md"
+        a.write_text("a")
+        queue.enqueue([a], "Add a")
+        monkeypatch.setattr(git_mod, "_commit_paths", lambda *args: False)
+        assert queue.flush() is False
+        assert queue._pending == [(["a.md"], "Add a", 1)]
+        assert queue.journal_path.exists()
+        assert queue._timer is not None  # retry scheduled
+        queue._timer.cancel()
+        queue._timer = None
+
+        b.write_text("b")
+        queue.enqueue([b], "Add b")
+        queue._timer.cancel()
+        monkeypatch.undo()
+        assert queue.flush() is True
+        assert self._log(git_repo)[0].strip().startswith("Update 2 files")
+        assert queue._pending == []
+        assert not queue.journal_path.exists()
+
+    def test_failing_entry_is_isolated_then_given_up_on(self, git_repo, monkeypatch):
+        import json
+        import app.git as git_mod
+
+        real_commit = git_mod._commit_paths
+        monkeypatch.setattr(
+            git_mod, "_commit_paths",
+            lambda repo, paths, message: "Bad" not in message and real_commit(repo, paths, message),
+        )
+        monkeypatch.setattr(git_mod, "MAX_COMMIT_ATTEMPTS", 2)
+        queue = CommitQueue(git_repo, window=60)
+        good, bad = git_repo / "good.md", git_repo / "bad.md"
+        good.write_text("good")
+        bad.write_text("bad")
+        queue.enqueue([bad], "Bad")
+        queue.enqueue([good], "Good")
+        queue._timer.cancel()
+        queue._timer = None
+
+        assert queue.flush() is False
+        assert self._log(git_repo)[0].strip() == "Good"
+        assert queue._pending == [(["bad.md"], "Bad", 1)]
+        assert json.loads(queue.journal_path.read_text())["attempts"] == 1
+        queue._timer.cancel()
+        queue._timer = None
+
+        assert queue.flush() is False
+        assert queue._pending == []
+        assert queue._timer is None
+        assert not queue.journal_path.exists()
+        failed = json.loads(queue.failed_path.read_text())
+        assert (failed["paths"], failed["message"], failed["attempts"]) == (["bad.md"], "Bad", 2)
+        assert queue.flush() is True
+
+    def test_stop_flushes(self, git_repo):
+        start_commit_queue(git_repo, window=60)
+        f = git_repo / "recipe.md"
+        f.write_text("v1")
+        git_commit(git_repo, f, "Add recipe")
+        stop_commit_queue(git_repo)
+        assert self._log(git_repo)[0].strip() == "Add recipe"
@@ -1,3 +1,4 @@
+import os
 import textwrap
 
 import pytest
@@ -213,6 +214,15 @@ def test_index_update_on_file_change(tmp_path):
     assert len(idx.list_all()) == 2
 
 
+def test_index_ignores_vanished_file(tmp_recipes):
+    idx = RecipeIndex(tmp_recipes)
+    idx.build()
+    idx.add_or_update(tmp_recipes / "deleted-meanwhile.md")
+    assert "deleted-meanwhile" not in idx.list_slugs()
+    idx.apply_changes(added=["deleted-meanwhile.md"])
+    assert "deleted-meanwhile" not in idx.list_slugs()
+
+
 def test_index_remove(tmp_recipes):
     idx = RecipeIndex(tmp_recipes)
     idx.build()
@@ -220,3 +230,483 @@ def test_index_remove(tmp_recipes):
     idx.remove("chicken-tikka-masala")
     assert len(idx.list_all()) == count_before - 1
     assert idx.get("chicken-tikka-masala") is None
+
+
+class TestIndexSnapshot:
+    def _counting_parser(self, monkeypatch):
+        import app.index as index_module
+        calls = []
+        original = index_module.parse_recipe_file
+
+        def counting(path):
+            calls.append(path.name)
+            return original(path)
+
+        monkeypatch.setattr(index_module, "parse_recipe_file", counting)
+        return calls
+
+    def test_build_writes_snapshot(self, tmp_recipes, tmp_path_factory):
+        snapshot = tmp_path_factory.mktemp("snap") / "index.json"
+        idx = RecipeIndex(tmp_recipes, snapshot_path=snapshot)
+        idx.build()
+        assert snapshot.exists()
+
+    def test_save_snapshot_never_raises(self, tmp_recipes, tmp_path_factory):
+        snapshot = tmp_path_factory.mktemp("snap") / "index.json"
+        idx = RecipeIndex(tmp_recipes, snapshot_path=snapshot)
+        idx.build()
+
+        class Mutating(dict):
+            def get(self, *args):
+                raise RuntimeError("dictionary changed size during iteration")
+
+        idx._ingredients = Mutating(idx._ingredients)
+        idx.save_snapshot()
+
+    def test_rebuild_from_snapshot_skips_unchanged_files(
+        self, tmp_recipes, tmp_path_factory, monkeypatch
+    ):
+        snapshot = tmp_path_factory.mktemp("snap") / "index.json"
+        RecipeIndex(tmp_recipes, snapshot_path=snapshot).build()
+
+        calls = self._counting_parser(monkeypatch)
+        idx = RecipeIndex(tmp_recipes, snapshot_path=snapshot)
+        idx.build()
+        assert calls == []
+        assert len(idx.list_all()) == 3
+        assert any(r.slug == "chicken-tikka-masala" for r in idx.search("coconut cream"))
+
+    def test_rebuild_reparses_only_changed_files(
+        self, tmp_recipes, tmp_path_factory, monkeypatch
+    ):
+        snapshot = tmp_path_factory.mktemp("snap") / "index.json"
+        RecipeIndex(tmp_recipes, snapshot_path=snapshot).build()
+        (tmp_recipes / "7-layer-casserole.md").write_text(
+            CASSEROLE.replace("7-Layer Casserole", "Eight-Layer Casserole")
+        )
+
+        calls = self._counting_parser(monkeypatch)
+        idx = RecipeIndex(tmp_recipes, snapshot_path=snapshot)
+        idx.build()
+        assert calls == ["7-layer-casserole.md"]
+        titles = [r.title for r in idx.list_all()]
+        assert "Eight-Layer Casserole" in titles
+
+    def test_rebuild_drops_deleted_files(self, tmp_recipes, tmp_path_factory):
+        snapshot = tmp_path_factory.mktemp("snap") / "index.json"
+        RecipeIndex(tmp_recipes, snapshot_path=snapshot).build()
+        (tmp_recipes / "chicken-tikka-masala.md").unlink()
+
+        idx = RecipeIndex(tmp_recipes, snapshot_path=snapshot)
+        idx.build()
+        assert "chicken-tikka-masala" not in idx.list_slugs()
+        assert len(idx.list_all()) == 2
+
+    def test_snapshot_with_other_version_is_ignored(
+        self, tmp_recipes, tmp_path_factory, monkeypatch
+    ):
+        import json
+
+        snapshot = tmp_path_factory.mktemp("snap") / "index.json"
+        RecipeIndex(tmp_recipes, snapshot_path=snapshot).build()
+        data = json.loads(snapshot.read_text())
+        data["version"] = -1
+        snapshot.write_text(json.dumps(data))
+
+        calls = self._counting_parser(monkeypatch)
+        RecipeIndex(tmp_recipes, snapshot_path=snapshot).build()
+        assert len(calls) == 3
+
+    def test_snapshot_restores_forks(self, tmp_recipes, tmp_path_factory):
+        (tmp_recipes / "7-layer-casserole.fork.spicy.md").write_text(
+            "---\nforked_from: 7-layer-casserole\nfork_name: Spicy\n---\n\n"
+            "## Ingredients\n\n- 2 jalapenos\n"
+        )
+        snapshot = tmp_path_factory.mktemp("snap") / "index.json"
+        RecipeIndex(tmp_recipes, snapshot_path=snapshot).build()
+
+        idx = RecipeIndex(tmp_recipes, snapshot_path=snapshot)
+        idx.build()
+        recipe = next(r for r in idx.list_all() if r.slug == "7-layer-casserole")
+        assert [f.name for f in recipe.forks] == ["spicy"]
+
+
+class TestParallelBuild:
+    def _summaries(self, idx):
+        return [r.model_dump() for r in idx.list_all()]
+
+    def _record_pools(self, monkeypatch):
+        import app.index as index_module
+
+        pools = []
+        real = index_module.ProcessPoolExecutor
+
+        def recording(*args, **kwargs):
+            pools.append(kwargs.get("mp_context"))
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(index_module, "ProcessPoolExecutor", recording)
+        return pools
+
+    def test_small_library_parses_serially(self, tmp_recipes, monkeypatch):
+        serial = RecipeIndex(tmp_recipes)
+        serial.build()
+        pools = self._record_pools(monkeypatch)
+        parallel = RecipeIndex(tmp_recipes, workers=4)
+        parallel.build()
+        assert pools == []
+        assert self._summaries(parallel) == self._summaries(serial)
+        assert parallel.search("coconut cream")[0].slug == "chicken-tikka-masala"
+
+    def test_process_pool_build_matches_serial(self, tmp_recipes, monkeypatch):
+        import app.index as index_module
+
+        (tmp_recipes / "7-layer-casserole.fork.spicy.md").write_text(
+            "---\nforked_from: 7-layer-casserole\nfork_name: Spicy\n---\n\n"
+            "## Ingredients\n\n- 2 jalapenos\n"
+        )
+        serial = RecipeIndex(tmp_recipes)
+        serial.build()
+        monkeypatch.setattr(index_module, "PROCESS_POOL_MIN_FILES", 0)
+        parallel = RecipeIndex(tmp_recipes, workers=2)
+        parallel.build()
+        assert self._summaries(parallel) == self._summaries(serial)
+
+    def test_single_worker_parses_serially(self, tmp_recipes, monkeypatch):
+        import app.index as index_module
+
+        monkeypatch.setattr(index_module, "PROCESS_POOL_MIN_FILES", 0)
+        pools = self._record_pools(monkeypatch)
+        idx = RecipeIndex(tmp_recipes, workers=1)
+        idx.build()
+        assert pools == []
+        assert len(idx.list_all()) == 3
+
+
+def test_index_search_matches_linear_scan(tmp_recipes):
+    idx = RecipeIndex(tmp_recipes)
+    idx.build()
+
+    def linear(q):
+        q = q.lower()
+        return sorted(
+            slug for slug, s in idx._index.items()
+            if q in s.title.lower()
+            or any(q in t.lower() for t in s.tags)
+            or any(q in ing for ing in idx._ingredients[slug])
+        )
+
+    for q in ["a", "ch", "tikka", "cup coconut", "1/2", "y c", "ken th", ",", "layer cas", "zz"]:
+        assert sorted(r.slug for r in idx.search(q)) == linear(q), q
+
+
+def test_index_search_follows_updates(tmp_recipes):
+    idx = RecipeIndex(tmp_recipes)
+    idx.build()
+    (tmp_recipes / "7-layer-casserole.md").write_text(
+        CASSEROLE.replace("ground beef", "ground turkey")
+    )
+    idx.add_or_update(tmp_recipes / "7-layer-casserole.md")
+    assert idx.search("ground beef") == []
+    assert [r.slug for r in idx.search("turkey")] == ["7-layer-casserole"]
+    idx.remove("7-layer-casserole")
+    assert idx.search("turkey") == []
+
+
+def test_search_warmup_fills_structures_in_background(tmp_recipes):
+    idx = RecipeIndex(tmp_recipes)
+    idx.build()
+    assert idx._search_stale
+    idx.start_search_warmup().join(5)
+    assert not idx._search_stale
+    assert [r.slug for r in idx.search("chicken")] == ["chicken-tikka-masala"]
+
+
+def test_search_skips_recipes_removed_mid_query(tmp_recipes, monkeypatch):
+    idx = RecipeIndex(tmp_recipes)
+    idx.build()
+    idx.warm_search()
+    # A remove landing after the search structures answered but before the
+    # summaries are looked up.
+    monkeypatch.setattr(idx, "_refresh_search", lambda: None)
+    idx.remove("chicken-tikka-masala")
+    assert idx.search("chicken") == []
+    assert idx.search("coconut cream") == []
+    assert "chicken-tikka-masala" not in [r.slug for r in idx.search_ranked("chicken")]
+
+
+class TestTagIndex:
+    def test_tag_counts(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        assert idx.tag_counts() == [
+            ("beef", 1), ("chicken", 1), ("indian", 1),
+            ("mexican", 1), ("quick", 1), ("vegetable", 1),
+        ]
+
+    def test_tag_counts_follow_updates(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        (tmp_recipes / "7-layer-casserole.md").write_text(
+            CASSEROLE.replace("tags: [mexican, beef]", "tags: [mexican, quick]")
+        )
+        idx.add_or_update(tmp_recipes / "7-layer-casserole.md")
+        counts = dict(idx.tag_counts())
+        assert "beef" not in counts
+        assert counts["quick"] == 2
+        assert [r.slug for r in idx.filter_by_tags(["quick", "mexican"])] == ["7-layer-casserole"]
+
+        idx.remove("7-layer-casserole")
+        assert "mexican" not in dict(idx.tag_counts())
+        assert idx.filter_by_tags(["mexican"]) == []
+
+    def test_filter_by_unknown_tag(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        assert idx.filter_by_tags(["mexican", "nope"]) == []
+
+
+class TestSortedViews:
+    def _write(self, directory, slug, title, extra=""):
+        (directory / f"{slug}.md").write_text(
+            f"---\ntitle: {title}\ntags: [dinner]\n{extra}---\n\n# {title}\n"
+        )
+
+    def test_views_match_filters(self, tmp_path):
+        self._write(tmp_path, "b", "Beta", "cook_time: 10min\n")
+        self._write(
+            tmp_path, "a", "alpha",
+            "cook_history:\n  - date: '2024-03-01'\n  - date: '2024-01-01'\n",
+        )
+        self._write(tmp_path, "c", "Gamma", "cook_history:\n  - date: '2023-05-01'\n")
+        idx = RecipeIndex(tmp_path)
+        idx.build()
+        assert [r.slug for r in idx.list_all()] == ["a", "b", "c"]
+        assert [r.slug for r in idx.filter_never_cooked()] == ["b"]
+        assert [r.slug for r in idx.filter_least_recent()] == ["c", "a"]
+        assert [r.slug for r in idx.filter_quick(["dinner"])] == ["b"]
+        assert idx.filter_quick(["nope"]) == []
+
+    def test_views_follow_mutations(self, tmp_path):
+        self._write(tmp_path, "b", "Beta")
+        idx = RecipeIndex(tmp_path)
+        idx.build()
+        generation = idx.generation
+        assert [r.slug for r in idx.list_all()] == ["b"]
+
+        self._write(tmp_path, "a", "Alpha", "prep_time: 5min\n")
+        idx.add_or_update(tmp_path / "a.md")
+        assert idx.generation > generation
+        assert [r.slug for r in idx.list_all()] == ["a", "b"]
+        assert [r.slug for r in idx.filter_quick()] == ["a"]
+
+        idx.remove("a")
+        assert [r.slug for r in idx.list_all()] == ["b"]
+        assert idx.filter_quick() == []
+
+    def test_returned_lists_are_copies(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        idx.list_all().clear()
+        assert len(idx.list_all()) == 3
+
+
+def test_sort_keys_follow_view_order(tmp_recipes):
+    idx = RecipeIndex(tmp_recipes)
+    idx.build()
+    keys = [idx.sort_key(r) for r in idx.list_all()]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+
+def test_recipe_etag_tracks_forks(tmp_recipes):
+    idx = RecipeIndex(tmp_recipes)
+    idx.build()
+    etag = idx.recipe_etag("7-layer-casserole")
+    assert etag == idx.recipe_etag("7-layer-casserole")
+    assert idx.recipe_etag("missing") is None
+
+    fork = tmp_recipes / "7-layer-casserole.fork.spicy.md"
+    fork.write_text("---\nforked_from: 7-layer-casserole\nfork_name: Spicy\n---\n\n")
+    idx.add_or_update(fork)
+    assert idx.recipe_etag("7-layer-casserole") != etag
+    assert idx.recipe_etag("chicken-tikka-masala") is not None
+
+
+def test_recipe_etag_changes_when_stat_does_not(tmp_recipes):
+    idx = RecipeIndex(tmp_recipes)
+    idx.build()
+    path = tmp_recipes / "7-layer-casserole.md"
+    st = path.stat()
+    etag = idx.recipe_etag("7-layer-casserole")
+
+    # Same size, same mtime: what a like looks like on a coarse-mtime filesystem.
+    path.write_text(CASSEROLE.replace("6 servings", "8 servings"))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    idx.add_or_update(path)
+    assert idx.recipe_etag("7-layer-casserole") != etag
+
+    etag = idx.recipe_etag("7-layer-casserole")
+    idx.apply_changes(modified=[path.name])
+    assert idx.recipe_etag("7-layer-casserole") != etag
+
+
+class TestRecipeCache:
+    def _counting_parser(self, monkeypatch):
+        import app.index as index_module
+
+        calls = []
+        real = index_module.parse_recipe
+
+        def counting(path):
+            calls.append(path.name)
+            return real(path)
+
+        monkeypatch.setattr(index_module, "parse_recipe", counting)
+        return calls
+
+    def test_get_includes_structured_sections(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        recipe = idx.get("chicken-tikka-masala")
+        assert recipe.ingredients[0] == "1 1/2 pounds boneless, skinless chicken thighs"
+        assert recipe.instructions[0] == "Marinate chicken thighs in yogurt and spices."
+
+    def test_repeat_gets_are_served_from_cache(self, tmp_recipes, monkeypatch):
+        calls = self._counting_parser(monkeypatch)
+        idx = RecipeIndex(tmp_recipes, cache_bytes=1 << 20)
+        idx.build()
+        assert idx.get("chicken-tikka-masala") is idx.get("chicken-tikka-masala")
+        assert calls == ["chicken-tikka-masala.md"]
+
+    def test_cache_disabled_by_default(self, tmp_recipes, monkeypatch):
+        calls = self._counting_parser(monkeypatch)
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        idx.get("chicken-tikka-masala")
+        idx.get("chicken-tikka-masala")
+        assert len(calls) == 2
+
+    def test_file_change_invalidates_entry(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes, cache_bytes=1 << 20)
+        idx.build()
+        idx.get("chicken-tikka-masala")
+        path = tmp_recipes / "chicken-tikka-masala.md"
+        path.write_text(CHICKEN_TIKKA.replace("coconut cream", "heavy cream and more"))
+        assert "heavy cream" in idx.get("chicken-tikka-masala").content
+
+    def test_fork_update_invalidates_base(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes, cache_bytes=1 << 20)
+        idx.build()
+        assert idx.get("7-layer-casserole").forks == []
+        fork = tmp_recipes / "7-layer-casserole.fork.spicy.md"
+        fork.write_text("---\nforked_from: 7-layer-casserole\nfork_name: Spicy\n---\n\n")
+        idx.add_or_update(fork)
+        assert [f.name for f in idx.get("7-layer-casserole").forks] == ["spicy"]
+        idx.remove("7-layer-casserole.fork.spicy")
+        assert idx.get("7-layer-casserole").forks == []
+
+    def test_cache_respects_memory_cap(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes, cache_bytes=4000)
+        idx.build()
+        for slug in ("chicken-tikka-masala", "7-layer-casserole", "how-to-make-cauliflower-rice"):
+            idx.get(slug)
+        assert idx._recipe_cache_size <= 4000
+        assert "how-to-make-cauliflower-rice" in idx._recipe_cache
+
+
+class TestApplyChanges:
+    FORK = "---\nforked_from: 7-layer-casserole\nfork_name: Spicy\n---\n\n"
+
+    def test_add_modify_delete(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        generation = idx.generation
+        (tmp_recipes / "new-dish.md").write_text(CHICKEN_TIKKA.replace("Chicken Tikka Masala", "New Dish"))
+        (tmp_recipes / "7-layer-casserole.md").write_text(CASSEROLE.replace("7-Layer", "8-Layer"))
+        (tmp_recipes / "how-to-make-cauliflower-rice.md").unlink()
+
+        idx.apply_changes(
+            added=["new-dish.md"],
+            modified=["7-layer-casserole.md"],
+            deleted=["how-to-make-cauliflower-rice.md"],
+        )
+        assert sorted(idx.list_slugs()) == ["7-layer-casserole", "chicken-tikka-masala", "new-dish"]
+        assert idx.get("7-layer-casserole").title == "8-Layer Casserole"
+        assert [r.slug for r in idx.search("new dish")] == ["new-dish"]
+        assert idx.generation == generation + 1
+
+    def test_rename_moves_recipe_and_forks(self, tmp_recipes):
+        fork = tmp_recipes / "7-layer-casserole.fork.spicy.md"
+        fork.write_text(self.FORK)
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        (tmp_recipes / "7-layer-casserole.md").rename(tmp_recipes / "layered-casserole.md")
+        fork.rename(tmp_recipes / "layered-casserole.fork.spicy.md")
+
+        idx.apply_changes(renamed=[
+            ("7-layer-casserole.md", "layered-casserole.md"),
+            ("7-layer-casserole.fork.spicy.md", "layered-casserole.fork.spicy.md"),
+        ])
+        assert "7-layer-casserole" not in idx.list_slugs()
+        assert [f.name for f in idx.get("layered-casserole").forks] == ["spicy"]
+
+    def test_fork_changes_touch_only_their_base(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        untouched = idx._index["chicken-tikka-masala"]
+        fork = tmp_recipes / "7-layer-casserole.fork.spicy.md"
+        fork.write_text(self.FORK)
+        idx.apply_changes(added=[fork.name])
+        assert idx._index["chicken-tikka-masala"] is untouched
+        assert [f.name for f in idx.get("7-layer-casserole").forks] == ["spicy"]
+
+        fork.unlink()
+        idx.apply_changes(deleted=[fork.name])
+        assert idx.get("7-layer-casserole").forks == []
+        assert idx._index["chicken-tikka-masala"] is untouched
+
+    def test_parses_each_file_once(self, tmp_recipes, monkeypatch):
+        import app.index as index_mod
+
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        calls = []
+        real = index_mod._parse_path
+        monkeypatch.setattr(index_mod, "_parse_path", lambda p: calls.append(p.name) or real(p))
+        idx.apply_changes(modified=["7-layer-casserole.md", "7-layer-casserole.md"])
+        assert calls == ["7-layer-casserole.md"]
+
+    def test_never_forks_worker_processes(self, tmp_recipes, monkeypatch):
+        import app.index as index_mod
+
+        idx = RecipeIndex(tmp_recipes, workers=2)
+        idx.build()
+        contexts = []
+        real = index_mod.ProcessPoolExecutor
+
+        def recording(*args, **kwargs):
+            contexts.append(kwargs.get("mp_context"))
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(index_mod, "PROCESS_POOL_MIN_FILES", 1)
+        monkeypatch.setattr(index_mod, "ProcessPoolExecutor", recording)
+        (tmp_recipes / "7-layer-casserole.md").write_text(CASSEROLE.replace("7-Layer", "8-Layer"))
+        idx.apply_changes(modified=["7-layer-casserole.md", "chicken-tikka-masala.md"])
+        assert [c.get_start_method() for c in contexts] == ["spawn"]
+        assert idx.get("7-layer-casserole").title == "8-Layer Casserole"
+
+    def test_ignores_non_recipe_paths(self, tmp_recipes):
+        (tmp_recipes / "meal-plan.md").write_text("# Plan")
+        (tmp_recipes / "images" / "photo.md").write_text("# Not a recipe")
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        before = sorted(idx.list_slugs())
+        idx.apply_changes(added=["meal-plan.md", "images/photo.md", "README.txt"])
+        assert sorted(idx.list_slugs()) == before
+
+    def test_deleted_path_that_still_exists_is_kept(self, tmp_recipes):
+        idx = RecipeIndex(tmp_recipes)
+        idx.build()
+        idx.apply_changes(deleted=["chicken-tikka-masala.md"])
+        assert "chicken-tikka-masala" in idx.list_slugs()
@@ -1,6 +1,8 @@
 import textwrap
 
-from app.parser import parse_recipe, parse_frontmatter
+import pytest
+
+from app.parser import parse_recipe, parse_frontmatter, parse_recipe_file
 
 
 SAMPLE_RECIPE = textwrap.dedent("""\
@@ -87,3 +89,46 @@ def test_parse_recipe_malformed_file(tmp_path):
     assert result.title == "bad-recipe"
     assert result.tags == []
     assert "Just a title" in result.content
+
+
+def test_parse_recipe_file_returns_summary_ingredients_and_sections(tmp_path):
+    path = _sample_recipe(tmp_path)
+    result = parse_recipe_file(path)
+    assert result.summary == parse_frontmatter(path)
+    assert result.ingredients == [
+        "1 1/2 pounds boneless, skinless chicken thighs",
+        "1/2 cup coconut cream",
+        "1 teaspoon garam masala",
+    ]
+    assert "Ingredients" in result.sections
+    assert "Sear chicken" in result.sections["Instructions"]
+
+
+def test_parse_recipe_file_reads_file_once(tmp_path, monkeypatch):
+    import app.parser as parser_module
+
+    path = _sample_recipe(tmp_path)
+    calls = []
+    original = parser_module.frontmatter.load
+
+    def counting_load(p, *args, **kwargs):
+        calls.append(p)
+        return original(p, *args, **kwargs)
+
+    monkeypatch.setattr(parser_module.frontmatter, "load", counting_load)
+    parse_recipe_file(path)
+    assert len(calls) == 1
+
+
+def test_parse_recipe_file_malformed_file(tmp_path):
+    bad_file = tmp_path / "bad-recipe.md"
+    bad_file.write_text("---\ntitle: [unclosed\n---\n\n## Ingredients\n\n- Salt\n")
+    result = parse_recipe_file(bad_file)
+    assert result.summary.slug == "bad-recipe"
+    assert result.summary.title == "bad-recipe"
+    assert result.ingredients == ["salt"]
+
+
+def test_parse_recipe_file_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        parse_recipe_file(tmp_path / "gone.md")
@@ -219,3 +219,154 @@ def test_export_recipe(client):
 def test_export_recipe_not_found(client):
     resp = client.get("/api/recipes/does-not-exist/export")
     assert resp.status_code == 404
+
+
+def test_search_ranked_by_relevance(client):
+    resp = client.get("/api/search?q=chicken&rank=relevance")
+    assert resp.status_code == 200
+    slugs = [r["slug"] for r in resp.json()]
+    assert slugs[0] == "chicken-tikka-masala"
+
+
+def test_search_ranked_includes_instruction_text(client):
+    resp = client.get("/api/search?q=preheat&rank=relevance")
+    assert [r["slug"] for r in resp.json()] == ["7-layer-casserole"]
+
+
+def test_search_typo_falls_back_to_suggestion(client):
+    resp = client.get("/api/search?q=cocnut")
+    assert resp.status_code == 200
+    assert resp.headers["X-Did-You-Mean"] == "coconut"
+    assert [r["slug"] for r in resp.json()] == ["chicken-tikka-masala"]
+
+
+def test_search_suggestion_outside_latin1_is_percent_encoded(tmp_recipes):
+    from urllib.parse import unquote
+
+    (tmp_recipes / "pho-bo.md").write_text(
+        "---\ntitle: Phở Bò\ntags: [soup]\n---\n\n## Ingredients\n\n- 1 lb beef\n"
+    )
+    client = TestClient(create_app(recipes_dir=tmp_recipes))
+    assert client.get("/api/search", params={"q": "pho bo"}).status_code == 200
+    resp = client.get("/api/search", params={"q": "phx"})
+    assert resp.status_code == 200
+    assert unquote(resp.headers["X-Did-You-Mean"]) == "phở"
+    assert [r["slug"] for r in resp.json()] == ["pho-bo"]
+
+
+def test_search_fuzzy_can_be_disabled(client):
+    resp = client.get("/api/search?q=cocnut&fuzzy=false")
+    assert resp.json() == []
+    assert "X-Did-You-Mean" not in resp.headers
+
+
+def test_search_exact_match_has_no_suggestion(client):
+    resp = client.get("/api/search?q=coconut")
+    assert "X-Did-You-Mean" not in resp.headers
+
+
+def test_search_suggest_returns_completions(client):
+    resp = client.get("/api/search/suggest?prefix=coco")
+    assert resp.status_code == 200
+    assert resp.json() == [{"text": "coconut cream", "count": 1}]
+
+
+def test_search_suggest_limit(client):
+    resp = client.get("/api/search/suggest?prefix=c&limit=2")
+    assert len(resp.json()) == 2
+
+
+def test_list_recipes_paginates_with_cursor(client):
+    everything = [r["slug"] for r in client.get("/api/recipes").json()]
+    resp = client.get("/api/recipes?limit=2")
+    assert resp.headers["X-Total-Count"] == "3"
+    first = [r["slug"] for r in resp.json()]
+    assert first == everything[:2]
+
+    resp = client.get(f"/api/recipes?limit=2&cursor={resp.headers['X-Next-Cursor']}")
+    assert [r["slug"] for r in resp.json()] == everything[2:]
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_list_recipes_without_limit_returns_all(client):
+    resp = client.get("/api/recipes")
+    assert len(resp.json()) == 3
+    assert resp.headers["X-Total-Count"] == "3"
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_search_paginates_with_cursor(client):
+    resp = client.get("/api/search?q=&limit=1")
+    slugs = [r["slug"] for r in resp.json()]
+    while "X-Next-Cursor" in resp.headers:
+        resp = client.get(f"/api/search?q=&limit=1&cursor={resp.headers['X-Next-Cursor']}")
+        slugs += [r["slug"] for r in resp.json()]
+    assert slugs == [r["slug"] for r in client.get("/api/search?q=").json()]
+
+
+def test_search_ranked_paginates_by_position(client):
+    ranked = [r["slug"] for r in client.get("/api/search?q=chicken&rank=relevance").json()]
+    resp = client.get("/api/search?q=chicken&rank=relevance&limit=1")
+    assert [r["slug"] for r in resp.json()] == ranked[:1]
+
+
+def test_invalid_cursor_is_rejected(client):
+    resp = client.get("/api/recipes?limit=1&cursor=not-a-cursor")
+    assert resp.status_code == 400
+
+
+def test_list_recipes_fields_projection(client):
+    data = client.get("/api/recipes?fields=title,tags").json()
+    assert len(data) == 3
+    assert all(set(r) == {"slug", "title", "tags"} for r in data)
+
+
+def test_list_recipes_card_preset(client):
+    data = client.get("/api/recipes?fields=card").json()
+    assert "changelog" not in data[0]
+    assert "cook_history" not in data[0]
+    assert {"title", "image", "tags", "prep_time", "forks"} <= set(data[0])
+
+
+def test_search_fields_keep_pagination_headers(client):
+    resp = client.get("/api/search?q=&fields=title&limit=1")
+    assert resp.headers["X-Total-Count"] == "3"
+    assert "X-Next-Cursor" in resp.headers
+    assert set(resp.json()[0]) == {"slug", "title"}
+
+
+def test_random_recipe_fields(client):
+    data = client.get("/api/recipes/random?fields=title").json()
+    assert set(data) == {"slug", "title"}
+
+
+def test_unknown_field_is_rejected(client):
+    resp = client.get("/api/recipes?fields=title,bogus")
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("url", [
+    "/api/recipes",
+    "/api/recipes?fields=card",
+    "/api/search?q=chicken",
+    "/api/tags",
+    "/api/recipes/chicken-tikka-masala",
+])
+def test_conditional_get_returns_304(client, url):
+    resp = client.get(url)
+    etag = resp.headers["ETag"]
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
+def test_etag_changes_when_recipe_changes(client):
+    url = "/api/recipes/chicken-tikka-masala"
+    list_etag = client.get("/api/recipes").headers["ETag"]
+    etag = client.get(url).headers["ETag"]
+    client.post(f"{url}/cook-history", json={})
+
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert client.get("/api/recipes").headers["ETag"] != list_etag
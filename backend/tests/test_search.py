@@ -0,0 +1,187 @@
+"""Tests for the in-memory search indexes."""
+from app.search import (
+    FuzzyIndex, PrefixIndex, RankedIndex, SubstringIndex,
+    edit_distance, ingredient_phrase, is_single_token, tokenize,
+)
+
+
+def _tokens(*texts):
+    return [t for text in texts for t in tokenize(text)]
+
+
+def _index():
+    idx = SubstringIndex()
+    idx.add("tikka", _tokens("Chicken Tikka Masala", "indian", "1/2 cup coconut cream"))
+    idx.add("casserole", _tokens("7-Layer Casserole", "mexican", "1 pound ground beef"))
+    idx.add("rice", _tokens("Cauliflower Rice", "quick", "2 tbsp olive oil"))
+    return idx
+
+
+class TestTokenize:
+    def test_splits_on_non_word_characters(self):
+        assert tokenize("1/2 Cup coconut-cream") == ["1", "2", "cup", "coconut", "cream"]
+
+    def test_single_token(self):
+        assert is_single_token("chicken")
+        assert not is_single_token("coconut cream")
+        assert not is_single_token("")
+
+
+class TestSubstringIndex:
+    def test_word_substring_matches(self):
+        assert _index().candidates("ick") == {"tikka", "rice"}
+
+    def test_short_fragment_matches(self):
+        assert _index().candidates("ca") == {"casserole", "rice"}
+
+    def test_multi_word_query_intersects(self):
+        assert _index().candidates("coconut cream") == {"tikka"}
+        assert _index().candidates("coconut beef") == set()
+
+    def test_no_word_characters_returns_none(self):
+        assert _index().candidates("/ -") is None
+
+    def test_unknown_word_returns_empty(self):
+        assert _index().candidates("xyz") == set()
+
+    def test_readd_replaces_tokens(self):
+        idx = _index()
+        idx.add("rice", _tokens("Broccoli Rice"))
+        assert idx.candidates("cauli") == set()
+        assert idx.candidates("broc") == {"rice"}
+
+    def test_remove_drops_vocabulary(self):
+        idx = _index()
+        idx.remove("casserole")
+        assert idx.candidates("beef") == set()
+        assert idx.tokens_containing("mexic") == set()
+
+
+class TestRankedIndex:
+    @staticmethod
+    def _fields(**texts):
+        return {field: tokenize(text) for field, text in texts.items()}
+
+    def _index(self, **weights):
+        idx = RankedIndex(weights or None)
+        idx.add("tikka", self._fields(
+            title="Chicken Tikka Masala",
+            tags="chicken indian",
+            ingredients="1 1/2 pounds chicken thighs\n1/2 cup coconut cream",
+            instructions="1. Sear chicken.\n2. Simmer chicken in sauce.",
+        ))
+        idx.add("salad", self._fields(
+            title="Garden Salad",
+            tags="vegetable",
+            ingredients="1 head lettuce\n2 tomatoes",
+            instructions="1. Toss with leftover chicken if you like.",
+        ))
+        idx.add("rice", self._fields(
+            title="Cauliflower Rice",
+            tags="vegetable quick",
+            ingredients="1 head cauliflower",
+            instructions="1. Pulse cauliflower.",
+        ))
+        return idx
+
+    def test_title_and_ingredient_hits_outrank_instruction_hits(self):
+        scores = self._index().score("chicken")
+        assert set(scores) == {"tikka", "salad"}
+        assert scores["tikka"] > scores["salad"]
+
+    def test_prefix_expansion(self):
+        scores = self._index().score("cauli")
+        assert set(scores) == {"rice"}
+
+    def test_exact_term_beats_prefix_match(self):
+        idx = self._index()
+        idx.add("cauli", self._fields(title="Cauli"))
+        scores = idx.score("cauli")
+        assert scores["cauli"] > scores["rice"]
+
+    def test_field_weights_change_ranking(self):
+        idx = self._index(title=0.0, tags=0.0, ingredients=0.0, instructions=5.0)
+        scores = idx.score("chicken")
+        assert scores["tikka"] > 0
+        assert self._index().score("chicken")["salad"] < scores["salad"]
+
+    def test_remove_drops_postings(self):
+        idx = self._index()
+        idx.remove("tikka")
+        assert set(idx.score("chicken")) == {"salad"}
+        idx.remove("salad")
+        assert idx.score("chicken") == {}
+
+
+class TestEditDistance:
+    def test_distance(self):
+        assert edit_distance("parmesean", "parmesan", 2) == 1
+        assert edit_distance("jalepeno", "jalapeno", 2) == 1
+        assert edit_distance("kitten", "sitting", 3) == 3
+
+    def test_stops_past_limit(self):
+        assert edit_distance("chicken", "pork", 2) == 3
+
+
+class TestFuzzyIndex:
+    def _index(self):
+        idx = FuzzyIndex()
+        idx.add("pasta", _tokens("Pasta Carbonara", "1/2 cup parmesan cheese", "2 eggs"))
+        idx.add("salsa", _tokens("Salsa Verde", "1 jalapeno, seeded", "1 bunch cilantro"))
+        return idx
+
+    def test_closest_corrects_typos(self):
+        idx = self._index()
+        assert idx.closest("parmesean") == "parmesan"
+        assert idx.closest("jalepeno") == "jalapeno"
+        assert idx.closest("cilantor") == "cilantro"
+
+    def test_closest_respects_edit_bound(self):
+        assert self._index().closest("pork") is None
+
+    def test_suggest_rewrites_unknown_words_only(self):
+        idx = self._index()
+        assert idx.suggest("parmesean cheese") == "parmesan cheese"
+        assert idx.suggest("parmesan cheese") is None
+        assert idx.suggest("zzzzzz") is None
+
+    def test_remove_forgets_words(self):
+        idx = self._index()
+        idx.remove("salsa")
+        assert idx.closest("jalepeno") is None
+        assert "cheese" in idx
+
+
+class TestIngredientPhrase:
+    def test_strips_quantity_unit_and_prep(self):
+        assert ingredient_phrase("1/2 cup coconut cream") == "coconut cream"
+        assert ingredient_phrase("3 cloves garlic, minced") == "garlic"
+        assert ingredient_phrase("1 (14 oz) can diced tomatoes") == "diced tomatoes"
+        assert ingredient_phrase("kosher salt") == "kosher salt"
+
+
+class TestPrefixIndex:
+    def _index(self):
+        idx = PrefixIndex()
+        idx.add("tikka", ["Chicken Tikka Masala", "chicken", "indian", "coconut cream"])
+        idx.add("soup", ["Chicken Soup", "chicken", "soup"])
+        idx.add("curry", ["Coconut Curry", "indian", "coconut cream"])
+        return idx
+
+    def test_completes_by_count(self):
+        assert self._index().complete("c", limit=3) == [
+            ("chicken", 2), ("coconut cream", 2), ("Chicken Soup", 1),
+        ]
+
+    def test_matches_word_starts(self):
+        assert self._index().complete("masa") == [("Chicken Tikka Masala", 1)]
+
+    def test_limit_and_empty_prefix(self):
+        assert len(self._index().complete("c", limit=1)) == 1
+        assert self._index().complete("  ") == []
+
+    def test_remove_updates_counts(self):
+        idx = self._index()
+        idx.remove("soup")
+        assert ("chicken", 1) in idx.complete("chick")
+        assert ("Chicken Soup", 1) not in idx.complete("chick")
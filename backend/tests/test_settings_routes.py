@@ -1,5 +1,6 @@
 """Tests for settings and sync API routes."""
 import json
+import time
 from pathlib import Path
 
 import pytest
@@ -38,6 +39,31 @@ class TestGetSyncStatus:
         assert data["connected"] is False
 
 
+class TestSyncJobs:
+    def test_trigger_returns_job(self, client):
+        resp = client.post("/api/sync/trigger")
+        assert resp.status_code == 202
+        job = resp.json()
+        assert job["id"]
+        assert job["state"] in ("queued", "fetching", "merging", "reindexing", "pushing", "done")
+
+    def test_poll_job_until_finished(self, client):
+        job_id = client.post("/api/sync/trigger").json()["id"]
+        deadline = time.monotonic() + 5
+        while True:
+            data = client.get(f"/api/sync/jobs/{job_id}").json()
+            if data["state"] in ("done", "failed") or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        assert data["state"] == "done"
+        assert data["pull_success"] is False  # no remote configured
+        assert data["finished_at"] is not None
+
+    def test_unknown_job_404(self, client):
+        resp = client.get("/api/sync/jobs/does-not-exist")
+        assert resp.status_code == 404
+
+
 class TestGetSettings:
     def test_returns_defaults_when_no_config(self, client):
         resp = client.get("/api/settings")
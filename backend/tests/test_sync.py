@@ -1,11 +1,19 @@
 """Tests for the sync engine."""
+import asyncio
 import subprocess
+import threading
+import time
 from pathlib import Path
 
 import pytest
 
-from app.sync import SyncEngine
-from app.git import git_commit
+from app.models import RemoteConfig, SyncConfig
+from app.remote_config import save_config
+from app.sync import MAX_BACKOFF_SECONDS, SyncEngine, next_sync_delay
+from app.git import (
+    _repo_lock, git_commit, git_pull_async, run_git_async, start_commit_queue,
+    stop_commit_queue,
+)
 
 
 @pytest.fixture
@@ -93,6 +101,32 @@ class TestSyncEnginePush:
 
 
 class TestSyncEnginePull:
+    def test_conflict_keeps_ours_and_forks_theirs(self, sync_env, second_clone):
+        bare, local, engine = sync_env
+        clone2 = second_clone
+        (clone2 / "init.md").write_text("theirs")
+        subprocess.run(["git", "commit", "-am", "Theirs"], cwd=str(clone2), capture_output=True)
+        subprocess.run(["git", "push"], cwd=str(clone2), capture_output=True)
+        (local / "init.md").write_text("ours")
+        git_commit(local, local / "init.md", "Ours")
+
+        result = engine.pull()
+        assert result.conflict_files == ["init.md"]
+        assert (local / "init.md").read_text() == "ours"
+        forks = list(local.glob("init.fork.conflict-*.md"))
+        assert [f.read_text() for f in forks] == ["theirs"]
+        assert not (local / ".git" / "MERGE_HEAD").exists()
+
+    def test_async_pull_waits_for_commits_in_progress(self, sync_env):
+        bare, local, engine = sync_env
+        lock = _repo_lock(local)
+        lock.acquire()
+        threading.Timer(0.3, lock.release).start()
+        start = time.monotonic()
+        result = asyncio.run(git_pull_async(local))
+        assert result.success is True
+        assert time.monotonic() - start >= 0.3
+
     def test_pull_gets_new_files(self, sync_env, second_clone):
         bare, local, engine = sync_env
         clone2 = second_clone
@@ -141,14 +175,10 @@ class TestSyncEnginePull:
         # Set up a mock index to verify re-indexing
         class MockIndex:
             def __init__(self):
-                self.added = []
-                self.removed = []
-
-            def add_or_update(self, path):
-                self.added.append(path)
+                self.changes = []
 
-            def remove(self, slug):
-                self.removed.append(slug)
+            def apply_changes(self, added=(), modified=(), deleted=(), renamed=()):
+                self.changes.append((added, modified, deleted, renamed))
 
         mock_index = MockIndex()
         engine.index = mock_index
@@ -165,7 +195,7 @@ class TestSyncEnginePull:
 
         result = engine.pull()
         assert result.success is True
-        assert any("indexed-recipe.md" in str(p) for p in mock_index.added)
+        assert mock_index.changes == [(["indexed-recipe.md"], [], [], [])]
 
     def test_pull_removes_deleted_files_from_index(self, sync_env, second_clone):
         bare, local, engine = sync_env
@@ -198,21 +228,51 @@ class TestSyncEnginePull:
         # Set up mock index for removal tracking
         class MockIndex:
             def __init__(self):
-                self.added = []
-                self.removed = []
+                self.changes = []
 
-            def add_or_update(self, path):
-                self.added.append(path)
-
-            def remove(self, slug):
-                self.removed.append(slug)
+            def apply_changes(self, added=(), modified=(), deleted=(), renamed=()):
+                self.changes.append((added, modified, deleted, renamed))
 
         mock_index = MockIndex()
         engine.index = mock_index
 
         result = engine.pull()
         assert result.success is True
-        assert "to-delete" in mock_index.removed
+        assert mock_index.changes == [([], [], ["to-delete.md"], [])]
+
+    def test_pull_reindexes_renames_in_one_batch(self, sync_env, second_clone):
+        from app.index import RecipeIndex
+
+        bare, local, engine = sync_env
+        clone2 = second_clone
+        body = "---\ntitle: Old Name\n---\n\n## Ingredients\n\n- 1 cup flour\n- 2 eggs\n"
+        (clone2 / "old-name.md").write_text(body)
+        (clone2 / "old-name.fork.spicy.md").write_text("---\nfork_name: Spicy\n---\n")
+        subprocess.run(["git", "add", "."], cwd=str(clone2), capture_output=True)
+        subprocess.run(["git", "commit", "-m", "Add"], cwd=str(clone2), capture_output=True)
+        subprocess.run(["git", "push"], cwd=str(clone2), capture_output=True)
+        engine.index = RecipeIndex(local)
+        engine.index.build()
+        engine.pull()
+        assert "old-name" in engine.index.list_slugs()
+
+        subprocess.run(["git", "mv", "old-name.md", "new-name.md"], cwd=str(clone2), capture_output=True)
+        subprocess.run(
+            ["git", "mv", "old-name.fork.spicy.md", "new-name.fork.spicy.md"],
+            cwd=str(clone2), capture_output=True,
+        )
+        subprocess.run(["git", "commit", "-m", "Rename"], cwd=str(clone2), capture_output=True)
+        subprocess.run(["git", "push"], cwd=str(clone2), capture_output=True)
+
+        result = engine.pull()
+        assert sorted(result.renamed) == [
+            ("old-name.fork.spicy.md", "new-name.fork.spicy.md"),
+            ("old-name.md", "new-name.md"),
+        ]
+        assert result.added == [] and result.deleted == []
+        slugs = engine.index.list_slugs()
+        assert "new-name" in slugs and "old-name" not in slugs
+        assert [f.name for f in engine.index.get("new-name").forks] == ["spicy"]
 
 
 class TestSyncEngineStatus:
@@ -273,3 +333,390 @@ class TestSyncEngineStatus:
         engine.pull()
         status = engine.get_status()
         assert status.last_synced is not None
+
+
+class TestSyncEngineAsync:
+    def test_push_and_status(self, sync_env):
+        bare, local, engine = sync_env
+        f = local / "recipe.md"
+        f.write_text("# Recipe")
+        git_commit(local, f, "Add recipe")
+        assert asyncio.run(engine.get_status_async()).ahead == 1
+        assert asyncio.run(engine.push_async()) is True
+        status = asyncio.run(engine.get_status_async())
+        assert status.ahead == 0
+        assert status.last_synced is not None
+
+    def test_pull_gets_new_files(self, sync_env, second_clone):
+        bare, local, engine = sync_env
+        (second_clone / "new-recipe.md").write_text("# New Recipe")
+        subprocess.run(["git", "add", "."], cwd=str(second_clone), capture_output=True)
+        subprocess.run(
+            ["git", "commit", "-m", "Add new recipe"],
+            cwd=str(second_clone), capture_output=True,
+        )
+        subprocess.run(["git", "push"], cwd=str(second_clone), capture_output=True)
+
+        result = asyncio.run(git_pull_async(local))
+        assert result.success is True
+        assert result.changed_files == ["new-recipe.md"]
+        assert (local / "new-recipe.md").exists()
+
+
+class TestRunGitAsync:
+    def test_returns_completed_process(self, sync_env):
+        bare, local, engine = sync_env
+        result = asyncio.run(run_git_async(local, ["rev-parse", "--is-inside-work-tree"]))
+        assert result.returncode == 0
+        assert result.stdout.strip() == "true"
+
+    def test_check_raises(self, sync_env):
+        bare, local, engine = sync_env
+        with pytest.raises(subprocess.CalledProcessError):
+            asyncio.run(run_git_async(local, ["rev-parse", "no-such-rev"], check=True))
+
+    def test_timeout_kills_process(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+        # The alias runs sleep as a child of git, like ssh during a fetch.
+        subprocess.run(
+            ["git", "config", "alias.sleep", "!sleep 5"], cwd=str(local), capture_output=True,
+        )
+        start = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            asyncio.run(run_git_async(local, ["sleep"], timeout=0.2))
+        assert time.monotonic() - start < 4
+
+
+    def test_concurrency_limit_spans_event_loops(self, sync_env, monkeypatch):
+        import app.git as git_mod
+
+        bare, local, engine = sync_env
+        slots = threading.BoundedSemaphore(1)
+        monkeypatch.setattr(git_mod, "_git_slots", slots)
+        slots.acquire()  # taken by a command on some other loop
+        try:
+            t = threading.Thread(
+                target=asyncio.run, args=(run_git_async(local, ["rev-parse", "HEAD"]),)
+            )
+            t.start()
+            t.join(0.3)
+            assert t.is_alive()
+        finally:
+            slots.release()
+        t.join(5)
+        assert not t.is_alive()
+        assert slots.acquire(blocking=False)  # released again
+
+
+class TestCachedStatus:
+    def test_repeat_polls_run_no_git(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+        first = engine.get_status()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("git should not run")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+        assert engine.get_status() == first
+        assert asyncio.run(engine.get_status_async()) == first
+
+    def test_async_cache_hit_stays_on_loop_with_idle_queue(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+        start_commit_queue(local, window=60)
+        try:
+            first = engine.get_status()
+
+            def no_threads(*args, **kwargs):
+                raise AssertionError("left the event loop")
+
+            monkeypatch.setattr(asyncio, "to_thread", no_threads)
+            assert asyncio.run(engine.get_status_async()) == first
+        finally:
+            monkeypatch.undo()
+            stop_commit_queue(local)
+
+    def test_local_commit_updates_ahead_without_fetch(self, sync_env):
+        bare, local, engine = sync_env
+        assert engine.get_status().ahead == 0
+        f = local / "local-only.md"
+        f.write_text("# Local Only")
+        git_commit(local, f, "Local commit")
+        assert engine.get_status().ahead == 1
+
+    def test_remote_changes_show_after_refresh(self, sync_env, second_clone):
+        bare, local, engine = sync_env
+        assert engine.get_status().behind == 0
+        (second_clone / "remote.md").write_text("# Remote")
+        subprocess.run(["git", "add", "."], cwd=str(second_clone), capture_output=True)
+        subprocess.run(["git", "commit", "-m", "Remote"], cwd=str(second_clone), capture_output=True)
+        subprocess.run(["git", "push"], cwd=str(second_clone), capture_output=True)
+
+        assert engine.get_status().behind == 0  # no fetch per poll
+        assert engine.refresh_status().behind == 1
+
+    def test_refresh_does_not_fetch_during_a_sync_job(self, sync_env, second_clone):
+        bare, local, engine = sync_env
+        (second_clone / "remote.md").write_text("# Remote")
+        subprocess.run(["git", "add", "."], cwd=str(second_clone), capture_output=True)
+        subprocess.run(["git", "commit", "-m", "Remote"], cwd=str(second_clone), capture_output=True)
+        subprocess.run(["git", "push"], cwd=str(second_clone), capture_output=True)
+
+        engine._inflight = (None, None)  # a job is running
+        assert engine.refresh_status().behind == 0
+        engine._inflight = None
+        assert engine.refresh_status().behind == 1
+
+    def test_background_refresh(self, sync_env, second_clone):
+        bare, local, engine = sync_env
+        engine.get_status()
+        (second_clone / "remote.md").write_text("# Remote")
+        subprocess.run(["git", "add", "."], cwd=str(second_clone), capture_output=True)
+        subprocess.run(["git", "commit", "-m", "Remote"], cwd=str(second_clone), capture_output=True)
+        subprocess.run(["git", "push"], cwd=str(second_clone), capture_output=True)
+
+        engine.start_status_refresh(0.05)
+        try:
+            deadline = time.monotonic() + 5
+            while engine.get_status().behind == 0 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert engine.get_status().behind == 1
+        finally:
+            engine.stop_status_refresh()
+
+
+class TestNextSyncDelay:
+    class _Fixed:
+        def __init__(self, value):
+            self.value = value
+
+        def uniform(self, a, b):
+            return self.value
+
+    def test_jitter_bounds(self):
+        assert next_sync_delay(100, rng=self._Fixed(0.9)) == pytest.approx(90)
+        assert next_sync_delay(100, rng=self._Fixed(1.1)) == pytest.approx(110)
+        for _ in range(50):
+            assert 90 <= next_sync_delay(100) <= 110
+
+    def test_backoff_doubles_and_caps(self):
+        one = self._Fixed(1.0)
+        assert next_sync_delay(100, failures=1, rng=one) == 200
+        assert next_sync_delay(100, failures=3, rng=one) == 800
+        assert next_sync_delay(100, failures=50, rng=one) == MAX_BACKOFF_SECONDS
+
+    def test_long_interval_not_shortened_by_cap(self):
+        long = MAX_BACKOFF_SECONDS * 2
+        assert next_sync_delay(long, failures=4, rng=self._Fixed(1.0)) == long
+
+
+def _wait_for(job, states=("done", "failed")):
+    deadline = time.monotonic() + 5
+    while job.state not in states and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def _slow_merge(monkeypatch):
+    import app.sync as sync_mod
+
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    real_pull = sync_mod.git_pull_async
+
+    async def slow_pull(recipes_dir, fetch=True):
+        calls.append(fetch)
+        started.set()
+        await asyncio.to_thread(release.wait, 5)
+        return await real_pull(recipes_dir, fetch=fetch)
+
+    monkeypatch.setattr(sync_mod, "git_pull_async", slow_pull)
+    return started, release, calls
+
+
+class TestSingleFlightSync:
+    def test_concurrent_calls_share_one_run(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+        started, release, calls = _slow_merge(monkeypatch)
+        results = []
+        leader = threading.Thread(target=lambda: results.append(engine.sync()))
+        leader.start()
+        assert started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(engine.sync()))
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        assert calls == [False]  # merged what the job fetched
+        assert len(results) == 2
+        assert results[0] == results[1]
+        assert results[0]["pull_success"] and results[0]["push_success"]
+
+    def test_failure_reaches_every_caller_and_clears(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+
+        async def boom(recipes_dir, fetch=True):
+            raise RuntimeError("pull broke")
+
+        monkeypatch.setattr("app.sync.git_pull_async", boom)
+        with pytest.raises(RuntimeError):
+            engine.sync()
+        monkeypatch.undo()
+        assert engine.sync()["pull_success"]
+
+
+class TestSyncJobs:
+    def test_job_progresses_to_done(self, sync_env, second_clone):
+        bare, local, engine = sync_env
+        (second_clone / "remote.md").write_text("# Remote")
+        subprocess.run(["git", "add", "."], cwd=str(second_clone), capture_output=True)
+        subprocess.run(["git", "commit", "-m", "Remote"], cwd=str(second_clone), capture_output=True)
+        subprocess.run(["git", "push"], cwd=str(second_clone), capture_output=True)
+
+        job = _wait_for(engine.start_sync())
+        assert job.state == "done"
+        assert job.pull_success and job.push_success
+        assert job.pull_changed == ["remote.md"]
+        assert job.finished_at is not None
+        assert (local / "remote.md").exists()
+        assert engine.get_job(job.id) is job
+
+    def test_reports_progress_states(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+        seen = []
+        real_push = engine.push_async
+
+        async def watch_push():
+            seen.append(job.state)
+            return await real_push()
+
+        monkeypatch.setattr(engine, "push_async", watch_push)
+        started, release, _ = _slow_merge(monkeypatch)
+        job = engine.start_sync()
+        assert started.wait(5)
+        assert job.state == "merging"
+        release.set()
+        _wait_for(job)
+        assert seen == ["pushing"]
+        assert job.state == "done"
+
+    def test_triggers_coalesce_onto_running_job(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+        started, release, calls = _slow_merge(monkeypatch)
+        first = engine.start_sync()
+        assert started.wait(5)
+        assert engine.start_sync() is first
+        release.set()
+        _wait_for(first)
+        second = engine.start_sync()
+        assert second.id != first.id
+        _wait_for(second)
+        assert len(calls) == 2
+
+    def test_failed_job(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+
+        async def boom(recipes_dir, fetch=True):
+            raise RuntimeError("pull broke")
+
+        monkeypatch.setattr("app.sync.git_pull_async", boom)
+        job = _wait_for(engine.start_sync())
+        assert job.state == "failed"
+        assert job.error == "pull broke"
+
+    def test_unreachable_remote_is_not_an_error_state(self, sync_env):
+        bare, local, engine = sync_env
+        subprocess.run(
+            ["git", "remote", "set-url", "origin", str(bare) + "-missing"],
+            cwd=str(local), capture_output=True,
+        )
+        job = _wait_for(engine.start_sync())
+        assert job.state == "done"
+        assert job.pull_success is False
+        assert job.error == "Pull failed"
+
+    def test_stalled_remote_times_out_and_frees_the_slot(self, sync_env, monkeypatch):
+        bare, local, engine = sync_env
+        # An ssh remote whose "ssh" never answers, like a hung connection.
+        subprocess.run(
+            ["git", "config", "core.sshCommand", "sleep 30"], cwd=str(local), capture_output=True,
+        )
+        subprocess.run(
+            ["git", "remote", "set-url", "origin", "ssh://example.invalid/repo.git"],
+            cwd=str(local), capture_output=True,
+        )
+        monkeypatch.setattr("app.git.GIT_TIMEOUT_SECONDS", 0.3)
+        start = time.monotonic()
+        result = engine.sync()
+        assert time.monotonic() - start < 10
+        assert result == {"pull_success": False, "pull_changed": [], "push_success": False}
+        assert engine._inflight is None
+
+    def test_unknown_job(self, sync_env):
+        bare, local, engine = sync_env
+        assert engine.get_job("nope") is None
+
+
+class TestSyncScheduler:
+    def _engine(self, sync_env, tmp_path, **sync):
+        bare, local, _ = sync_env
+        config_path = tmp_path / "forks-config.json"
+        save_config(config_path, RemoteConfig(url=str(bare)), SyncConfig(**sync))
+        return SyncEngine(local, index=None, config_path=config_path), config_path
+
+    def test_runs_on_interval(self, sync_env, tmp_path, monkeypatch):
+        engine, _ = self._engine(sync_env, tmp_path, enabled=True, interval_seconds=60)
+        monkeypatch.setattr("app.sync.next_sync_delay", lambda interval, failures=0: 0.02)
+        ran = threading.Event()
+        monkeypatch.setattr(engine, "sync", lambda: ran.set() or {"pull_success": True, "push_success": True})
+        engine.start_scheduler()
+        try:
+            assert ran.wait(5)
+        finally:
+            engine.stop_scheduler()
+
+    def test_disabled_does_not_run(self, sync_env, tmp_path, monkeypatch):
+        engine, _ = self._engine(sync_env, tmp_path, enabled=False)
+        monkeypatch.setattr("app.sync.next_sync_delay", lambda interval, failures=0: 0.01)
+        ran = threading.Event()
+        monkeypatch.setattr(engine, "sync", lambda: ran.set() or {})
+        engine.start_scheduler()
+        try:
+            assert not ran.wait(0.2)
+        finally:
+            engine.stop_scheduler()
+
+    def test_reschedule_picks_up_enabled_config(self, sync_env, tmp_path, monkeypatch):
+        bare, _, _ = sync_env
+        engine, config_path = self._engine(sync_env, tmp_path, enabled=False)
+        monkeypatch.setattr("app.sync.next_sync_delay", lambda interval, failures=0: 0.02)
+        ran = threading.Event()
+        monkeypatch.setattr(engine, "sync", lambda: ran.set() or {"pull_success": True, "push_success": True})
+        engine.start_scheduler()
+        try:
+            save_config(config_path, RemoteConfig(url=str(bare)), SyncConfig(enabled=True))
+            engine.reschedule()
+            assert ran.wait(5)
+        finally:
+            engine.stop_scheduler()
+
+    def test_failures_back_off(self, sync_env, tmp_path, monkeypatch):
+        engine, _ = self._engine(sync_env, tmp_path, enabled=True, interval_seconds=60)
+        seen = []
+
+        def delay(interval, failures=0):
+            seen.append(failures)
+            return 0.01
+
+        monkeypatch.setattr("app.sync.next_sync_delay", delay)
+        monkeypatch.setattr(engine, "sync", lambda: {"pull_success": False, "push_success": True})
+        engine.start_scheduler()
+        try:
+            deadline = time.monotonic() + 5
+            while len(seen) < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            engine.stop_scheduler()
+        assert seen[:4] == [0, 1, 2, 3]
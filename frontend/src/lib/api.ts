@@ -1,4 +1,4 @@
-import type { Recipe, RecipeInput, RecipeSummary, ScrapeResponse, ForkDetail, ForkInput, CookHistoryEntry, SyncStatus, AppSettings, StreamTimeline, GroceryList } from './types';
+import type { Recipe, RecipeInput, RecipeSummary, ScrapeResponse, ForkDetail, ForkInput, CookHistoryEntry, SyncStatus, SyncJob, AppSettings, StreamTimeline, GroceryList } from './types';
 
 const BASE = '/api';
 
@@ -231,12 +231,28 @@ export async function getSyncStatus(): Promise<SyncStatus> {
   return res.json();
 }
 
-export async function triggerSync(): Promise<{ pull_success: boolean; push_success: boolean; pull_changed: string[] }> {
+export async function startSync(): Promise<SyncJob> {
   const res = await fetch(`${BASE}/sync/trigger`, { method: 'POST' });
   if (!res.ok) throw new Error('Sync failed');
   return res.json();
 }
 
+export async function getSyncJob(id: string): Promise<SyncJob> {
+  const res = await fetch(`${BASE}/sync/jobs/${id}`);
+  if (!res.ok) throw new Error('Failed to get sync job');
+  return res.json();
+}
+
+export async function triggerSync(): Promise<{ pull_success: boolean; push_success: boolean; pull_changed: string[] }> {
+  let job = await startSync();
+  while (job.state !== 'done' && job.state !== 'failed') {
+    await new Promise((resolve) => setTimeout(resolve, 500));
+    job = await getSyncJob(job.id);
+  }
+  if (job.state === 'failed') throw new Error(job.error ?? 'Sync failed');
+  return { pull_success: !!job.pull_success, push_success: !!job.push_success, pull_changed: job.pull_changed };
+}
+
 export async function getSettings(): Promise<AppSettings> {
   const res = await fetch(`${BASE}/settings`);
   if (!res.ok) throw new Error('Failed to get settings');
@@ -113,6 +113,17 @@ export interface SyncStatus {
   error: string | null;
 }
 
+export interface SyncJob {
+  id: string;
+  state: 'queued' | 'fetching' | 'merging' | 'reindexing' | 'pushing' | 'done' | 'failed';
+  started_at: string;
+  finished_at: string | null;
+  pull_success: boolean | null;
+  pull_changed: string[];
+  push_success: boolean | null;
+  error: string | null;
+}
+
 export interface StreamEvent {
   type: 'created' | 'edited' | 'forked' | 'merged' | 'unmerged' | 'failed' | 'unfailed';
   date: string;